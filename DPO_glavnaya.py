@@ -1,359 +1,124 @@
-# Импорт необходимых библиотек для работы с Selenium, управления ChromeDriver и работы с файлами
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+# Импорт необходимых библиотек для работы с Selenium
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-import time
-from pathlib import Path
-
-# 🔧 Функция настройки веб-драйвера для работы в headless-режиме
-def get_driver():
-    # Создание объекта опций для браузера Chrome
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Запуск браузера без графического интерфейса
-    chrome_options.add_argument("--disable-gpu")  # Отключение GPU для повышения стабильности
-    chrome_options.add_argument("--no-sandbox")  # Отключение песочницы для совместимости
-    chrome_options.add_argument("--window-size=1920,1080")  # Установка размера окна браузера
-    # Автоматическая установка ChromeDriver с помощью webdriver-manager
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=chrome_options)
-    return driver
+from dpo_extract import TextIndex, anchor_container, texts
+from dpo_spec import PageSpec
 
 # 📄 Словарь селекторов для извлечения данных со страницы
-elements_to_parse = {
-    # Селекторы для заголовков страницы
-    "page_title": [
-        {"type": "css", "value": "section.desc_page h2.desc_page-title"},
-    ],
-    # Селекторы для основного текста страницы
-    "page_text": [
-        {"type": "css", "value": "section.desc_page div.desc_page-text p"},
-    ],
-    # Селекторы для заголовков информационных блоков
-    "info_block_title": [
-        {"type": "css", "value": "h2.info_block__images-title span"},
-    ],
-    # Селекторы для текста информационных блоков
-    "info_block_text": [
-        {"type": "css", "value": "div.info_block-desc p"},
-    ],
-    # Селекторы для ссылок
-    "info_links": [
-        {"type": "css", "value": "a.info_block__list-link"},
-    ],
-    # Селекторы для секции описания на главной странице
-    "home_desc_section": [
-        {"type": "css", "value": "section.home_desc > *"},
-    ],
-    # Селектор для списка особенностей обучения
-    "education_features": {
-        "trigger_text": "Такое обучение имеет свои особенности:",
-        "selector": {"type": "xpath", "value": "//p[contains(text(), 'Такое обучение имеет свои особенности:')]/following-sibling::ul[1]/li"},
-    },
-    # Селектор для списка форм обучения
-    "learning_forms": {
-        "trigger_text": "В нашей академии дистанционное обучение проводится в разных формах:",
-        "selector": {"type": "xpath", "value": "//h3[contains(text(), 'В нашей академии дистанционное обучение проводится в разных формах:')]/following-sibling::ul[1]/li"},
-    },
-    # Селектор для списка медицинского образования
-    "medical_education": {
-        "trigger_text": "Дистанционное обучение для руководящего состава здравоохранительных организаций",
-        "selector": {"type": "xpath", "value": "//p[contains(., 'Дистанционное обучение для руководящего состава')]/following-sibling::ul[1]/li/a"},
-    },
-    # Селектор для списка строительных курсов
-    "construction_courses": {
-        "trigger_text": "Курсы на базе средне-специального или высшего образования",
-        "selector": {"type": "xpath", "value": "//p[contains(., 'Курсы на базе средне-специального или высшего образования')]/following-sibling::ul[1]/li/a"},
-    },
-    # Селектор для списка специальных курсов
-    "special_courses": {
-        "trigger_text": "Курсы специальной переподготовки на базе среднего и/или высшего образования",
-        "selector": {"type": "xpath", "value": "//p[contains(., 'Курсы специальной переподготовки на базе среднего и/или высшего образования')]/following-sibling::ul[1]/li/a"},
-    },
+SELECTORS = {
+    # Блок описания: по нему определяется готовность страницы
+    "desc_page": (By.CSS_SELECTOR, "section.desc_page"),
+    # Заголовки страницы
+    "page_title": (By.CSS_SELECTOR, "section.desc_page h2.desc_page-title"),
+    # Основной текст страницы
+    "page_text": (By.CSS_SELECTOR, "section.desc_page div.desc_page-text p"),
+    # Заголовки информационных блоков
+    "info_block_title": (By.CSS_SELECTOR, "h2.info_block__images-title span"),
+    # Текст информационных блоков
+    "info_block_text": (By.CSS_SELECTOR, "div.info_block-desc p"),
+    # Ссылки
+    "info_links": (By.CSS_SELECTOR, "a.info_block__list-link"),
+    # Секция описания на главной странице
+    "home_desc_section": (By.CSS_SELECTOR, "section.home_desc > *"),
+    # Контейнеры, в которых ищутся фразы-якоря и следующие за ними списки
+    "anchor_containers": (By.XPATH, "//*[ul][p or h3]"),
 }
 
-# 🧠 Функция парсинга одной веб-страницы
-def parse_website(url, driver):
-    # Создание словаря для хранения результатов парсинга
-    results = {
-        "url": url,
-        "sections": [],  # Список для заголовков и текстов
-        "links": [],  # Список для ссылок
-        "education_features": [],  # Список особенностей обучения
-        "learning_forms": [],  # Список форм обучения
-        "medical_education": [],  # Список медицинского образования
-        "construction_courses": [],  # Список строительных курсов
-        "special_courses": [],  # Список специальных курсов
-    }
-
-    # Загрузка страницы
-    driver.get(url)
-    time.sleep(2)  # Ожидание загрузки страницы (2 секунды)
-
-    # Парсинг заголовков страницы
-    title_texts = []
-    for selector in elements_to_parse["page_title"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            elif selector["type"] == "xpath":
-                elements = driver.find_elements(By.XPATH, selector["value"])
-            # Сбор текста из элементов, отфильтрованных по наличию текста
-            title_texts.extend([el.text.strip() for el in elements if el.text.strip()])
-        except Exception as e:
-            print(f"Ошибка при парсинге заголовков страницы: {str(e)}")
-            continue
-
-    # Парсинг основного текста страницы
-    body_texts = []
-    for selector in elements_to_parse["page_text"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            elif selector["type"] == "xpath":
-                elements = driver.find_elements(By.XPATH, selector["value"])
-            # Сбор текста из элементов, отфильтрованных по наличию текста
-            body_texts.extend([el.text.strip() for el in elements if el.text.strip()])
-        except Exception as e:
-            print(f"Ошибка при парсинге текста страницы: {str(e)}")
-            continue
-
-    # Объединение заголовков и текстов в секции
-    if len(title_texts) == 1 and len(body_texts) > 1:
-        for i, text in enumerate(body_texts):
-            results["sections"].append({
-                "title": title_texts[0] if i == 0 else "",  # Первый текст получает заголовок
-                "text": text
-            })
-    else:
-        for i in range(max(len(title_texts), len(body_texts))):
-            title = title_texts[i] if i < len(title_texts) else ""
-            text = body_texts[i] if i < len(body_texts) else ""
-            results["sections"].append({"title": title, "text": text})
-
-    # Парсинг заголовков информационных блоков
-    info_titles = []
-    for selector in elements_to_parse["info_block_title"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            elif selector["type"] == "xpath":
-                elements = driver.find_elements(By.XPATH, selector["value"])
-            info_titles.extend([el.text.strip() for el in elements if el.text.strip()])
-        except Exception as e:
-            print(f"Ошибка при парсинге заголовков инфоблоков: {str(e)}")
-            continue
-
-    # Парсинг текстов информационных блоков
-    info_texts = []
-    for selector in elements_to_parse["info_block_text"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            elif selector["type"] == "xpath":
-                elements = driver.find_elements(By.XPATH, selector["value"])
-            info_texts.extend([el.text.strip() for el in elements if el.text.strip()])
-        except Exception as e:
-            print(f"Ошибка при парсинге текстов инфоблоков: {str(e)}")
-            continue
-
-    # Объединение заголовков и текстов инфоблоков в секции
-    if len(info_titles) == 1 and len(info_texts) > 0:
-        for i, text in enumerate(info_texts):
-            results["sections"].append({
-                "title": info_titles[0] if i == 0 else "",  # Первый текст получает заголовок
-                "text": text
-            })
-    else:
-        for i in range(max(len(info_titles), len(info_texts))):
-            title = info_titles[i] if i < len(info_titles) else ""
-            text = info_texts[i] if i < len(info_texts) else ""
-            results["sections"].append({"title": title, "text": text})
-
-    # Парсинг ссылок
-    for selector in elements_to_parse["info_links"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            elif selector["type"] == "xpath":
-                elements = driver.find_elements(By.XPATH, selector["value"])
-            # Сбор текста и URL для каждой ссылки
-            for el in elements:
-                if el.text.strip():
-                    results["links"].append({
-                        "text": el.text.strip(),
-                        "url": el.get_attribute("href")
-                    })
-        except Exception as e:
-            print(f"Ошибка при парсинге ссылок: {str(e)}")
-            continue
+# Списки после фраз-якорей: (заголовок в файле, фраза-якорь, теги узла с фразой, пункты — ссылки)
+ANCHOR_LISTS = [
+    # Список особенностей обучения
+    ("Особенности обучения", "Такое обучение имеет свои особенности:", ["p"], False),
+    # Список форм обучения
+    ("Формы обучения", "В нашей академии дистанционное обучение проводится в разных формах:", ["h3"], False),
+    # Список медицинского образования
+    ("Медицинское образование", "Дистанционное обучение для руководящего состава", ["p"], True),
+    # Список строительных курсов
+    ("Строительные курсы", "Курсы на базе средне-специального или высшего образования", ["p"], True),
+    # Список специальных курсов
+    ("Специальные курсы", "Курсы специальной переподготовки на базе среднего и/или высшего образования", ["p"], True),
+]
 
-    # Парсинг секции home_desc
-    for selector in elements_to_parse["home_desc_section"]:
-        try:
-            if selector["type"] == "css":
-                elements = driver.find_elements(By.CSS_SELECTOR, selector["value"])
-            # Обработка элементов в зависимости от их тега
-            for el in elements:
-                tag_name = el.tag_name.lower()
-                text = el.text.strip()
-                if not text:
-                    continue
-                if tag_name in ['h2', 'h3']:
-                    results["sections"].append({"title": text, "text": ""})
-                elif tag_name in ['p', 'li']:
-                    if results["sections"] and not results["sections"][-1]["text"]:
-                        results["sections"][-1]["text"] = text
-                    else:
-                        results["sections"].append({"title": "", "text": text})
-        except Exception as e:
-            print(f"Ошибка при парсинге home_desc: {str(e)}")
+# 🧠 Объединение заголовков и текстов в секции: единственный заголовок получает первый текст
+def pair_sections(titles, bodies, min_bodies):
+    if len(titles) == 1 and len(bodies) > min_bodies:
+        return [{"title": titles[0] if i == 0 else "", "text": text} for i, text in enumerate(bodies)]
+    return [
+        {"title": titles[i] if i < len(titles) else "", "text": bodies[i] if i < len(bodies) else ""}
+        for i in range(max(len(titles), len(bodies)))
+    ]
+
+# 🧠 Функция разбора секций: описание страницы, информационные блоки и секция home_desc
+def parse_sections(page):
+    sections = pair_sections(texts(page["page_title"]), texts(page["page_text"]), 1)
+    sections += pair_sections(texts(page["info_block_title"]), texts(page["info_block_text"]), 0)
+
+    # Секция home_desc: заголовки h2/h3 открывают секцию, p/li заполняют ее текст
+    for el in page["home_desc_section"]:
+        text = el["text"].strip()
+        if not text:
             continue
+        if el["tag"] in ['h2', 'h3']:
+            sections.append({"title": text, "text": ""})
+        elif el["tag"] in ['p', 'li']:
+            if sections and not sections[-1]["text"]:
+                sections[-1]["text"] = text
+            else:
+                sections.append({"title": "", "text": text})
+
+    content = []
+    for section in sections:
+        if section["title"]:
+            content.append(f"## {section['title']}\n\n")
+        if section["text"]:
+            content.append(f"{section['text']}\n\n")
+    return content
+
+# 🧠 Функция разбора ссылок информационных блоков
+def parse_links(page):
+    links = [f"- [{el['text'].strip()}]({el['attrs']['href']})\n" for el in page["info_links"] if el["text"].strip()]
+    return ["".join(links) + "\n"] if links else []
+
+# 🧠 Функция разбора списков после фраз-якорей: индекс текста страницы строится один раз
+def parse_anchor_lists(page):
+    index = TextIndex(page["anchor_containers"], [phrase for _, phrase, _, _ in ANCHOR_LISTS])
+    content = []
+    for heading, phrase, tags, as_links in ANCHOR_LISTS:
+        if as_links:
+            items = [f"[{item['text']}]({item['url']})" for item in index.list_links(phrase, tags)]
+        else:
+            items = index.list_texts(phrase, tags)
+        if items:
+            content.append(f"## {heading}\n\n" + "".join(f"- {item}\n" for item in items) + "\n")
+    return content
+
+# 📄 Описание страницы: у главной нет заголовка h1, файл начинается с адреса страницы;
+# страница разбирается, даже если блок описания не дождался загрузки
+PAGE = PageSpec(
+    url="https://academydpo.org/",
+    output="DPO_glavnaya.md",
+    selectors=SELECTORS,
+    title=None,
+    ready="desc_page",
+    require_ready=False,
+    header=(f"# Страница: {{url}}\n\n[Открыть страницу]({{url}})\n\n{'=' * 80}\n\n",),
+    separator="",
+    blocks=[
+        {"kind": "custom", "label": "Секции", "extract": parse_sections,
+         "snapshot": {key: SELECTORS[key] for key in
+                      ("page_title", "page_text", "info_block_title", "info_block_text", "home_desc_section")}},
+        {"kind": "custom", "label": "Ссылки", "heading": "## Ссылки\n\n", "extract": parse_links,
+         "snapshot": {"info_links": {"locator": SELECTORS["info_links"], "attrs": ["href"]}}},
+        {"kind": "custom", "label": "Списки", "extract": parse_anchor_lists,
+         "snapshot": {"anchor_containers": anchor_container(SELECTORS["anchor_containers"])}},
+    ],
+)
 
-    # Парсинг списка особенностей обучения
-    try:
-        if elements_to_parse["education_features"]["selector"]["type"] == "xpath":
-            elements = driver.find_elements(By.XPATH, elements_to_parse["education_features"]["selector"]["value"])
-        for el in elements:
-            text = el.text.strip()
-            if text:
-                results["education_features"].append(text)
-    except Exception as e:
-        print(f"Ошибка при парсинге особенностей обучения: {str(e)}")
-
-    # Парсинг списка форм обучения
-    try:
-        if elements_to_parse["learning_forms"]["selector"]["type"] == "xpath":
-            elements = driver.find_elements(By.XPATH, elements_to_parse["learning_forms"]["selector"]["value"])
-        for el in elements:
-            text = el.text.strip()
-            if text:
-                results["learning_forms"].append(text)
-    except Exception as e:
-        print(f"Ошибка при парсинге форм обучения: {str(e)}")
-
-    # Парсинг списка медицинского образования
-    try:
-        if elements_to_parse["medical_education"]["selector"]["type"] == "xpath":
-            elements = driver.find_elements(By.XPATH, elements_to_parse["medical_education"]["selector"]["value"])
-        for el in elements:
-            text = el.text.strip()
-            url = el.get_attribute("href")
-            if text:
-                results["medical_education"].append({"text": text, "url": url})
-    except Exception as e:
-        print(f"Ошибка при парсинге медицинского образования: {str(e)}")
-
-    # Парсинг списка строительных курсов
-    try:
-        if elements_to_parse["construction_courses"]["selector"]["type"] == "xpath":
-            elements = driver.find_elements(By.XPATH, elements_to_parse["construction_courses"]["selector"]["value"])
-        for el in elements:
-            text = el.text.strip()
-            url = el.get_attribute("href")
-            if text:
-                results["construction_courses"].append({"text": text, "url": url})
-    except Exception as e:
-        print(f"Ошибка при парсинге строительных курсов: {str(e)}")
-
-    # Парсинг списка специальных курсов
-    try:
-        if elements_to_parse["special_courses"]["selector"]["type"] == "xpath":
-            elements = driver.find_elements(By.XPATH, elements_to_parse["special_courses"]["selector"]["value"])
-        for el in elements:
-            text = el.text.strip()
-            url = el.get_attribute("href")
-            if text:
-                results["special_courses"].append({"text": text, "url": url})
-    except Exception as e:
-        print(f"Ошибка при парсинге специальных курсов: {str(e)}")
-
-    return results
-
-# 💾 Функция сохранения результатов в Markdown-файл
-def save_results_to_file(results, filename="DPO_glavnaya.md"):
-    # Создание пути для сохранения файла в текущей директории
-    save_path = Path.cwd() / filename
-
-    with open(save_path, "w", encoding="utf-8") as f:
-        for res in results:
-            # Запись разделителя и URL страницы
-            f.write(f"# Страница: {res['url']}\n\n")
-            f.write(f"[Открыть страницу]({res['url']})\n\n")
-            f.write(f"{'='*80}\n\n")
-
-            # Запись секций с заголовками и текстами
-            for section in res["sections"]:
-                if section["title"]:
-                    f.write(f"## {section['title']}\n\n")
-                if section["text"]:
-                    f.write(f"{section['text']}\n\n")
-
-            # Запись ссылок
-            if res["links"]:
-                f.write("## Ссылки\n\n")
-                for link in res["links"]:
-                    f.write(f"- [{link['text']}]({link['url']})\n")
-                f.write("\n")
-
-            # Запись особенностей обучения
-            if res["education_features"]:
-                f.write("## Особенности обучения\n\n")
-                for item in res["education_features"]:
-                    f.write(f"- {item}\n")
-                f.write("\n")
-
-            # Запись форм обучения
-            if res["learning_forms"]:
-                f.write("## Формы обучения\n\n")
-                for item in res["learning_forms"]:
-                    f.write(f"- {item}\n")
-                f.write("\n")
-
-            # Запись медицинского образования
-            if res["medical_education"]:
-                f.write("## Медицинское образование\n\n")
-                for item in res["medical_education"]:
-                    f.write(f"- [{item['text']}]({item['url']})\n")
-                f.write("\n")
-
-            # Запись строительных курсов
-            if res["construction_courses"]:
-                f.write("## Строительные курсы\n\n")
-                for item in res["construction_courses"]:
-                    f.write(f"- [{item['text']}]({item['url']})\n")
-                f.write("\n")
-
-            # Запись специальных курсов
-            if res["special_courses"]:
-                f.write("## Специальные курсы\n\n")
-                for item in res["special_courses"]:
-                    f.write(f"- [{item['text']}]({item['url']})\n")
-                f.write("\n")
-
-    print(f"\n✅ Результаты сохранены в файл: {save_path}")
-    return save_path
+# 🔗 URL страницы для парсинга
+TARGET_URL = PAGE.url
 
-# 🔗 Список URL-адресов для парсинга
-urls = [
-    "https://academydpo.org/",
-]
+# 🧩 Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # 🚀 Основной блок выполнения программы
 if __name__ == "__main__":
-    # Инициализация веб-драйвера
-    driver = get_driver()
-    all_results = []
-
-    # Цикл по всем URL для парсинга
-    for url in urls:
-        print(f"🔍 Парсинг: {url}")
-        # Парсинг страницы и сохранение результатов
-        data = parse_website(url, driver)
-        all_results.append(data)
-
-    # Закрытие веб-драйвера
-    driver.quit()
-
-    # Сохранение результатов в Markdown-файл
-    save_results_to_file(all_results)
\ No newline at end of file
+    PAGE.main()
@@ -1,9 +1,6 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
+from dpo_extract import first_text
+from dpo_spec import PageSpec
 
 # Словарь селекторов для страницы MBA
 SELECTORS = {
@@ -17,154 +14,76 @@ SELECTORS = {
     "faq_text": (By.CSS_SELECTOR, "div.faq_block_text")
 }
 
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+# Строки группы выводятся через перевод строки, после группы — пустая строка
+def group(lines):
+    return ["\n".join(lines) + "\n"] if lines else []
 
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    driver.get(url)
-    try:
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
+# Функция для разбора списка особенностей
+def parse_features(page):
+    feature_texts = []
+    for ul in page["features_list"]:
+        feature_texts.extend(f"• {li['text'].strip()}" for li in ul["fields"]["items"] if li["text"].strip())
+    if not feature_texts:
+        print("Список особенностей пуст или не найден")
+    return group(feature_texts)
 
-    result = []
+# Функция для разбора параграфов описания
+def parse_description(page):
+    paragraph_texts = [p["text"].strip() for p in page["description_paragraphs"] if p["text"].strip()]
+    if not paragraph_texts:
+        print("Параграфы описания пусты или не найдены")
+    return group(paragraph_texts)
 
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге заголовка: {str(e)}")
+# Функция для разбора деталей курса (заголовки и параграфы сопоставляются по порядку)
+def parse_details(page):
+    detail_texts = []
+    for title, paragraph in zip(page["course_details_titles"], page["course_details_paragraphs"]):
+        title_text = title["text"].strip()
+        if title_text != "Объем программы":  # Исключаем пункт "Объем программы"
+            detail_texts.append(f"• {title_text}\n{paragraph['text'].strip()}")
+    if not detail_texts:
+        print("Детали курса пусты или не найдены")
+    return group(detail_texts)
 
-    # Извлечение списка особенностей
-    try:
-        features = WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located(SELECTORS["features_list"])
-        )
-        feature_texts = []
-        for ul in features:
-            li_elements = ul.find_elements(By.TAG_NAME, "li")
-            feature_texts.extend([f"• {li.text.strip()}" for li in li_elements if li.text.strip()])
-        if feature_texts:
-            result.append(("features", feature_texts))
-            print(f"Особенности: {feature_texts}")
-        else:
-            print("Список особенностей пуст или не найден")
-    except Exception as e:
-        print(f"Ошибка при парсинге списка особенностей: {str(e)}")
+# Функция для разбора FAQ (первый вопрос и ответ)
+def parse_faq(page):
+    faq_title = first_text(page["faq_title"])
+    faq_text = first_text(page["faq_text"])
+    if faq_title is None or faq_text is None:
+        print("Ошибка при парсинге FAQ: элемент не найден")
+        return []
+    return [f"• {faq_title}:\n{faq_text}"]
 
-    # Извлечение параграфов описания
-    try:
-        paragraphs = WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located(SELECTORS["description_paragraphs"])
-        )
-        paragraph_texts = [p.text.strip() for p in paragraphs if p.text.strip()]
-        if paragraph_texts:
-            result.append(("description", paragraph_texts))
-            print(f"Параграфы описания: {paragraph_texts}")
-        else:
-            print("Параграфы описания пусты или не найдены")
-    except Exception as e:
-        print(f"Ошибка при парсинге параграфов: {str(e)}")
+# Описание страницы: заголовок без ссылки, строки выводятся через один перевод строки
+PAGE = PageSpec(
+    url="https://academydpo.org/master-of-business-administration-mba",
+    output="DPO_master-of-business-administration-mba.md",
+    selectors=SELECTORS,
+    timeout=20,
+    header=("{title}\n",),
+    separator="\n",
+    blocks=[
+        {"kind": "custom", "label": "Особенности", "extract": parse_features,
+         "snapshot": {"features_list": {"locator": SELECTORS["features_list"],
+                                        "fields": {"items": (By.TAG_NAME, "li")}}}},
+        {"kind": "custom", "label": "Параграфы описания", "extract": parse_description,
+         "snapshot": {"description_paragraphs": SELECTORS["description_paragraphs"]}},
+        {"kind": "text", "selector": "course_subtitle", "format": "{}\n", "label": "Подзаголовок курса"},
+        {"kind": "custom", "label": "Детали курса", "extract": parse_details,
+         "snapshot": {"course_details_titles": SELECTORS["course_details_titles"],
+                      "course_details_paragraphs": SELECTORS["course_details_paragraphs"]}},
+        {"kind": "custom", "label": "FAQ", "extract": parse_faq,
+         "snapshot": {"faq_title": SELECTORS["faq_title"], "faq_text": SELECTORS["faq_text"]}},
+    ],
+)
 
-    # Извлечение подзаголовка курса
-    try:
-        course_subtitle = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(SELECTORS["course_subtitle"])
-        ).text.strip()
-        result.append(("course_subtitle", course_subtitle))
-        print(f"Подзаголовок курса: {course_subtitle}")
-    except Exception as e:
-        print(f"Ошибка при парсинге подзаголовка курса: {str(e)}")
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
 
-    # Извлечение заголовков и текста деталей курса
-    try:
-        detail_titles = WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located(SELECTORS["course_details_titles"])
-        )
-        detail_paragraphs = WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located(SELECTORS["course_details_paragraphs"])
-        )
-        detail_texts = []
-        for title, paragraph in zip(detail_titles, detail_paragraphs):
-            title_text = title.text.strip()
-            paragraph_text = paragraph.text.strip()
-            if title_text != "Объем программы":  # Исключаем пункт "Объем программы"
-                detail_texts.append((title_text, paragraph_text))
-        if detail_texts:
-            result.append(("course_details", detail_texts))
-            print(f"Детали курса: {detail_texts}")
-        else:
-            print("Детали курса пусты или не найдены")
-    except Exception as e:
-        print(f"Ошибка при парсинге деталей курса: {str(e)}")
-
-    # Извлечение FAQ
-    try:
-        faq_title = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(SELECTORS["faq_title"])
-        ).text.strip()
-        faq_text = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located(SELECTORS["faq_text"])
-        ).text.strip()
-        faq_combined = [f"• {faq_title}:\n{faq_text}"]
-        result.append(("faq", faq_combined))
-        print(f"FAQ: {faq_combined}")
-    except Exception as e:
-        print(f"Ошибка при парсинге FAQ: {str(e)}")
-
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_master-of-business-administration-mba.md"):
-    content = []
-    for item in data:
-        if item[0] == "title":
-            content.append(f"{item[1]}\n")
-        elif item[0] == "features":
-            content.extend(item[1])
-            content.append("")  # Пустая строка после списка
-        elif item[0] == "description":
-            content.extend(item[1])
-            content.append("")  # Пустая строка после описания
-        elif item[0] == "course_subtitle":
-            content.append(f"{item[1]}\n")
-        elif item[0] == "course_details":
-            for title, text in item[1]:
-                content.append(f"• {title}\n{text}")
-            content.append("")  # Пустая строка после деталей курса
-        elif item[0] == "faq":
-            content.extend(item[1])
-
-    final_content = "\n".join(line for line in content if line.strip() or line == "")
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    print(f"Контент записан в файл: {filename}")
-    return filename
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    TARGET_URL = "https://academydpo.org/master-of-business-administration-mba"
-    driver = get_driver()
-    try:
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
@@ -1,9 +1,5 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
+from dpo_spec import PageSpec
 
 # Словарь селекторов для страницы https://academydpo.org/mezhdunarodnoe-sotrudnichestvo
 SELECTORS = {
@@ -11,80 +7,23 @@ SELECTORS = {
     "paragraphs": (By.CSS_SELECTOR, "div.page__content-desc > p")
 }
 
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+# Описание страницы: заголовок и блоки извлекаются за один проход и выводятся общим рендером
+PAGE = PageSpec(
+    url="https://academydpo.org/mezhdunarodnoe-sotrudnichestvo",
+    output="DPO_mezhdunarodnoe-sotrudnichestvo.md",
+    selectors=SELECTORS,
+    blocks=[
+        {"kind": "paragraphs", "selector": "paragraphs", "label": "Параграфы"},
+    ],
+)
 
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    driver.get(url)
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
 
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге заголовка: {str(e)}")
-
-    # Извлечение параграфов
-    try:
-        paragraphs = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["paragraphs"])
-        )
-        paragraph_texts = [p.text.strip() for p in paragraphs if p.text.strip()]
-        if paragraph_texts:
-            result.append(("content", paragraph_texts))
-            print(f"Параграфы: {paragraph_texts}")
-    except Exception as e:
-        print(f"Ошибка при парсинге параграфов: {str(e)}")
-
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_mezhdunarodnoe-sotrudnichestvo.md"):
-    content = []
-
-    # Формируем контент в логическом порядке
-    for item in data:
-        if item[0] == "title":
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "content":
-            content.extend(item[1])
-
-    final_content = "\n\n".join(line for line in content if line.strip())
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    print(f"Контент записан в файл: {filename}")
-    return filename
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    TARGET_URL = "https://academydpo.org/mezhdunarodnoe-sotrudnichestvo"
-    driver = get_driver()
-    try:
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
@@ -1,9 +1,5 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
+from dpo_spec import PageSpec
 
 # Словарь селекторов
 SELECTORS = {
@@ -13,119 +9,53 @@ SELECTORS = {
     "partner_images": (By.CSS_SELECTOR, "img.partners__block-img")
 }
 
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    driver.get(url)
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
-
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге заголовка: {str(e)}")
-
-    # Извлечение подзаголовка (underline)
-    try:
-        underline_text = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["underline_text"])
-        ).text.strip()
-        result.append(("subtitle", underline_text))
-        print(f"Подзаголовок: {underline_text}")
-    except Exception as e:
-        print(f"Ошибка при парсинге подзаголовка: {str(e)}")
-
-    # Извлечение данных о партнёрах
-    try:
-        partner_blocks = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["partner_blocks"])
-        )
-        partner_data = []
-        for block in partner_blocks:
-            partner = {}
-            # Проверяем, есть ли ссылка (тег <a>)
-            try:
-                link = block.find_element(By.XPATH, "./self::a | ./a")
-                partner["href"] = link.get_attribute("href")
-            except:
-                partner["href"] = None
-            # Извлекаем изображение
-            try:
-                img = block.find_element(*SELECTORS["partner_images"])
-                partner["name"] = img.get_attribute("alt").strip()
-                partner["img_src"] = img.get_attribute("src").strip()
-            except Exception as e:
-                print(f"Ошибка при парсинге изображения партнёра: {str(e)}")
-                continue
-            if partner.get("name"):
-                partner_data.append(partner)
-        if partner_data:
-            result.append(("partners", partner_data))
-            print(f"Партнёры: {partner_data}")
-    except Exception as e:
-        print(f"Ошибка при парсинге партнёров: {str(e)}")
-
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_partnery.md"):
+# Функция для разбора блоков партнёров: название и логотип из <img>, ссылка из вложенного <a>
+def parse_partners(page):
     content = []
-    for item in data:
-        if item[0] == "title":
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "subtitle":
-            content.append(f"## {item[1]}")
-        elif item[0] == "partners":
-            content.append("## Партнёры")
-            for partner in item[1]:
-                name = partner.get("name", "Неизвестный партнёр")
-                href = partner.get("href")
-                img_src = partner.get("img_src")
-                if href:
-                    content.append(f"- [{name}]({href})")
-                else:
-                    content.append(f"- {name}")
-                if img_src:
-                    content.append(f"  - Логотип: [Логотип]({img_src})")
-                content.append("")  # Пустая строка для разделения партнёров
-
-    final_content = "\n".join(line for line in content if line.strip())
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    print(f"Контент записан в файл: {filename}")
-    return filename
+    for block in page["partner_blocks"]:
+        links = block["fields"]["link"]
+        href = links[0]["attrs"]["href"] if links else None
+        images = block["fields"]["image"]
+        if not images or images[0]["attrs"]["alt"] is None or images[0]["attrs"]["src"] is None:
+            print("Ошибка при парсинге изображения партнёра: изображение не найдено")
+            continue
+        name = images[0]["attrs"]["alt"].strip()
+        img_src = images[0]["attrs"]["src"].strip()
+        if not name:
+            continue
+        content.append(f"- [{name}]({href})" if href else f"- {name}")
+        if img_src:
+            content.append(f"  - Логотип: [Логотип]({img_src})")
+    return content
+
+# Описание страницы: строки выводятся через один перевод строки
+PAGE = PageSpec(
+    url="https://academydpo.org/partnery",
+    output="DPO_partnery.md",
+    selectors=SELECTORS,
+    separator="\n",
+    blocks=[
+        {"kind": "text", "selector": "underline_text", "format": "## {}", "label": "Подзаголовок"},
+        {"kind": "custom", "label": "Партнёры", "heading": "## Партнёры", "extract": parse_partners,
+         "snapshot": {
+             "partner_blocks": {
+                 "locator": SELECTORS["partner_blocks"],
+                 "fields": {
+                     "link": {"locator": (By.XPATH, "./self::a | ./a"), "attrs": ["href"]},
+                     "image": {"locator": SELECTORS["partner_images"], "attrs": ["alt", "src"]},
+                 },
+             },
+         }},
+    ],
+)
+
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
+
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    TARGET_URL = "https://academydpo.org/partnery"
-    driver = get_driver()
-    try:
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
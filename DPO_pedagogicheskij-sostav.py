@@ -1,51 +1,29 @@
 import requests
-import pdfplumber
-import re
-import os
 from urllib.parse import urljoin
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.options import Options
+from dpo_driver import get_driver, headless_options
+from dpo_archive import archive_page
+from dpo_cache import DocumentCache
+from dpo_pdf import clean_text, extract_text
 
 
-def is_text_valid(text):
-    """Проверяет текст на наличие бессмысленных символов или 'белиберды'."""
-    garbage_pattern = r'[^a-zA-Zа-яА-Я0-9\s.,;:!?-]'
-    garbage_count = len(re.findall(garbage_pattern, text))
-    total_length = len(text)
+def parse_page(url, driver=None):
+    """Парсит страницу с помощью Selenium и извлекает заголовок и ссылку на PDF.
 
-    if total_length == 0 or (garbage_count / total_length > 0.3):
-        return False
-
-    word_pattern = r'[а-яА-Я]{3,}'
-    words = re.findall(word_pattern, text)
-    return len(words) > 2
-
-
-def clean_text(text):
-    """Очищает текст от лишних пробелов и переносов строк."""
-    text = re.sub(r'\s+', ' ', text.strip())
-    return text
-
-
-def parse_page(url):
-    """Парсит страницу с помощью Selenium и извлекает заголовок и ссылку на PDF."""
+    Если driver не передан, браузер создается и закрывается внутри функции.
+    """
+    own_driver = driver is None
     try:
-        # Настройка Selenium
-        chrome_options = Options()
-        chrome_options.add_argument("--headless")  # Запуск в фоновом режиме
-        chrome_options.add_argument("--disable-gpu")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--enable-unsafe-swiftshader")  # Для подавления предупреждений WebGL
-
-        # Укажите путь к chromedriver.exe, если он не в PATH
-        # service = Service('D:/python_work/DPO/DPO/chromedriver.exe')  # Раскомментируйте и укажите путь, если нужно
-        service = Service()  # Используется, если chromedriver в PATH
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-
-        # Загружаем страницу
+        # Подключение к общему браузеру main.py (если запущен с --shared-chrome),
+        # иначе запуск своего браузера с chromedriver из локального кэша
+        if own_driver:
+            chrome_options = headless_options()
+            chrome_options.add_argument("--enable-unsafe-swiftshader")  # Для подавления предупреждений WebGL
+            driver = get_driver(chrome_options=chrome_options)
+
+        # Загружаем страницу и сохраняем ее HTML в архив (страница не использует wait_ready)
         driver.get(url)
+        archive_page(driver)
 
         # Извлекаем заголовок
         title_element = driver.find_element(By.CSS_SELECTOR, 'article.page__content h1.page__content-title')
@@ -55,35 +33,26 @@ def parse_page(url):
         pdf_link = driver.find_element(By.CSS_SELECTOR, 'article.page__content div.page__content-desc a')
         pdf_url = urljoin(url, pdf_link.get_attribute('href')) if pdf_link else None
 
-        driver.quit()
         return title_text, pdf_url
     except Exception as e:
         print(f"Ошибка при парсинге страницы: {e}")
         return None, None
+    finally:
+        if own_driver and driver is not None:
+            driver.quit()
 
 
 def parse_pdf(pdf_url):
     """Парсит PDF и извлекает текст, исключая страницы с невалидным текстом."""
     try:
-        # Добавляем User-Agent, чтобы обойти возможные ограничения
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36'
-        }
-        response = requests.get(pdf_url, headers=headers)
-        response.raise_for_status()
-
-        with open('temp.pdf', 'wb') as f:
-            f.write(response.content)
-
-        text_content = []
-        with pdfplumber.open('temp.pdf') as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text and is_text_valid(page_text):
-                    cleaned_text = clean_text(page_text)
-                    text_content.append(cleaned_text)
-
-        os.remove('temp.pdf')
+        # PDF скачивается только при изменении, текст страниц берется из кэша (см. dpo_cache.py);
+        # новые страницы разбираются параллельно в пуле процессов прямо из файла кэша (см. dpo_pdf.py)
+        cache = DocumentCache()
+        digest = cache.fetch(pdf_url, probe=True)
+        memo = cache.load_text(digest)
+        text_content = extract_text(cache.blob_path(digest), memo=memo)
+        cache.save_text(digest, memo)
+
         return '\n\n'.join(text_content)
     except requests.exceptions.HTTPError as e:
         print(f"Ошибка HTTP при загрузке PDF: {e}")
@@ -101,22 +70,29 @@ def save_to_markdown(title, page_url, pdf_text):
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(markdown_content)
     print(f"Результат сохранен в {output_file}")
+    return output_file
 
 
-def main():
-    url = "https://academydpo.org/pedagogicheskij-sostav"
+TARGET_URL = "https://academydpo.org/pedagogicheskij-sostav"
+
 
-    title, pdf_url = parse_page(url)
+def run(driver, url=TARGET_URL):
+    """Единая точка входа для main.py. Возвращает имя Markdown-файла или None при ошибке."""
+    title, pdf_url = parse_page(url, driver)
     if not title or not pdf_url:
         print("Не удалось извлечь заголовок или ссылку на PDF")
-        return
+        return None
 
     pdf_text = parse_pdf(pdf_url)
     if not pdf_text:
         print("Не удалось извлечь текст из PDF. Проверьте доступ к файлу или защиту от ботов.")
-        return
+        return None
+
+    return save_to_markdown(title, url, pdf_text)
 
-    save_to_markdown(title, url, pdf_text)
+
+def main():
+    run(None)
 
 
 if __name__ == "__main__":
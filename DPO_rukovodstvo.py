@@ -1,22 +1,6 @@
 # Импорт необходимых библиотек
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
-
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    # Настройка опций для браузера Chrome
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Запуск браузера в фоновом режиме (без GUI)
-    chrome_options.add_argument("--disable-gpu")  # Отключение GPU для стабильности
-    chrome_options.add_argument("--no-sandbox")  # Отключение песочницы для совместимости
-    chrome_options.add_argument("--window-size=1920,1080")  # Установка размера окна браузера
-    # Инициализация драйвера Chrome
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+from dpo_spec import PageSpec
 
 # Словарь с CSS-селекторами для извлечения данных
 SELECTORS = {
@@ -25,120 +9,47 @@ SELECTORS = {
     "all_content": (By.CSS_SELECTOR, ".page__content-desc p"),  # Селектор всех параграфов контента
 }
 
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    # Загрузка страницы по указанному URL
-    driver.get(url)
-    try:
-        # Ожидание загрузки основного заголовка (15 секунд)
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
-
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге основного заголовка: {str(e)}")
-
-    # Парсинг контента
-    try:
-        content_elements = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["all_content"])
-        )
-        section_titles = driver.find_elements(*SELECTORS["section_titles"])
-        section_titles_text = [elem.text.strip() for elem in section_titles]
-
-        # Распределение параграфов по секциям
-        content_index = 0
-        for i, title in enumerate(section_titles_text):
-            section_content = []
-            if title == "Руководство":
-                # Для "Руководство" добавляем первый и второй параграфы
-                if content_index < len(content_elements):
-                    section_content.append(content_elements[content_index].text.strip())
-                    content_index += 1
-                if content_index < len(content_elements):
-                    section_content.append(content_elements[content_index].text.strip())
-                    content_index += 1
-            elif title == "Попечительский совет":
-                # Для "Попечительский совет" добавляем два параграфа
-                if content_index < len(content_elements):
-                    section_content.append(content_elements[content_index].text.strip())
-                    content_index += 1
-                if content_index < len(content_elements):
-                    section_content.append(content_elements[content_index].text.strip())
-                    content_index += 1
-            else:
-                # Для остальных секций добавляем один параграф
-                if content_index < len(content_elements):
-                    section_content.append(content_elements[content_index].text.strip())
-                    content_index += 1
-
-            result.append(("section", {"title": title, "content": section_content}))
-            print(f"Обработана секция: {title}, контент: {section_content}")
+# Число параграфов секции по ее заголовку; остальным секциям достается по одному
+SECTION_PARAGRAPHS = {"Руководство": 2, "Попечительский совет": 2}
 
-    except Exception as e:
-        print(f"Ошибка при парсинге контента: {str(e)}")
-
-    print(f"Итоговые данные: {result}")
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_rukovodstvo.md"):
+# Функция для распределения параграфов по секциям в порядке следования заголовков
+def parse_sections(page):
+    paragraphs = [node["text"].strip() for node in page["all_content"]]
     content = []
-    # Обработка элементов для форматирования в Markdown
-    for item in data:
-        if item[0] == "title":
-            # Добавление основного заголовка и ссылки на страницу
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "section":
-            section = item[1]
-            if section["title"] == "Руководство":
-                # Для "Руководство": первый параграф перед заголовком, второй — после
-                content.extend(section["content"][:1])  # Первый параграф
-                content.append(f"## {section['title']}")  # Заголовок секции
-                content.extend(section["content"][1:])  # Второй параграф
-            else:
-                # Для остальных секций: заголовок, затем контент
-                content.append(f"## {section['title']}")
-                content.extend(section["content"])
-
-    # Объединение контента с двумя пустыми строками между элементами
-    final_content = "\n\n".join(line for line in content if line.strip())
-
-    # Сохранение в файл с кодировкой UTF-8
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-
-    print(f"Контент записан в файл: {filename}")
-    return filename
+    content_index = 0
+    for title in (node["text"].strip() for node in page["section_titles"]):
+        count = SECTION_PARAGRAPHS.get(title, 1)
+        section_content = paragraphs[content_index:content_index + count]
+        content_index += len(section_content)
+        print(f"Обработана секция: {title}, контент: {section_content}")
+        if title == "Руководство":
+            # Для "Руководство": первый параграф перед заголовком, второй — после
+            content.extend(section_content[:1])
+            content.append(f"## {title}")
+            content.extend(section_content[1:])
+        else:
+            content.append(f"## {title}")
+            content.extend(section_content)
+    return content
+
+# Описание страницы: заголовки и параграфы извлекаются за один проход
+PAGE = PageSpec(
+    url="https://academydpo.org/rukovodstvo",
+    output="DPO_rukovodstvo.md",
+    selectors=SELECTORS,
+    blocks=[
+        {"kind": "custom", "label": "Секции", "extract": parse_sections,
+         "snapshot": {"section_titles": SELECTORS["section_titles"], "all_content": SELECTORS["all_content"]}},
+    ],
+)
+
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
+
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    # URL страницы для парсинга
-    TARGET_URL = "https://academydpo.org/rukovodstvo"
-
-    # Инициализация драйвера
-    driver = get_driver()
-    try:
-        # Парсинг страницы и получение данных
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        # Сохранение данных в Markdown-файл
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        # Закрытие драйвера для освобождения ресурсов
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
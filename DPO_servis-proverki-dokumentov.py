@@ -1,9 +1,6 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from pathlib import Path
+from dpo_extract import TextIndex, anchor_container
+from dpo_spec import PageSpec
 
 # Словарь селекторов для страницы https://academydpo.org/servis-proverki-dokumentov
 SELECTORS = {
@@ -11,119 +8,52 @@ SELECTORS = {
     "desc_paragraphs": (By.CSS_SELECTOR, "div.valid_doc__desc > p:not(.wp-block-heading ~ p)"),
     "sub_title": (By.CSS_SELECTOR, "h1.wp-block-heading"),
     "registry_paragraphs": (By.CSS_SELECTOR, "div.valid_doc__desc > h1.wp-block-heading ~ p"),
-    "list_items": (By.CSS_SELECTOR, "div.valid_doc__desc > ul > li")
+    "list_items": (By.CSS_SELECTOR, "div.valid_doc__desc > ul > li"),
+    "content": (By.CSS_SELECTOR, "div.valid_doc__desc"),  # Контейнер для индекса фраз-якорей
 }
 
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    driver.get(url)
-    try:
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
-
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге заголовка: {str(e)}")
-
-    # Извлечение параграфов описания (до подзаголовка)
-    try:
-        desc_paragraphs = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["desc_paragraphs"])
-        )
-        desc_texts = [p.text.strip() for p in desc_paragraphs if p.text.strip()]
-        if desc_texts:
-            result.append(("desc_content", desc_texts))
-            print(f"Параграфы описания: {desc_texts}")
-    except Exception as e:
-        print(f"Ошибка при парсинге параграфов описания: {str(e)}")
-
-    # Извлечение подзаголовка
-    try:
-        sub_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["sub_title"])
-        ).text.strip()
-        result.append(("sub_title", sub_title))
-        print(f"Подзаголовок: {sub_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге подзаголовка: {str(e)}")
-
-    # Извлечение параграфов реестра (после подзаголовка) и списка целей
-    try:
-        registry_paragraphs = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["registry_paragraphs"])
-        )
-        registry_texts = []
-        for i, p in enumerate(registry_paragraphs):
-            p_text = p.text.strip()
-            # Обработка параграфа с целями реестра
-            if "Целями создания Федерального реестра являются" in p_text:
-                try:
-                    ul = p.find_element(By.XPATH, "./following-sibling::ul")
-                    li_elements = ul.find_elements(By.CSS_SELECTOR, "li")
-                    measures = [li.text.strip() for li in li_elements if li.text.strip()]
-                    p_text = f"{p_text}\n" + "\n".join(f"- {m}" for m in measures)
-                except:
-                    print("Не удалось найти список целей реестра")
-            registry_texts.append(p_text)
-        if registry_texts:
-            result.append(("registry_content", registry_texts))
-            print(f"Параграфы реестра: {registry_texts}")
-    except Exception as e:
-        print(f"Ошибка при парсинге параграфов реестра: {str(e)}")
-
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_servis-proverki-dokumentov.md"):
-    content = []
-    for item in data:
-        if item[0] == "title":
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "desc_content":
-            content.extend(item[1])
-        elif item[0] == "sub_title":
-            content.append(f"## {item[1]}")
-        elif item[0] == "registry_content":
-            content.extend(item[1])
-
-    final_content = "\n\n".join(line for line in content if line.strip())
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    print(f"Контент записан в файл: {filename}")
-    return filename
+# Фраза-якорь параграфа, за которым следует список целей реестра
+GOALS_TRIGGER = "Целями создания Федерального реестра являются"
+
+# Функция для разбора параграфов реестра (после подзаголовка) и списка целей
+def parse_registry(page):
+    index = TextIndex(page["content"], [GOALS_TRIGGER])
+    registry_texts = []
+    for p in page["registry_paragraphs"]:
+        p_text = p["text"].strip()
+        # Обработка параграфа с целями реестра: список берется из индекса
+        if GOALS_TRIGGER in p_text:
+            goals = index.list_texts(GOALS_TRIGGER, ["p"])
+            if goals:
+                p_text = f"{p_text}\n" + "\n".join(f"- {m}" for m in goals)
+            else:
+                print("Не удалось найти список целей реестра")
+        registry_texts.append(p_text)
+    return registry_texts
+
+# Описание страницы: описание, подзаголовок и параграфы реестра за один проход
+PAGE = PageSpec(
+    url="https://academydpo.org/servis-proverki-dokumentov",
+    output="DPO_servis-proverki-dokumentov.md",
+    selectors=SELECTORS,
+    blocks=[
+        {"kind": "paragraphs", "selector": "desc_paragraphs", "label": "Параграфы описания"},
+        {"kind": "text", "selector": "sub_title", "format": "## {}", "label": "Подзаголовок"},
+        {"kind": "custom", "label": "Параграфы реестра", "extract": parse_registry,
+         "snapshot": {
+             "registry_paragraphs": SELECTORS["registry_paragraphs"],
+             "content": anchor_container(SELECTORS["content"], items=(By.CSS_SELECTOR, "li")),
+         }},
+    ],
+)
+
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
+
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    TARGET_URL = "https://academydpo.org/servis-proverki-dokumentov"
-    driver = get_driver()
-    try:
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
@@ -1,10 +1,9 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-import time
-from pathlib import Path
+from dpo_extract import wait_all_shown
+from dpo_spec import PageSpec
+
+# Часть содержимого страницы строится JavaScript: статический режим не подходит
+NEEDS_BROWSER = True
 
 # Словарь селекторов
 SELECTORS = {
@@ -21,196 +20,149 @@ SELECTORS = {
     }
 }
 
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--window-size=1920,1080")
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
-
-# Функция для парсинга секции
-def parse_section(driver, title_locator, content_locator, section_name):
-    content = []
-    try:
-        title = WebDriverWait(driver, 40).until(
-            EC.visibility_of_element_located(title_locator)
-        ).text.strip()
-        print(f"Найден заголовок секции '{section_name}': {title}")
-    except Exception as e:
-        print(f"Не удалось найти заголовок секции '{section_name}' {title_locator}: {str(e)}")
-        return None
+# Поля карточки условий сотрудничества
+ITEM_FIELDS = {
+    "name": (By.CSS_SELECTOR, "div.name"),
+    "span": (By.CSS_SELECTOR, "span"),
+    "paragraph": (By.CSS_SELECTOR, "p"),
+    "bold": (By.CSS_SELECTOR, "b"),
+    "price": (By.CSS_SELECTOR, "div.price"),
+}
 
-    try:
-        # Проверяем наличие элементов
-        elements = WebDriverWait(driver, 40).until(
-            EC.presence_of_all_elements_located(content_locator)
-        )
-        print(f"Найдено {len(elements)} элементов в секции '{section_name}'")
-        seen_texts = set()
-        for element in elements:
-            if element.get_attribute('class') == 'item':  # Для секции условий
-                try:
-                    name = element.find_element(By.CSS_SELECTOR, "div.name").text.strip()
-                    span = element.find_element(By.CSS_SELECTOR, "span").text.strip()
-                    paragraph = element.find_element(By.CSS_SELECTOR, "p").text.strip()
-                    bold = element.find_element(By.CSS_SELECTOR, "b").text.strip()
-                    price = element.find_element(By.CSS_SELECTOR, "div.price").text.strip()
-                    item_text = f"{name}\n{span}\n{paragraph}\n{bold} {price}"
-                    print(f"Обработан элемент item: {item_text}")
-                    if item_text not in seen_texts:
-                        content.append(item_text)
-                        seen_texts.add(item_text)
-                except Exception as e:
-                    print(f"Ошибка при парсинге элемента item в секции '{section_name}': {str(e)}")
-                    try:
-                        print(f"HTML элемента: {element.get_attribute('outerHTML')[:200]}...")
-                    except:
-                        pass
-            else:  # Для секции шагов (name или desc)
-                try:
-                    element_text = element.get_attribute('innerText').strip()
-                    if element.get_attribute('class') == 'desc' and 'связаться с нами' in element_text:
-                        try:
-                            link = element.find_element(By.CSS_SELECTOR, "a")
-                            link_text = link.text.strip()
-                            link_href = link.get_attribute("href")
-                            element_text = element_text.replace(link_text, f"[{link_text}]({link_href})")
-                        except Exception as e:
-                            print(f"Ошибка при обработке ссылки в секции '{section_name}': {str(e)}")
-                    if element_text and element_text not in seen_texts:
-                        content.append(element_text)
-                        seen_texts.add(element_text)
-                        print(f"Обработан элемент name/desc: {element_text}")
-                except Exception as e:
-                    print(f"Ошибка при парсинге элемента name/desc в секции '{section_name}': {str(e)}")
-                    try:
-                        print(f"HTML элемента: {element.get_attribute('outerHTML')[:200]}...")
-                    except:
-                        pass
-        print(f"Найден контент для секции '{section_name}': {content}")
-    except Exception as e:
-        print(f"Не удалось найти контент для секции '{section_name}' {content_locator}: {str(e)}")
+# Функция ожидания JS-блока преимуществ: snapshot() не должен застать его наполовину построенным
+def wait_advantages(driver):
+    if not wait_all_shown(driver, SELECTORS["advantages_block"]):
+        print("Не все пункты блока преимуществ стали видимыми")
+
+# Функция для разбора вводного параграфа
+def parse_intro(page):
+    intros = [node for node in page["intro_paragraph"] if node["shown"]]
+    if not intros:
+        print("Ошибка при парсинге вводного параграфа: элемент не отображается")
+        return []
+    return [intros[0]["text"].strip()]
+
+# Функция для разбора блока преимуществ
+def parse_advantages(page):
+    advantages = page["advantages_block"]
+    if not advantages or not all(node["shown"] for node in advantages):
+        print("Ошибка при парсинге блока преимуществ: элементы не отображаются")
+        return []
+    advantages_texts = []
+    for item in advantages:
+        fields = item["fields"]
+        if not fields["name"] or not fields["desc"]:
+            print("Ошибка при парсинге блока преимуществ: не найдены div.name/div.desc")
+            return []
+        name = fields["name"][0]["text"].strip().rstrip(',')
+        desc = fields["desc"][0]["text"].strip()
+        advantages_texts.append(f"{name}: {desc}")
+    return advantages_texts
+
+# Функция для разбора секции по заранее извлеченным данным страницы
+def parse_section(page, title_key, content_key, section_name):
+    titles = [node for node in page[title_key] if node["shown"]]
+    if not titles:
+        print(f"Не удалось найти заголовок секции '{section_name}'")
+        return []
+    title = titles[0]["text"].strip()
+    print(f"Найден заголовок секции '{section_name}': {title}")
+    content = [f"## {title}"]
+
+    elements = page[content_key]
+    if not elements:
+        print(f"Не удалось найти контент для секции '{section_name}'")
         # Проверяем наличие div.item и div.name/desc на странице
-        try:
-            items = driver.find_elements(By.CSS_SELECTOR, "div.item")
-            names_descs = driver.find_elements(By.CSS_SELECTOR, "div.name, div.desc")
-            print(f"Найдено div.item на странице: {len(items)}")
-            print(f"Найдено div.name/desc на странице: {len(names_descs)}")
-            if items:
-                print(f"HTML первого div.item: {items[0].get_attribute('outerHTML')[:200]}...")
-            if names_descs:
-                print(f"HTML первого div.name/desc: {names_descs[0].get_attribute('outerHTML')[:200]}...")
-        except:
-            pass
-        # Выводим HTML страницы
-        try:
-            body = driver.find_element(By.TAG_NAME, "body").get_attribute('outerHTML')[:500]
-            print(f"HTML страницы (первые 500 символов): {body}...")
-        except:
-            pass
-
-    return {"title": title, "content": content}
-
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    driver.get(url)
-    # Явная задержка для загрузки JavaScript
-    time.sleep(5)
-    try:
-        WebDriverWait(driver, 40).until(
-            EC.visibility_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
-
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 40).until(
-            EC.visibility_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге заголовка: {str(e)}")
-
-    # Извлечение вводного параграфа
-    try:
-        intro_text = WebDriverWait(driver, 40).until(
-            EC.visibility_of_element_located(SELECTORS["intro_paragraph"])
-        ).text.strip()
-        if intro_text:
-            result.append(("content", [intro_text]))
-            print(f"Вводный параграф: {intro_text}")
-    except Exception as e:
-        print(f"Ошибка при парсинге вводного параграфа: {str(e)}")
-
-    # Извлечение блока преимуществ
-    try:
-        advantages = WebDriverWait(driver, 40).until(
-            EC.visibility_of_all_elements_located(SELECTORS["advantages_block"])
-        )
-        advantages_texts = []
-        for item in advantages:
-            name = item.find_element(By.CSS_SELECTOR, "div.name").text.strip().rstrip(',')
-            desc = item.find_element(By.CSS_SELECTOR, "div.desc").text.strip()
-            advantages_texts.append(f"{name}: {desc}")
-        if advantages_texts:
-            result.append(("section", {"title": "Преимущества сотрудничества", "content": advantages_texts}))
-            print(f"Блок преимуществ: {advantages_texts}")
-    except Exception as e:
-        print(f"Ошибка при парсинге блока преимуществ: {str(e)}")
-
-    # Парсинг секции условий сотрудничества
-    conditions = parse_section(driver, SELECTORS["partnership_conditions"]["title"],
-                            SELECTORS["partnership_conditions"]["content"],
-                            "Сотрудничество на выгодных для вас условиях")
-    if conditions:
-        result.append(("section", conditions))
-
-    # Парсинг секции шагов сотрудничества
-    steps = parse_section(driver, SELECTORS["partnership_steps"]["title"],
-                        SELECTORS["partnership_steps"]["content"],
-                        "Станьте нашим партнером за 3 простых шага")
-    if steps:
-        result.append(("section", steps))
-
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_sotrudnichestvo.md"):
-    content = []
-    for item in data:
-        if item[0] == "title":
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "content":
-            content.extend(item[1])
-        elif item[0] == "section":
-            section = item[1]
-            content.append(f"## {section['title']}")
-            content.extend(section['content'])
-
-    final_content = "\n\n".join(line for line in content if line.strip())
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-    print(f"Контент записан в файл: {filename}")
-    return filename
+        print(f"Найдено div.item на странице: {len(page['all_items'])}")
+        print(f"Найдено div.name/desc на странице: {len(page['all_names_descs'])}")
+        return content
+
+    print(f"Найдено {len(elements)} элементов в секции '{section_name}'")
+    seen_texts = set()
+    for element in elements:
+        fields = element["fields"]
+        if element["attrs"]["class"] == 'item':  # Для секции условий
+            parts = [fields[key] for key in ITEM_FIELDS]
+            if not all(parts):
+                missing = [key for key, nodes in zip(ITEM_FIELDS, parts) if not nodes]
+                print(f"Ошибка при парсинге элемента item в секции '{section_name}': не найдены {missing}")
+                print(f"HTML элемента: {element['attrs']['outerHTML'][:200]}...")
+                continue
+            name, span, paragraph, bold, price = (nodes[0]["text"].strip() for nodes in parts)
+            item_text = f"{name}\n{span}\n{paragraph}\n{bold} {price}"
+            if item_text not in seen_texts:
+                content.append(item_text)
+                seen_texts.add(item_text)
+        else:  # Для секции шагов (name или desc)
+            element_text = element["innerText"].strip()
+            if element["attrs"]["class"] == 'desc' and 'связаться с нами' in element_text:
+                if fields["link"]:
+                    link = fields["link"][0]
+                    link_text = link["text"].strip()
+                    element_text = element_text.replace(link_text, f"[{link_text}]({link['attrs']['href']})")
+                else:
+                    print(f"Ошибка при обработке ссылки в секции '{section_name}': ссылка не найдена")
+            if element_text and element_text not in seen_texts:
+                content.append(element_text)
+                seen_texts.add(element_text)
+    return content
+
+# Описание страницы: как и раньше, страница готова, когда отображается заголовок h1;
+# блок преимуществ, который строит JavaScript, дополнительно ожидается в prepare без
+# отмены разбора; все данные затем извлекаются одним запросом к браузеру
+PAGE = PageSpec(
+    url="https://academydpo.org/sotrudnichestvo",
+    output="DPO_sotrudnichestvo.md",
+    selectors=SELECTORS,
+    title_shown=True,
+    visible=True,
+    timeout=40,
+    prepare=wait_advantages,
+    blocks=[
+        {"kind": "custom", "label": "Вводный параграф", "extract": parse_intro,
+         "snapshot": {"intro_paragraph": SELECTORS["intro_paragraph"]}},
+        {"kind": "custom", "label": "Блок преимуществ", "heading": "## Преимущества сотрудничества",
+         "extract": parse_advantages,
+         "snapshot": {
+             "advantages_block": {
+                 "locator": SELECTORS["advantages_block"],
+                 "fields": {"name": (By.CSS_SELECTOR, "div.name"), "desc": (By.CSS_SELECTOR, "div.desc")},
+             },
+         }},
+        {"kind": "custom", "label": "Сотрудничество на выгодных для вас условиях",
+         "extract": lambda page: parse_section(page, "conditions_title", "conditions_content",
+                                               "Сотрудничество на выгодных для вас условиях"),
+         "snapshot": {
+             "conditions_title": SELECTORS["partnership_conditions"]["title"],
+             "conditions_content": {
+                 "locator": SELECTORS["partnership_conditions"]["content"],
+                 "attrs": ["class", "outerHTML"],
+                 "fields": ITEM_FIELDS,
+             },
+             "all_items": (By.CSS_SELECTOR, "div.item"),
+         }},
+        {"kind": "custom", "label": "Станьте нашим партнером за 3 простых шага",
+         "extract": lambda page: parse_section(page, "steps_title", "steps_content",
+                                               "Станьте нашим партнером за 3 простых шага"),
+         "snapshot": {
+             "steps_title": SELECTORS["partnership_steps"]["title"],
+             "steps_content": {
+                 "locator": SELECTORS["partnership_steps"]["content"],
+                 "attrs": ["class"],
+                 "fields": {"link": {"locator": (By.CSS_SELECTOR, "a"), "attrs": ["href"]}},
+             },
+             "all_names_descs": (By.CSS_SELECTOR, "div.name, div.desc"),
+         }},
+    ],
+)
+
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
+
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    TARGET_URL = "https://academydpo.org/sotrudnichestvo"
-    driver = get_driver()
-    try:
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
@@ -1,23 +1,7 @@
 # Импорт необходимых библиотек
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 import re
-from pathlib import Path
-
-# Функция для настройки и получения веб-драйвера Chrome
-def get_driver():
-    # Настройка опций для браузера Chrome
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Запуск браузера в фоновом режиме (без GUI)
-    chrome_options.add_argument("--disable-gpu")  # Отключение GPU для стабильности
-    chrome_options.add_argument("--no-sandbox")  # Отключение песочницы для совместимости
-    chrome_options.add_argument("--window-size=1920,1080")  # Установка размера окна браузера
-    # Инициализация драйвера Chrome
-    driver = webdriver.Chrome(options=chrome_options)
-    return driver
+from dpo_spec import PageSpec
 
 # Словарь с CSS/XPath-селекторами для извлечения данных
 SELECTORS = {
@@ -35,138 +19,56 @@ def normalize_text(text):
     text = re.sub(r'\s*,\s*', ', ', text)
     return text
 
-# Функция для парсинга одной секции
-def parse_section(driver, sub_title_element):
-    content = []
-    try:
-        # Извлечение заголовка секции
-        title = sub_title_element.text.strip()
-        tag = sub_title_element.tag_name  # h2 или h3
-        print(f"Найден подзаголовок ({tag}): {title}")
-
-        # Извлечение контента секции (<p> или <ul>)
-        try:
-            content_elements = sub_title_element.find_elements(*SELECTORS["section_content"])
-            for element in content_elements:
-                if element.tag_name == "p":
-                    element_text = element.get_attribute('innerText')
-                    element_text = normalize_text(element_text)
-                    if element_text:
-                        content.append(element_text)
-                elif element.tag_name == "ul":
-                    list_items = element.find_elements(*SELECTORS["list_items"])
-                    for item in list_items:
-                        item_text = item.get_attribute('innerText')
-                        item_text = normalize_text(item_text)
-                        if item_text:
-                            content.append(f"• {item_text}")  # Убрана табуляция для стандартного Markdown
-            print(f"Найден контент для секции '{title}': {content}")
-        except Exception as e:
-            print(f"Не удалось найти контент для секции '{title}': {str(e)}")
-
-        return {"title": title, "tag": tag, "content": content}
-    except Exception as e:
-        print(f"Общая ошибка в секции: {str(e)}")
-        return None
-
-# Функция для парсинга страницы
-def parse_page(driver, url):
-    # Загрузка страницы по указанному URL
-    driver.get(url)
-    try:
-        # Ожидание загрузки основного заголовка (15 секунд)
-        WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        )
-    except Exception as e:
-        print(f"Ошибка загрузки страницы: {str(e)}")
-        return [], url
-
-    result = []
-
-    # Извлечение основного заголовка
-    try:
-        main_title = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located(SELECTORS["main_title"])
-        ).text.strip()
-        result.append(("title", main_title))
-        print(f"Основной заголовок: {main_title}")
-    except Exception as e:
-        print(f"Ошибка при парсинге основного заголовка: {str(e)}")
+# Функция для разбора вводных параграфов
+def parse_intro(page):
+    return [normalize_text(node["text"]) for node in page["intro_paragraphs"] if node["text"].strip()]
 
-    # Извлечение вводных параграфов
-    try:
-        intro_elements = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["intro_paragraphs"])
-        )
-        intro_text = [normalize_text(elem.text) for elem in intro_elements if elem.text.strip()]
-        if intro_text:
-            result.append(("content", intro_text))
-            print(f"Вводные параграфы: {intro_text}")
-    except Exception as e:
-        print(f"Ошибка при парсинге вводных параграфов: {str(e)}")
-
-    # Парсинг подзаголовков и их контента
-    try:
-        sub_title_elements = WebDriverWait(driver, 15).until(
-            EC.presence_of_all_elements_located(SELECTORS["sub_titles"])
-        )
-        for sub_title_element in sub_title_elements:
-            section = parse_section(driver, sub_title_element)
-            if section:
-                result.append(("section", section))
-    except Exception as e:
-        print(f"Ошибка при парсинге подзаголовков: {str(e)}")
-
-    print(f"Итоговые данные: {result}")
-    return result, url
-
-# Функция для сохранения данных в Markdown-файл
-def save_to_markdown(data, url, filename="DPO_stipendii-i-inye-vidy-materialnoj-podderzhki.md"):
+# Функция для разбора секций: подзаголовок (h2 или h3) и следующий за ним <p> или <ul>
+def parse_sections(page):
     content = []
-    # Обработка элементов для форматирования в Markdown
-    for item in data:
-        if item[0] == "title":
-            # Добавление основного заголовка и ссылки на страницу
-            content.append(f"# {item[1]}")
-            content.append(f"[Перейти к странице]({url})")
-        elif item[0] == "content":
-            # Добавление вводных параграфов
-            content.extend(item[1])
-        elif item[0] == "section":
-            section = item[1]
-            # Форматирование заголовка в зависимости от тега (h2 или h3)
-            if section["tag"] == "h2":
-                content.append(f"## {section['title']}")
-            else:
-                content.append(f"### {section['title']}")
-            content.extend(section["content"])
-
-    # Объединение контента с двумя пустыми строками между элементами
-    final_content = "\n\n".join(line for line in content if line.strip())
-
-    # Сохранение в файл с кодировкой UTF-8
-    with open(filename, 'w', encoding='utf-8') as f:
-        f.write(final_content)
-
-    print(f"Контент записан в файл: {filename}")
-    return filename
+    for sub_title in page["sub_titles"]:
+        title = sub_title["text"].strip()
+        print(f"Найден подзаголовок ({sub_title['tag']}): {title}")
+        # Форматирование заголовка в зависимости от тега (h2 или h3)
+        content.append(f"## {title}" if sub_title["tag"] == "h2" else f"### {title}")
+        for element in sub_title["fields"]["content"]:
+            if element["tag"] == "p":
+                element_text = normalize_text(element["innerText"])
+                if element_text:
+                    content.append(element_text)
+            elif element["tag"] == "ul":
+                for item in element["fields"]["items"]:
+                    item_text = normalize_text(item["innerText"])
+                    if item_text:
+                        content.append(f"• {item_text}")  # Убрана табуляция для стандартного Markdown
+    return content
+
+# Описание страницы: вводные параграфы и секции извлекаются за один проход
+PAGE = PageSpec(
+    url="https://academydpo.org/stipendii-i-inye-vidy-materialnoj-podderzhki",
+    output="DPO_stipendii-i-inye-vidy-materialnoj-podderzhki.md",
+    selectors=SELECTORS,
+    blocks=[
+        {"kind": "custom", "label": "Вводные параграфы", "extract": parse_intro,
+         "snapshot": {"intro_paragraphs": SELECTORS["intro_paragraphs"]}},
+        {"kind": "custom", "label": "Секции", "extract": parse_sections,
+         "snapshot": {
+             "sub_titles": {
+                 "locator": SELECTORS["sub_titles"],
+                 "fields": {"content": {"locator": SELECTORS["section_content"],
+                                        "fields": {"items": SELECTORS["list_items"]}}},
+             },
+         }},
+    ],
+)
+
+# URL страницы для парсинга
+TARGET_URL = PAGE.url
+
+# Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл
+def run(driver, url=TARGET_URL):
+    return PAGE.run(driver, url)
 
 # Основной блок программы
 if __name__ == "__main__":
-    # URL страницы для парсинга
-    TARGET_URL = "https://academydpo.org/stipendii-i-inye-vidy-materialnoj-podderzhki"
-
-    # Инициализация драйвера
-    driver = get_driver()
-    try:
-        # Парсинг страницы и получение данных
-        parsed_data, page_url = parse_page(driver, TARGET_URL)
-        # Сохранение данных в Markdown-файл
-        output_file = save_to_markdown(parsed_data, page_url)
-        print(f"Файл {output_file} успешно сохранен!")
-    except Exception as e:
-        print(f"Ошибка при парсинге: {str(e)}")
-    finally:
-        # Закрытие драйвера для освобождения ресурсов
-        driver.quit()
\ No newline at end of file
+    PAGE.main()
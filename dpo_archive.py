@@ -0,0 +1,222 @@
+# Архив HTML страниц и повторное извлечение данных из него без браузера
+#
+# При каждом запуске wait_ready() сохраняет page_source загруженной страницы в архив
+# DPO_ARCHIVE (по умолчанию ~/.dpo_cache/archive; DPO_ARCHIVE=0 — не сохранять):
+#   blobs/ab/abcd....html.gz — HTML в gzip, имя файла — SHA-256 HTML (одинаковые снимки хранятся один раз)
+#   index.jsonl              — по строке на снимок: {"run", "url", "sha256", "at"}
+# Идентификатор запуска задает main.py через DPO_RUN_ID (иначе — текущая дата).
+#
+# Повторное извлечение выполняет run(driver) скриптов страниц в пуле процессов с
+# ArchiveDriver вместо браузера: driver.get(url) загружает снимок страницы из архива.
+# Так исправленные селекторы и новый формат Markdown применяются к сохраненным запускам:
+#   python dpo_archive.py --run 20250601_213802 --out reextract
+#   python dpo_archive.py --all --workers 8
+import argparse
+import datetime
+import glob
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+
+from dpo_recrawl import target_url
+from dpo_static import StaticDriver
+
+ARCHIVE_ENV = "DPO_ARCHIVE"
+DEFAULT_ARCHIVE = os.path.join(os.path.expanduser("~"), ".dpo_cache", "archive")
+RUN_ID_ENV = "DPO_RUN_ID"
+DEFAULT_REEXTRACT_DIR = "reextract"
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Модули страниц, загруженные в процессе пула повторного извлечения
+_modules = {}
+
+
+def archive_dir():
+    """Каталог архива или None, если сохранение отключено (DPO_ARCHIVE=0)."""
+    value = os.environ.get(ARCHIVE_ENV, DEFAULT_ARCHIVE)
+    return None if value in ("", "0") else value
+
+
+def run_id():
+    return os.environ.get(RUN_ID_ENV) or datetime.datetime.now().strftime("%Y%m%d")
+
+
+def _url_key(url):
+    """Адрес без завершающей косой черты: браузер может дописать ее при перенаправлении."""
+    return (url or "").rstrip("/")
+
+
+def blob_path(root, digest):
+    return os.path.join(root, "blobs", digest[:2], digest + ".html.gz")
+
+
+def archive_page(driver):
+    """Сохраняет page_source текущей страницы драйвера в архив. Ошибки не прерывают разбор."""
+    root = archive_dir()
+    if root is None or getattr(driver, "replaying", False):
+        return None
+    try:
+        source = driver.page_source
+        url = driver.current_url
+        data = source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        path = blob_path(root, digest)
+        if not os.path.isfile(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(gzip.compress(data))
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        entry = {"run": run_id(), "url": url, "sha256": digest, "at": time.time()}
+        # Одна короткая строка в режиме дозаписи: параллельные скрипты не портят индекс
+        with open(os.path.join(root, "index.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return digest
+    except Exception as e:
+        print(f"Не удалось сохранить страницу в архив: {str(e)}")
+        return None
+
+
+def load_index(root):
+    """Снимки архива: {запуск: {адрес без "/" в конце: sha256}}; при повторах берется последний."""
+    runs = {}
+    try:
+        with open(os.path.join(root, "index.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                runs.setdefault(entry["run"], {})[_url_key(entry["url"])] = entry["sha256"]
+    except OSError:
+        pass
+    return runs
+
+
+def read_snapshot(root, digest):
+    with gzip.open(blob_path(root, digest), "rb") as f:
+        return f.read()
+
+
+class ArchiveDriver(StaticDriver):
+    """StaticDriver, который берет страницы из архива вместо сайта."""
+
+    replaying = True
+
+    def __init__(self, root, snapshots):
+        super().__init__()
+        self.root = root
+        self.snapshots = snapshots
+
+    def get(self, url):
+        digest = self.snapshots.get(_url_key(url))
+        if digest is None:
+            raise FileNotFoundError(f"Страницы {url} нет в архиве этого запуска")
+        self.load_html(read_snapshot(self.root, digest), url)
+
+
+def _init_worker(script_paths):
+    if SCRIPTS_DIR not in sys.path:
+        sys.path.insert(0, SCRIPTS_DIR)
+    from dpo_runner import load_page_module
+    for script_path in script_paths:
+        try:
+            _modules[script_path] = load_page_module(script_path)
+        except Exception as e:
+            print(f"Не удалось импортировать {script_path}: {str(e)}")
+
+
+def _reextract_page(root, run, snapshots, script_path, out_dir):
+    """Выполняется в процессе пула: run(driver) одной страницы по снимку из архива."""
+    module = _modules.get(script_path)
+    if module is None or not hasattr(module, "run"):
+        return run, script_path, False, "модуль не загружен или не содержит run()"
+    os.makedirs(out_dir, exist_ok=True)
+    # Скрипты пишут Markdown в текущий каталог
+    os.chdir(out_dir)
+    driver = ArchiveDriver(root, snapshots)
+    output = StringIO()
+    try:
+        with redirect_stdout(output):
+            result = module.run(driver)
+        return run, script_path, True, str(result) if result else ""
+    except Exception:
+        return run, script_path, False, output.getvalue()[-2000:] + traceback.format_exc()
+    finally:
+        driver.quit()
+
+
+def reextract(runs=None, out_dir=DEFAULT_REEXTRACT_DIR, workers=None, scripts=None, root=None):
+    """Повторно разбирает сохраненные запуски runs (по умолчанию последний) в out_dir/<запуск>/.
+
+    Возвращает число успешно разобранных страниц.
+    """
+    root = root or archive_dir() or DEFAULT_ARCHIVE
+    index = load_index(root)
+    if not index:
+        print(f"Архив {root} пуст")
+        return 0
+    runs = runs or [max(index)]
+    script_paths = scripts or sorted(glob.glob(os.path.join(SCRIPTS_DIR, "DPO_*.py")))
+    script_paths = [os.path.abspath(p) for p in script_paths]
+    urls = {p: _url_key(target_url(p)) for p in script_paths}
+
+    tasks = []
+    for run in runs:
+        snapshots = index.get(run)
+        if snapshots is None:
+            print(f"Запуска {run} нет в архиве")
+            continue
+        for script_path in script_paths:
+            if urls[script_path] in snapshots:
+                tasks.append((root, run, snapshots, script_path, os.path.abspath(os.path.join(out_dir, run))))
+    print(f"Страниц для повторного извлечения: {len(tasks)} (запусков: {len(runs)})")
+    if not tasks:
+        return 0
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+                             initializer=_init_worker, initargs=(script_paths,)) as executor:
+        for run, script_path, ok, message in executor.map(_reextract_page, *zip(*tasks)):
+            name = os.path.basename(script_path)
+            if ok:
+                done += 1
+                print(f"[{run}] {name}: {message}")
+            else:
+                print(f"[{run}] {name}: ошибка\n{message}")
+    print(f"Повторно извлечено страниц: {done} из {len(tasks)}")
+    return done
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Повторное извлечение данных страниц из архива HTML без браузера")
+    parser.add_argument("--run", action="append", help="идентификатор запуска (можно несколько; по умолчанию последний)")
+    parser.add_argument("--all", action="store_true", help="все запуски архива")
+    parser.add_argument("--out", default=DEFAULT_REEXTRACT_DIR, help="каталог для Markdown-файлов")
+    parser.add_argument("--workers", type=int, default=None, help="процессов (по умолчанию число ядер)")
+    parser.add_argument("--list", action="store_true", help="вывести запуски архива и выйти")
+    args = parser.parse_args()
+    root = archive_dir() or DEFAULT_ARCHIVE
+    if args.list:
+        for run, snapshots in sorted(load_index(root).items()):
+            print(f"{run}: {len(snapshots)} страниц")
+        return
+    runs = sorted(load_index(root)) if args.all else args.run
+    reextract(runs, args.out, args.workers, root=root)
+
+
+if __name__ == "__main__":
+    main()
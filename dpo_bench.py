@@ -0,0 +1,267 @@
+# Замер скорости скриптов страниц и main.py на записанной копии сайта (без обращения к academydpo.org)
+#
+# Копия сайта записывается заранее: python dpo_replay.py --record --dir fixtures.
+# Замер запускает сервер dpo_replay.py на этой копии, направляет на него скрипты через
+# DPO_BASE_URL и выполняет каждый скрипт DPO_*.py отдельным процессом (--repeat раз),
+# затем при --main — main.py с аргументами --main-args. Для каждого запуска записываются:
+#   wall_s        — время выполнения (медиана по повторам)
+#   peak_rss_mb   — пиковая память процесса вместе с дочерними (Chrome, chromedriver)
+#                   по psutil; без psutil — пик одного процесса по os.wait4 (rss_source)
+#   commands      — число команд WebDriver по типам (журнал DPO_COMMAND_LOG, см. DpoChrome)
+# Результаты сохраняются в bench/bench_<время>.json и сравниваются с базовыми
+# (bench/baseline.json или --baseline); --save-baseline делает текущий замер базовым.
+# main.py запускается с DPO_BASE_DIR во временном каталоге замера: Markdown-файлы, отчет,
+# манифест и журнал не попадают в рабочий каталог, а скрипты выполняются текущим Python.
+#
+#   python dpo_bench.py --fixtures fixtures --repeat 3 --save-baseline
+#   python dpo_bench.py --fixtures fixtures --main --main-args "--mode inprocess -j 4"
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import shlex
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from dpo_archive import ARCHIVE_ENV
+from dpo_cache import DOC_CACHE_ENV
+from dpo_driver import BASE_DIR_ENV, BASE_URL_ENV, COMMAND_LOG_ENV, PYTHON_ENV, WAIT_STATS_ENV
+from dpo_json import load_json, save_json
+from dpo_recrawl import RECRAWL_STATE_ENV
+from dpo_replay import serve
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BENCH_DIR = os.path.join(SCRIPTS_DIR, "bench")
+BASELINE_FILE = os.path.join(BENCH_DIR, "baseline.json")
+BENCH_TIMEOUT = 300
+# Интервал опроса памяти процесса (секунд)
+RSS_POLL = 0.05
+
+
+def _tree_rss(process):
+    """Суммарная память процесса и всех его потомков (байт) по psutil."""
+    try:
+        processes = [process] + process.children(recursive=True)
+    except psutil.Error:
+        return 0
+    total = 0
+    for p in processes:
+        try:
+            total += p.memory_info().rss
+        except psutil.Error:
+            pass
+    return total
+
+
+def run_measured(command, env, cwd, timeout=BENCH_TIMEOUT):
+    """Запускает command и возвращает {"ok", "wall_s", "peak_rss_mb", "error"}."""
+    started = time.perf_counter()
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(command, env=env, cwd=cwd, stdout=subprocess.DEVNULL, stderr=stderr)
+        peak = 0
+        timed_out = False
+        if psutil is not None:
+            process = psutil.Process(proc.pid)
+            while proc.poll() is None:
+                peak = max(peak, _tree_rss(process))
+                if time.perf_counter() - started > timeout:
+                    timed_out = True
+                    break
+                time.sleep(RSS_POLL)
+        elif hasattr(os, "wait4"):
+            # wait4 сообщает пиковую память завершившегося процесса
+            while True:
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    proc.returncode = os.waitstatus_to_exitcode(status)
+                    # ru_maxrss — в килобайтах на Linux и в байтах на macOS
+                    peak = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+                    break
+                if time.perf_counter() - started > timeout:
+                    timed_out = True
+                    break
+                time.sleep(RSS_POLL)
+        else:
+            try:
+                proc.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                timed_out = True
+        if timed_out:
+            proc.kill()
+            proc.wait()
+        wall = time.perf_counter() - started
+        stderr.seek(0)
+        error = stderr.read().decode("utf-8", errors="replace")[-2000:]
+    ok = not timed_out and proc.returncode == 0
+    return {
+        "ok": ok,
+        "wall_s": round(wall, 3),
+        "peak_rss_mb": round(peak / (1024 * 1024), 1) if peak else None,
+        "error": "" if ok else (f"превышено время {timeout} с\n" if timed_out else "") + error,
+    }
+
+
+def read_commands(log_file):
+    """Сумма счетчиков команд WebDriver всех драйверов из журнала DPO_COMMAND_LOG."""
+    counts = {}
+    try:
+        with open(log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                for command, count in entry["counts"].items():
+                    counts[command] = counts.get(command, 0) + count
+    except OSError:
+        pass
+    return counts
+
+
+def bench_command(name, command, base_env, work_dir, repeat=1, timeout=BENCH_TIMEOUT):
+    """Замер одной команды repeat раз; каждый запуск — с чистыми кэшами документов и страниц."""
+    runs = []
+    for i in range(repeat):
+        run_dir = tempfile.mkdtemp(prefix="dpo_bench_", dir=work_dir)
+        log_file = os.path.join(run_dir, "commands.jsonl")
+        env = {
+            **base_env,
+            COMMAND_LOG_ENV: log_file,
+            # Результаты main.py — в каталоге этого запуска
+            BASE_DIR_ENV: run_dir,
+            DOC_CACHE_ENV: os.path.join(run_dir, "documents"),
+            RECRAWL_STATE_ENV: os.path.join(run_dir, "recrawl.json"),
+            WAIT_STATS_ENV: os.path.join(run_dir, "wait_stats.jsonl"),
+        }
+        result = run_measured(command, env, run_dir, timeout)
+        result["commands"] = read_commands(log_file)
+        runs.append(result)
+    walls = [r["wall_s"] for r in runs]
+    rss = [r["peak_rss_mb"] for r in runs if r["peak_rss_mb"] is not None]
+    commands = runs[-1]["commands"]
+    summary = {
+        "ok": all(r["ok"] for r in runs),
+        "wall_s": round(statistics.median(walls), 3),
+        "wall_runs": walls,
+        "peak_rss_mb": max(rss) if rss else None,
+        "commands": commands,
+        "commands_total": sum(commands.values()),
+    }
+    errors = [r["error"] for r in runs if r["error"]]
+    if errors:
+        summary["error"] = errors[-1]
+    status = "ok" if summary["ok"] else "ошибка"
+    print(f"{name}: {summary['wall_s']:.2f} с, {summary['peak_rss_mb']} МБ, "
+          f"команд WebDriver: {summary['commands_total']} ({status})")
+    return summary
+
+
+def run_bench(fixtures, scripts=None, repeat=1, include_main=False, main_args="", python=None):
+    """Замеряет скрипты страниц (и main.py) на сервере с копией сайта; возвращает результаты."""
+    python = python or sys.executable
+    server = serve(fixtures)
+    base_url = f"http://{server.server_address[0]}:{server.server_address[1]}"
+    base_env = {
+        **os.environ,
+        BASE_URL_ENV: base_url,
+        # Замеры не пополняют архив страниц
+        ARCHIVE_ENV: "0",
+        PYTHON_ENV: python,
+    }
+    script_paths = scripts or sorted(glob.glob(os.path.join(SCRIPTS_DIR, "DPO_*.py")))
+    work_dir = tempfile.mkdtemp(prefix="dpo_bench_")
+    results = {
+        "created_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "rss_source": "psutil" if psutil is not None else ("wait4" if hasattr(os, "wait4") else None),
+        "pages": {},
+    }
+    try:
+        for script_path in script_paths:
+            name = os.path.basename(script_path)
+            results["pages"][name] = bench_command(name, [python, os.path.abspath(script_path)],
+                                                   base_env, work_dir, repeat)
+        if include_main:
+            command = [python, os.path.join(SCRIPTS_DIR, "main.py"), "--full"] + shlex.split(main_args)
+            results["main"] = bench_command("main.py", command, base_env, work_dir, repeat)
+            results["main"]["args"] = main_args
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(work_dir, ignore_errors=True)
+    results["total_wall_s"] = round(sum(page["wall_s"] for page in results["pages"].values()), 3)
+    return results
+
+
+def _change(old, new):
+    if old is None or new is None:
+        return f"{old} → {new}"
+    if not old:
+        return f"{old} → {new}"
+    return f"{old} → {new} ({(new - old) / old * 100:+.0f}%)"
+
+
+def compare(baseline, results):
+    """Выводит изменения времени, памяти и числа команд относительно базового замера."""
+    print(f"\nСравнение с базовым замером от {baseline.get('created_at')}:")
+    entries = dict(results["pages"])
+    old_entries = dict(baseline.get("pages", {}))
+    if "main" in results and "main" in baseline:
+        entries["main.py"] = results["main"]
+        old_entries["main.py"] = baseline["main"]
+    for name, entry in entries.items():
+        old = old_entries.get(name)
+        if old is None:
+            print(f"  {name}: нет в базовом замере")
+            continue
+        print(f"  {name}: время {_change(old['wall_s'], entry['wall_s'])} с, "
+              f"память {_change(old.get('peak_rss_mb'), entry.get('peak_rss_mb'))} МБ, "
+              f"команд {_change(old.get('commands_total'), entry.get('commands_total'))}")
+    if "total_wall_s" in baseline:
+        print(f"  Всего по страницам: {_change(baseline['total_wall_s'], results['total_wall_s'])} с")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер скорости скриптов страниц на записанной копии сайта")
+    parser.add_argument("--fixtures", default="fixtures", help="каталог, записанный dpo_replay.py --record")
+    parser.add_argument("--script", action="append", help="замерить только этот скрипт (можно несколько)")
+    parser.add_argument("--repeat", type=int, default=1, help="запусков каждого скрипта (берется медиана)")
+    parser.add_argument("--main", action="store_true", help="замерить также main.py")
+    parser.add_argument("--main-args", default="", help="аргументы main.py, например \"--mode inprocess -j 4\"")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="файл базового замера: для сравнения и для --save-baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="сохранить замер как базовый")
+    args = parser.parse_args()
+
+    if not os.path.isfile(os.path.join(args.fixtures, "record.json")):
+        print(f"Копия сайта не найдена в {args.fixtures}, запишите ее: python dpo_replay.py --record --dir {args.fixtures}")
+        sys.exit(1)
+    scripts = [os.path.join(SCRIPTS_DIR, s) for s in args.script] if args.script else None
+    results = run_bench(args.fixtures, scripts, max(1, args.repeat), args.main, args.main_args)
+
+    output = os.path.join(BENCH_DIR, f"bench_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    save_json(output, results)
+    print(f"Результаты сохранены: {output}")
+    baseline = load_json(args.baseline)
+    if baseline and os.path.abspath(args.baseline) != os.path.abspath(output):
+        compare(baseline, results)
+    if args.save_baseline:
+        save_json(args.baseline, results)
+        print(f"Базовый замер обновлен: {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+# Кэш скачанных документов с адресацией по содержимому и кэш извлеченного из них текста
+#
+# Структура каталога DPO_DOC_CACHE (по умолчанию ~/.dpo_cache/documents):
+#   index.json          — {"urls": {url: {"sha256", "etag", "last_modified", "content_type", "fingerprint"}},
+#                          "blobs": {sha256: {"size", "used_at"}}}
+#   blobs/ab/abcd...    — содержимое документа, имя файла — его SHA-256
+#   text/abcd....json   — извлеченный текст документа по страницам (см. dpo_pdf.extract_text)
+#
+# Повторная загрузка выполняется условным запросом (If-None-Match / If-Modified-Since):
+# неизмененный документ стоит ответа 304 и поиска в словаре. Одинаковые документы
+# по разным адресам хранятся один раз. При превышении DPO_DOC_CACHE_SIZE мегабайт
+# удаляются давно не использованные документы вместе с их текстом.
+#
+# Для больших документов (от PROBE_MIN_SIZE байт) fetch(url, probe=True) сначала
+# сравнивает отпечаток — длину, ETag, Last-Modified и SHA-256 последних PROBE_TAIL байт
+# (там у PDF находятся xref, trailer и /ID) — по одному запросу Range: bytes=-PROBE_TAIL
+# (или HEAD, если сервер не поддерживает Range). Документ скачивается целиком,
+# только если отпечаток не совпал.
+import hashlib
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+from dpo_driver import OFFLINE_ENV, rebase_url
+from dpo_json import load_json, save_json
+
+DOC_CACHE_ENV = "DPO_DOC_CACHE"
+DOC_CACHE_SIZE_ENV = "DPO_DOC_CACHE_SIZE"
+DEFAULT_DOC_CACHE = os.path.join(os.path.expanduser("~"), ".dpo_cache", "documents")
+DEFAULT_DOC_CACHE_SIZE = 500  # мегабайт
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+CHUNK_SIZE = 64 * 1024
+# Проверка изменений через Range применяется к документам не меньше этого размера
+PROBE_MIN_SIZE = 1024 * 1024
+PROBE_TAIL = 1024
+
+
+def _content_length(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def fingerprint_matches(stored, probed):
+    """Совпадает ли отпечаток документа; без ETag, Last-Modified и хвоста одной длины недостаточно."""
+    if not stored or not probed or stored.get("length") is None or stored.get("length") != probed.get("length"):
+        return False
+    compared = False
+    for key in ("etag", "last_modified", "tail_sha256"):
+        if stored.get(key) and probed.get(key):
+            if stored[key] != probed[key]:
+                return False
+            compared = True
+    return compared
+
+
+class DocumentCache:
+    """Кэш документов на диске: условная загрузка, хранение по SHA-256, вытеснение по размеру.
+
+    Индекс перечитывается при каждой операции, поэтому кэш можно использовать
+    из нескольких процессов; при гонке теряется только запись индекса,
+    и документ будет скачан повторно. Потоки одного процесса обновляют
+    индекс по очереди.
+    """
+
+    def __init__(self, root=None, max_bytes=None, session=None, timeout=60):
+        self.root = root or os.environ.get(DOC_CACHE_ENV, DEFAULT_DOC_CACHE)
+        if max_bytes is None:
+            max_bytes = float(os.environ.get(DOC_CACHE_SIZE_ENV, DEFAULT_DOC_CACHE_SIZE)) * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        self.session.headers.setdefault("User-Agent", USER_AGENT)
+        self.index_path = os.path.join(self.root, "index.json")
+        self.lock = threading.Lock()
+
+    def _index(self):
+        index = load_json(self.index_path)
+        index.setdefault("urls", {})
+        index.setdefault("blobs", {})
+        return index
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def text_path(self, digest):
+        return os.path.join(self.root, "text", digest + ".json")
+
+    def fetch(self, url, headers=None, probe=False):
+        """Возвращает SHA-256 документа по url, скачивая его только при изменении.
+
+        probe=True — для больших документов сначала сравнить отпечаток (см. probe()).
+        """
+        index = self._index()
+        entry = index["urls"].get(url)
+        if entry and not os.path.isfile(self.blob_path(entry["sha256"])):
+            entry = None
+        # В офлайн-режиме (DPO_OFFLINE=1, как и для chromedriver) документ берется из кэша без запроса
+        offline = os.environ.get(OFFLINE_ENV, "") not in ("", "0")
+        if entry and offline:
+            return self._touch(entry["sha256"])
+
+        changed = False
+        if entry and probe and index["blobs"].get(entry["sha256"], {}).get("size", 0) >= PROBE_MIN_SIZE:
+            try:
+                if fingerprint_matches(entry.get("fingerprint"), self.probe(url, headers)):
+                    print(f"Документ не изменился (проверка отпечатка): {url}")
+                    return self._touch(entry["sha256"])
+                # Отпечаток не совпал: условный запрос не нужен, документ скачивается целиком
+                changed = True
+            except requests.RequestException as e:
+                print(f"Не удалось проверить отпечаток {url}: {str(e)}")
+
+        request_headers = dict(headers or {})
+        if entry and not changed:
+            if entry.get("etag"):
+                request_headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                request_headers["If-Modified-Since"] = entry["last_modified"]
+
+        with self.session.get(rebase_url(url), headers=request_headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 304 and entry:
+                print(f"Документ не изменился: {url}")
+                return self._touch(entry["sha256"])
+            response.raise_for_status()
+            digest, size = self._store(response)
+            validators = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_type": response.headers.get("Content-Type"),
+            }
+        fingerprint = {
+            "length": size,
+            "etag": validators["etag"],
+            "last_modified": validators["last_modified"],
+            "tail_sha256": self._tail_sha256(digest),
+        }
+
+        with self.lock:
+            # Индекс перечитывается: за время загрузки его мог обновить другой процесс
+            index = self._index()
+            index["urls"][url] = {"sha256": digest, **validators, "fingerprint": fingerprint}
+            index["blobs"][digest] = {"size": size, "used_at": time.time()}
+            self._evict(index, keep=digest)
+            save_json(self.index_path, index)
+        return digest
+
+    def probe(self, url, headers=None):
+        """Отпечаток документа без загрузки тела: {"length", "etag", "last_modified", "tail_sha256"}.
+
+        Один запрос Range на последние PROBE_TAIL байт; если сервер ответил не 206,
+        тело не читается, а длина и валидаторы берутся из HEAD.
+        """
+        request_headers = {**(headers or {}), "Range": f"bytes=-{PROBE_TAIL}"}
+        with self.session.get(rebase_url(url), headers=request_headers, stream=True, timeout=self.timeout) as response:
+            if response.status_code == 206:
+                total = response.headers.get("Content-Range", "").rpartition("/")[2]
+                tail = response.raw.read(PROBE_TAIL + 1, decode_content=True)
+                return {
+                    "length": _content_length(total),
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "tail_sha256": hashlib.sha256(tail).hexdigest() if len(tail) <= PROBE_TAIL else None,
+                }
+        response = self.session.head(rebase_url(url), headers=headers, allow_redirects=True, timeout=self.timeout)
+        response.raise_for_status()
+        return {
+            "length": _content_length(response.headers.get("Content-Length")),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "tail_sha256": None,
+        }
+
+    def _tail_sha256(self, digest):
+        with open(self.blob_path(digest), "rb") as f:
+            f.seek(0, os.SEEK_END)
+            f.seek(max(0, f.tell() - PROBE_TAIL))
+            return hashlib.sha256(f.read()).hexdigest()
+
+    def entry(self, url):
+        """Запись индекса для url (sha256, валидаторы, content_type) или None."""
+        return self._index()["urls"].get(url)
+
+    def _store(self, response):
+        """Пишет тело ответа во временный файл, считая SHA-256, и переносит его в blobs/."""
+        os.makedirs(self.root, exist_ok=True)
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    sha.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+            digest = sha.hexdigest()
+            path = self.blob_path(digest)
+            if os.path.isfile(path):
+                # Такой документ уже есть (другой адрес или повторная выдача без валидаторов)
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return digest, size
+
+    def _touch(self, digest):
+        with self.lock:
+            index = self._index()
+            blob = index["blobs"].setdefault(digest, {"size": os.path.getsize(self.blob_path(digest))})
+            blob["used_at"] = time.time()
+            self._evict(index, keep=digest)
+            try:
+                save_json(self.index_path, index)
+            except OSError as e:
+                print(f"Не удалось обновить индекс кэша документов: {str(e)}")
+        return digest
+
+    def _evict(self, index, keep=None):
+        """Удаляет давно не использованные документы, пока кэш больше max_bytes."""
+        total = sum(blob["size"] for blob in index["blobs"].values())
+        for digest, blob in sorted(index["blobs"].items(), key=lambda item: item[1].get("used_at", 0)):
+            if total <= self.max_bytes:
+                break
+            if digest == keep:
+                continue
+            for path in (self.blob_path(digest), self.text_path(digest)):
+                if os.path.exists(path):
+                    os.remove(path)
+            del index["blobs"][digest]
+            index["urls"] = {url: e for url, e in index["urls"].items() if e["sha256"] != digest}
+            total -= blob["size"]
+            print(f"Из кэша документов удален {digest[:12]} ({blob['size']} байт)")
+
+    def open(self, digest):
+        """Открывает сохраненный документ для чтения в двоичном режиме."""
+        return open(self.blob_path(digest), "rb")
+
+    def load_text(self, digest):
+        """Сохраненный текст документа по страницам (пустой словарь, если его нет)."""
+        return load_json(self.text_path(digest))
+
+    def save_text(self, digest, memo):
+        try:
+            save_json(self.text_path(digest), memo)
+        except OSError as e:
+            print(f"Не удалось сохранить текст документа в кэш: {str(e)}")
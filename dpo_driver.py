@@ -0,0 +1,580 @@
+# Общие функции для работы с браузером Chrome, используемые скриптами DPO_*.py и main.py
+import json
+import os
+import re
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+from dpo_json import load_json, save_json
+
+# Переменная окружения с адресом общего браузера (host:port), задается main.py
+SHARED_CHROME_ENV = "DPO_CHROME_DEBUGGER"
+# Переменная окружения с путем к исполняемому файлу Chrome (если он не в PATH)
+CHROME_BINARY_ENV = "DPO_CHROME_BINARY"
+# Кэш найденных путей к chromedriver: файл, время жизни записи (часы) и офлайн-режим
+DRIVER_CACHE_ENV = "DPO_DRIVER_CACHE"
+DRIVER_CACHE_TTL_ENV = "DPO_DRIVER_CACHE_TTL"
+OFFLINE_ENV = "DPO_OFFLINE"
+# Журнал ожиданий готовности страниц (JSON Lines) для подбора таймаутов
+WAIT_STATS_ENV = "DPO_WAIT_STATS"
+DEFAULT_WAIT_STATS = os.path.join(os.path.expanduser("~"), ".dpo_cache", "wait_stats.jsonl")
+# Подбор таймаута по истории: запас к самому долгому из последних ожиданий, если все они успешны
+READY_HISTORY = 20
+READY_MIN_SAMPLES = 3
+READY_FACTOR = 3
+READY_MIN_TIMEOUT = 5
+# Журнал длиннее этого числа строк при чтении сокращается до последних READY_HISTORY записей страниц
+READY_STATS_MAX_LINES = 5000
+# Журнал ожиданий, прочитанный в этом процессе: {файл: {(url, локатор): [записи]}}
+_wait_stats = {}
+_wait_stats_lock = threading.RLock()
+# Блокировка ресурсов, не нужных для чтения текста (DPO_BLOCK_RESOURCES=0 — отключить),
+# и файл с объемом страниц без блокировки для отчета о сэкономленных байтах
+BLOCK_RESOURCES_ENV = "DPO_BLOCK_RESOURCES"
+RESOURCE_BASELINE_ENV = "DPO_RESOURCE_BASELINE"
+DEFAULT_RESOURCE_BASELINE = os.path.join(os.path.expanduser("~"), ".dpo_cache", "resource_baseline.json")
+# Стили по умолчанию не блокируются: без CSS меняются видимость элементов и innerText
+DEFAULT_RESOURCE_POLICY = "layout"
+# Адрес, которым подменяется сайт (например, сервер dpo_replay.py при замерах), и журнал
+# количества команд WebDriver (JSON Lines, по строке на драйвер) для dpo_bench.py
+BASE_URL_ENV = "DPO_BASE_URL"
+COMMAND_LOG_ENV = "DPO_COMMAND_LOG"
+# Каталог результатов main.py (Markdown-файлы, отчет, журнал) и Python для запуска скриптов
+# вместо заданных в main.py — чтобы dpo_bench.py запускал main.py в отдельном каталоге
+BASE_DIR_ENV = "DPO_BASE_DIR"
+PYTHON_ENV = "DPO_PYTHON"
+SITE_PATTERN = re.compile(r"^https?://(?:www\.)?academydpo\.org(?=[/?#]|$)")
+
+IMAGE_PATTERNS = ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*", "*.avif*"]
+MEDIA_PATTERNS = ["*.mp4*", "*.webm*", "*.mp3*", "*youtube.com/embed*", "*rutube.ru/play/embed*"]
+FONT_PATTERNS = ["*.woff*", "*.ttf*", "*.otf*", "*.eot*", "*fonts.googleapis.com*", "*fonts.gstatic.com*"]
+STYLE_PATTERNS = ["*.css*"]
+TRACKER_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*mc.yandex.ru*",
+    "*yandex.ru/metrika*",
+    "*top-fwz1.mail.ru*",
+    "*vk.com/rtrg*",
+    "*connect.facebook.net*",
+    "*jivosite.com*",
+    "*code.jivo.ru*",
+    "*api-maps.yandex.ru*",
+]
+# Политики: "layout" — без изображений, шрифтов, медиа и счетчиков (по умолчанию),
+# "text" — еще и без стилей (только для страниц, текст которых от стилей не зависит),
+# "off" — без блокировки
+RESOURCE_POLICIES = {
+    "text": IMAGE_PATTERNS + MEDIA_PATTERNS + FONT_PATTERNS + STYLE_PATTERNS + TRACKER_PATTERNS,
+    "layout": IMAGE_PATTERNS + MEDIA_PATTERNS + FONT_PATTERNS + TRACKER_PATTERNS,
+    "off": [],
+}
+
+# Объем загруженного страницей по Resource Timing API (для сторонних ресурсов
+# без Timing-Allow-Origin браузер сообщает 0)
+RESOURCE_USAGE_JS = """
+const nav = performance.getEntriesByType('navigation')[0];
+let bytes = nav ? nav.transferSize : 0;
+const resources = performance.getEntriesByType('resource');
+for (const entry of resources) { bytes += entry.transferSize || 0; }
+return {bytes: bytes, requests: resources.length + 1};
+"""
+DEFAULT_DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".dpo_cache", "chromedriver.json")
+DEFAULT_DRIVER_CACHE_TTL = 24
+
+CHROME_CANDIDATES = [
+    "chrome",
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+]
+
+
+def rebase_url(url):
+    """Адрес страницы сайта на сервере DPO_BASE_URL (если задан); другие адреса не меняются."""
+    base = os.environ.get(BASE_URL_ENV)
+    if not base or not url:
+        return url
+    return SITE_PATTERN.sub(base.rstrip("/"), url)
+
+
+class DpoChrome(webdriver.Chrome):
+    """Chrome, который открывает страницы сайта по DPO_BASE_URL и считает команды WebDriver.
+
+    Счетчики команд записываются в журнал DPO_COMMAND_LOG при quit().
+    """
+
+    def __init__(self, *args, **kwargs):
+        # Счетчик нужен до super().__init__(): создание сессии — тоже команда
+        self.command_counts = {}
+        super().__init__(*args, **kwargs)
+
+    def execute(self, driver_command, params=None):
+        self.command_counts[driver_command] = self.command_counts.get(driver_command, 0) + 1
+        return super().execute(driver_command, params)
+
+    def get(self, url):
+        super().get(rebase_url(url))
+
+    def quit(self):
+        try:
+            super().quit()
+        finally:
+            log_commands(self.command_counts)
+
+
+def log_commands(counts):
+    """Дописывает счетчики команд одного драйвера в журнал DPO_COMMAND_LOG (если он задан)."""
+    log_file = os.environ.get(COMMAND_LOG_ENV)
+    if not log_file:
+        return
+    entry = {"pid": os.getpid(), "counts": counts, "at": time.time()}
+    try:
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Не удалось записать журнал команд WebDriver: {str(e)}")
+
+
+class SharedTabChrome(DpoChrome):
+    """Драйвер, подключенный к общему браузеру и работающий в собственной вкладке.
+
+    При quit() закрывается только своя вкладка, сам браузер продолжает работать.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.switch_to.new_window("tab")
+        self.own_tab = self.current_window_handle
+
+    def quit(self):
+        try:
+            if self.own_tab in self.window_handles:
+                self.switch_to.window(self.own_tab)
+                self.close()
+        except Exception as e:
+            print(f"Не удалось закрыть вкладку общего браузера: {str(e)}")
+        finally:
+            super().quit()
+
+
+def headless_options():
+    """Опции Chrome, общие для всех скриптов страниц."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--window-size=1920,1080")
+    return chrome_options
+
+
+def apply_resource_policy(driver, policy=DEFAULT_RESOURCE_POLICY):
+    """Включает блокировку ресурсов policy во вкладке драйвера через DevTools.
+
+    Политику можно менять между страницами (так делает PageRunner).
+    """
+    if os.environ.get(BLOCK_RESOURCES_ENV, "1") in ("", "0"):
+        policy = "off"
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": RESOURCE_POLICIES[policy]})
+        driver.resource_policy = policy
+    except Exception as e:
+        print(f"Не удалось применить политику загрузки ресурсов {policy}: {str(e)}")
+
+
+def report_resource_usage(driver):
+    """Выводит объем загруженной страницы и экономию относительно загрузки без блокировки.
+
+    Загрузка с политикой "off" сохраняется как базовое значение для этого url.
+    """
+    policy = getattr(driver, "resource_policy", None)
+    if policy is None:
+        return None
+    try:
+        usage = driver.execute_script(RESOURCE_USAGE_JS)
+        url = driver.current_url
+    except Exception as e:
+        print(f"Не удалось получить объем загруженных ресурсов: {str(e)}")
+        return None
+    baseline_file = os.environ.get(RESOURCE_BASELINE_ENV, DEFAULT_RESOURCE_BASELINE)
+    baselines = load_json(baseline_file)
+    loaded = f"{usage['bytes'] / 1024:.0f} КБ, запросов: {usage['requests']}"
+    if policy == "off":
+        baselines[url] = usage["bytes"]
+        try:
+            save_json(baseline_file, baselines)
+        except OSError as e:
+            print(f"Не удалось сохранить базовый объем страницы: {str(e)}")
+        print(f"Ресурсы страницы: {loaded} (без блокировки, сохранено как базовое значение)")
+    elif url in baselines:
+        saved = baselines[url] - usage["bytes"]
+        print(f"Ресурсы страницы: {loaded}, сэкономлено {saved / 1024:.0f} КБ (политика {policy})")
+    else:
+        print(f"Ресурсы страницы: {loaded} (политика {policy}, базового значения нет — запустите с {BLOCK_RESOURCES_ENV}=0)")
+    usage["policy"] = policy
+    return usage
+
+
+# Создание драйвера Chrome с chromedriver из локального кэша
+def create_driver(chrome_options, resource_policy=DEFAULT_RESOURCE_POLICY):
+    driver = DpoChrome(service=Service(chromedriver_path()), options=chrome_options)
+    apply_resource_policy(driver, resource_policy)
+    return driver
+
+
+# Подключение к общему браузеру, если main.py передал его адрес
+def attach_driver(resource_policy=DEFAULT_RESOURCE_POLICY):
+    address = os.environ.get(SHARED_CHROME_ENV)
+    if not address:
+        return None
+    chrome_options = Options()
+    chrome_options.debugger_address = address
+    try:
+        driver = SharedTabChrome(service=Service(chromedriver_path()), options=chrome_options)
+        print(f"Подключение к общему браузеру: {address}")
+        # Блокировка действует только в собственной вкладке
+        apply_resource_policy(driver, resource_policy)
+        return driver
+    except Exception as e:
+        print(f"Не удалось подключиться к общему браузеру {address}: {str(e)}")
+        return None
+
+
+def get_driver(resource_policy=DEFAULT_RESOURCE_POLICY, chrome_options=None):
+    """Драйвер для скрипта страницы: общий браузер main.py (--shared-chrome) или свой headless Chrome.
+
+    chrome_options — опции вместо headless_options(), если странице нужны свои.
+    """
+    return attach_driver(resource_policy) or create_driver(chrome_options or headless_options(), resource_policy)
+
+
+def find_chrome_binary():
+    """Возвращает путь к исполняемому файлу Chrome или None."""
+    candidates = [os.environ.get(CHROME_BINARY_ENV)] + CHROME_CANDIDATES
+    for candidate in candidates:
+        if not candidate:
+            continue
+        path = shutil.which(candidate) or (candidate if os.path.isfile(candidate) else None)
+        if path:
+            return path
+    return None
+
+
+def installed_chrome_version():
+    """Возвращает версию установленного Chrome (например, "125.0.6422.142") или None."""
+    if os.name == "nt":
+        try:
+            import winreg
+            with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            pass
+    binary = find_chrome_binary()
+    if not binary:
+        return None
+    try:
+        output = subprocess.run([binary, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    match = re.search(r"\d+(\.\d+)+", output)
+    return match.group(0) if match else None
+
+
+def chromedriver_path():
+    """Возвращает путь к chromedriver для установленной версии Chrome.
+
+    Результат ChromeDriverManager().install() кэшируется по версии Chrome на
+    DPO_DRIVER_CACHE_TTL часов. В офлайн-режиме (DPO_OFFLINE=1) используется
+    любой ранее найденный путь без обращения к сети. None означает, что
+    chromedriver будет найден самим Selenium (PATH или Selenium Manager).
+    """
+    cache_file = os.environ.get(DRIVER_CACHE_ENV, DEFAULT_DRIVER_CACHE)
+    ttl = float(os.environ.get(DRIVER_CACHE_TTL_ENV, DEFAULT_DRIVER_CACHE_TTL)) * 3600
+    offline = os.environ.get(OFFLINE_ENV, "") not in ("", "0")
+    version = installed_chrome_version() or "unknown"
+    cache = load_json(cache_file)
+
+    entry = cache.get(version)
+    if entry and os.path.isfile(entry["path"]):
+        if offline or time.time() - entry["resolved_at"] < ttl:
+            return entry["path"]
+    if offline:
+        # Версия Chrome изменилась, но сеть недоступна: берем самый свежий из сохраненных
+        entries = [e for e in cache.values() if os.path.isfile(e["path"])]
+        if entries:
+            return max(entries, key=lambda e: e["resolved_at"])["path"]
+        print("chromedriver не найден в кэше, офлайн-режим")
+        return None
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        path = ChromeDriverManager().install()
+    except Exception as e:
+        print(f"Не удалось получить chromedriver через webdriver-manager: {str(e)}")
+        return entry["path"] if entry and os.path.isfile(entry["path"]) else None
+
+    cache[version] = {"path": path, "resolved_at": time.time()}
+    try:
+        save_json(cache_file, cache)
+    except OSError as e:
+        print(f"Не удалось сохранить кэш chromedriver: {str(e)}")
+    return path
+
+
+def _wait_key(url, locator):
+    return url, tuple(locator)
+
+
+def _wait_stats_file():
+    return os.environ.get(WAIT_STATS_ENV, DEFAULT_WAIT_STATS)
+
+
+def record_wait(url, locator, seconds, ok):
+    """Добавляет запись об ожидании готовности страницы в журнал DPO_WAIT_STATS."""
+    stats_file = _wait_stats_file()
+    entry = {"url": url, "locator": list(locator), "seconds": round(seconds, 3), "ok": ok, "at": time.time()}
+    history = load_wait_stats(stats_file).setdefault(_wait_key(url, locator), [])
+    with _wait_stats_lock:
+        history.append(entry)
+        del history[:-READY_HISTORY]
+    try:
+        os.makedirs(os.path.dirname(stats_file), exist_ok=True)
+        # Одна короткая строка в режиме дозаписи: параллельные скрипты не портят журнал
+        with open(stats_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"Не удалось записать статистику ожидания: {str(e)}")
+
+
+def load_wait_stats(stats_file=None):
+    """Последние READY_HISTORY ожиданий каждой страницы: {(url, локатор): [записи]}.
+
+    Журнал читается один раз за процесс. Если в нем больше READY_STATS_MAX_LINES строк,
+    он переписывается с одними последними записями, чтобы не расти без границ.
+    """
+    stats_file = stats_file or _wait_stats_file()
+    with _wait_stats_lock:
+        if stats_file in _wait_stats:
+            return _wait_stats[stats_file]
+        stats = {}
+        lines = 0
+        try:
+            with open(stats_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                        history = stats.setdefault(_wait_key(entry["url"], entry["locator"]), [])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    history.append(entry)
+                    del history[:-READY_HISTORY]
+        except OSError:
+            pass
+        if lines > READY_STATS_MAX_LINES:
+            _compact_wait_stats(stats_file, stats)
+        _wait_stats[stats_file] = stats
+        return stats
+
+
+def _compact_wait_stats(stats_file, stats):
+    entries = sorted((e for history in stats.values() for e in history), key=lambda e: e.get("at", 0))
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(stats_file), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        # Записи, дописанные другими процессами во время сжатия, теряются: для статистики это допустимо
+        os.replace(tmp_path, stats_file)
+    except OSError as e:
+        print(f"Не удалось сократить журнал ожиданий: {str(e)}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def derived_timeout(url, locator, timeout):
+    """Таймаут ожидания по истории страницы, не больше заданного timeout.
+
+    Берутся последние READY_HISTORY ожиданий этого url и локатора. Пока успешных
+    среди них меньше READY_MIN_SAMPLES или есть неудачное (страница стала отвечать
+    медленнее), используется timeout без изменений: успешные ожидания с полным
+    таймаутом снова сузят его, когда неудачные уйдут из истории.
+    """
+    history = load_wait_stats().get(_wait_key(url, locator), [])
+    if not all(e.get("ok") for e in history):
+        return timeout
+    samples = [e["seconds"] for e in history]
+    if len(samples) < READY_MIN_SAMPLES:
+        return timeout
+    return min(timeout, max(READY_MIN_TIMEOUT, READY_FACTOR * max(samples)))
+
+
+def wait_ready(driver, locator, timeout=15, visible=False):
+    """Ждет готовности страницы и возвращает корневой элемент.
+
+    Страница готова, когда document.readyState == "complete" и найден элемент
+    locator (при visible=True — еще и отображается). Ожидание завершается сразу,
+    как только условие выполнено; его длительность записывается в журнал
+    (см. record_wait), а HTML страницы сохраняется в архив (см. dpo_archive.py).
+    timeout — верхняя граница, фактический таймаут подбирается по истории
+    (derived_timeout). При его превышении выбрасывается TimeoutException.
+    """
+    static = getattr(driver, "is_static", False)
+
+    def ready(d):
+        # У StaticDriver документ уже полностью загружен
+        if not static and d.execute_script("return document.readyState") != "complete":
+            return False
+        element = d.find_element(*locator)
+        if visible and not element.is_displayed():
+            return False
+        return element
+
+    url = driver.current_url
+    # Страница из архива (dpo_archive.py) загружена заранее: ожидание не записывается в журнал
+    replaying = getattr(driver, "replaying", False)
+    timeout = derived_timeout(url, locator, timeout)
+    started = time.monotonic()
+    try:
+        element = WebDriverWait(driver, timeout, poll_frequency=0.1).until(ready)
+    except Exception:
+        if static:
+            # Скрипты перехватывают ошибку ожидания и пишут пустой файл; по этому признаку
+            # run_page() считает страницу необработанной и передает ее браузеру
+            driver.not_ready = True
+        if not replaying:
+            record_wait(url, locator, time.monotonic() - started, False)
+        raise
+    if not replaying:
+        record_wait(url, locator, time.monotonic() - started, True)
+        report_resource_usage(driver)
+        # Снимок HTML для повторного извлечения без браузера; импорт здесь — dpo_archive импортирует dpo_driver
+        from dpo_archive import archive_page
+        archive_page(driver)
+    return element
+
+
+def find_optional(driver, locator):
+    """Элементы необязательного блока: один поиск после wait_ready(), без ожидания.
+
+    Содержимое страницы к этому моменту уже загружено, поэтому отсутствующий
+    блок сразу дает пустой список, а не ожидание до таймаута.
+    """
+    return driver.find_elements(*locator)
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class SharedChrome:
+    """Долгоживущий headless Chrome с remote-debugging для всех скриптов страниц.
+
+    Браузер перезапускается после recycle_after обработанных страниц,
+    когда все подключенные к нему скрипты завершили работу.
+    """
+
+    def __init__(self, recycle_after=10, chrome_binary=None, startup_timeout=30):
+        self.recycle_after = max(1, recycle_after)
+        self.chrome_binary = chrome_binary or find_chrome_binary()
+        self.startup_timeout = startup_timeout
+        self.address = None
+        self.process = None
+        self.profile_dir = None
+        self.pages = 0
+        self.active = 0
+        self.condition = threading.Condition()
+
+    def start(self):
+        if not self.chrome_binary:
+            raise RuntimeError("Исполняемый файл Chrome не найден, задайте путь в " + CHROME_BINARY_ENV)
+        port = _free_port()
+        self.profile_dir = tempfile.mkdtemp(prefix="dpo_chrome_")
+        self.process = subprocess.Popen(
+            [
+                self.chrome_binary,
+                "--headless=new",
+                "--disable-gpu",
+                "--no-sandbox",
+                "--window-size=1920,1080",
+                "--no-first-run",
+                "--no-default-browser-check",
+                f"--remote-debugging-port={port}",
+                f"--user-data-dir={self.profile_dir}",
+                "about:blank",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        address = f"127.0.0.1:{port}"
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(f"http://{address}/json/version", timeout=1):
+                    self.address = address
+                    self.pages = 0
+                    return address
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise RuntimeError("Общий браузер Chrome не запустился")
+
+    def stop(self):
+        if self.process:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        if self.profile_dir:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+        self.process = None
+        self.profile_dir = None
+        self.address = None
+
+    def acquire(self):
+        """Резервирует браузер для одной страницы и возвращает его адрес."""
+        with self.condition:
+            # Новые страницы ждут, пока отработают текущие, если браузер пора перезапустить
+            while self.pages >= self.recycle_after and self.active > 0:
+                self.condition.wait()
+            if self.address is None or self.pages >= self.recycle_after or self.process.poll() is not None:
+                self.stop()
+                self.start()
+            self.pages += 1
+            self.active += 1
+            return self.address
+
+    def release(self):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    @contextmanager
+    def page(self):
+        address = self.acquire()
+        try:
+            yield address
+        finally:
+            self.release()
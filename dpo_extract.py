@@ -0,0 +1,293 @@
+# Пакетное извлечение данных со страницы: все селекторы обрабатываются одним вызовом execute_script
+#
+# Спецификация — словарь {ключ: локатор} в формате SELECTORS, где локатор — кортеж (By, значение)
+# или словарь {"locator": (By, значение), "attrs": [...], "fields": {ключ: локатор}}.
+# Поля fields ищутся относительно каждого найденного элемента, как element.find_elements().
+#
+# Результат — словарь {ключ: [узел, ...]}, узел:
+#   tag       — имя тега в нижнем регистре (как WebElement.tag_name)
+#   text      — видимый текст (как WebElement.text: пусто для скрытых элементов, &nbsp; -> пробел)
+#   innerText — как get_attribute('innerText')
+#   shown     — отображается ли элемент (как is_displayed())
+#   attrs     — запрошенные атрибуты (как get_attribute())
+#   fields    — найденные вложенные элементы
+
+import re
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# Общие функции поиска элементов для SNAPSHOT_JS и EXPAND_JS
+FIND_JS = r"""
+function isShown(el) {
+    return !!(el.offsetParent || el.getClientRects().length);
+}
+
+function find(ctx, by, value) {
+    if (by === 'xpath') {
+        const found = document.evaluate(value, ctx, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        const out = [];
+        for (let i = 0; i < found.snapshotLength; i++) {
+            const node = found.snapshotItem(i);
+            if (node.nodeType === 1) out.push(node);
+        }
+        return out;
+    }
+    if (by === 'tag name') return Array.from(ctx.getElementsByTagName(value));
+    if (by === 'class name') return Array.from(ctx.getElementsByClassName(value));
+    if (by === 'id') return Array.from(ctx.querySelectorAll('#' + CSS.escape(value)));
+    if (by === 'name') return Array.from(ctx.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+    return Array.from(ctx.querySelectorAll(value));
+}
+"""
+
+SNAPSHOT_JS = FIND_JS + r"""
+const spec = arguments[0];
+
+function attr(el, name) {
+    // get_attribute() в Selenium сначала читает свойство (например, абсолютный href)
+    const prop = el[name];
+    if (prop !== undefined && prop !== null && typeof prop !== 'object' && typeof prop !== 'function') {
+        return String(prop);
+    }
+    return el.getAttribute(name);
+}
+
+function describe(el, item) {
+    const inner = el.innerText || '';
+    const shown = isShown(el);
+    const node = {
+        tag: el.tagName.toLowerCase(),
+        text: shown ? inner.replace(/\u00a0/g, ' ') : '',
+        innerText: inner,
+        shown: shown,
+        attrs: {},
+    };
+    (item.attrs || []).forEach(function (name) { node.attrs[name] = attr(el, name); });
+    if (item.fields) {
+        node.fields = {};
+        for (const key in item.fields) {
+            const sub = item.fields[key];
+            node.fields[key] = find(el, sub.by, sub.value).map(function (child) { return describe(child, sub); });
+        }
+    }
+    return node;
+}
+
+const result = {};
+for (const key in spec) {
+    const item = spec[key];
+    try {
+        result[key] = find(document, item.by, item.value).map(function (el) { return describe(el, item); });
+    } catch (e) {
+        result[key] = [];
+    }
+}
+return result;
+"""
+
+# Нажимает все переключатели разом; возвращает их число
+EXPAND_JS = FIND_JS + r"""
+const toggles = find(document, arguments[0].by, arguments[0].value);
+toggles.forEach(function (el) { el.click(); });
+return toggles.length;
+"""
+
+# Все ли элементы раскрытых блоков отображаются
+ALL_SHOWN_JS = FIND_JS + r"""
+return find(document, arguments[0].by, arguments[0].value).every(isShown);
+"""
+
+
+def _compile_item(locator):
+    """Переводит локатор из формата SELECTORS в JSON-описание для SNAPSHOT_JS."""
+    if isinstance(locator, tuple):
+        return {"by": locator[0], "value": locator[1]}
+    item = {"by": locator["locator"][0], "value": locator["locator"][1]}
+    if locator.get("attrs"):
+        item["attrs"] = list(locator["attrs"])
+    if locator.get("fields"):
+        item["fields"] = {key: _compile_item(sub) for key, sub in locator["fields"].items()}
+    return item
+
+
+def compile_spec(spec):
+    """Компилирует спецификацию один раз, чтобы не повторять это на каждой странице."""
+    return {key: _compile_item(locator) for key, locator in spec.items()}
+
+
+def snapshot(driver, spec=None, compiled=None):
+    """Извлекает все элементы спецификации за один запрос к браузеру.
+
+    Вместо spec можно передать результат compile_spec() в compiled.
+    """
+    if compiled is None:
+        compiled = compile_spec(spec)
+    if getattr(driver, "is_static", False):
+        # StaticDriver (dpo_static.py) разбирает HTML сам, без JavaScript
+        return driver.snapshot(compiled)
+    return driver.execute_script(SNAPSHOT_JS, compiled)
+
+
+def expand_all(driver, toggle_locator, revealed_locator=None, timeout=10):
+    """Раскрывает все свернутые блоки страницы одним вызовом execute_script.
+
+    Нажимает каждый элемент toggle_locator, затем один раз ждет, пока все
+    элементы revealed_locator станут видимыми. Возвращает число переключателей.
+    На StaticDriver ничего не делает: скрытый текст там доступен как innerText.
+    """
+    if getattr(driver, "is_static", False):
+        return 0
+    count = driver.execute_script(EXPAND_JS, _compile_item(toggle_locator))
+    if count and revealed_locator and not wait_all_shown(driver, revealed_locator, timeout):
+        print(f"Не все раскрытые блоки стали видимыми за {timeout} с")
+    return count
+
+
+def wait_all_shown(driver, locator, timeout=10):
+    """Ждет, пока все найденные элементы locator станут видимыми; False, если не дождался.
+
+    На StaticDriver сразу возвращает True: видимость там не зависит от JavaScript.
+    """
+    if getattr(driver, "is_static", False):
+        return True
+    compiled = _compile_item(locator)
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(ALL_SHOWN_JS, compiled)
+        )
+    except TimeoutException:
+        return False
+    return True
+
+
+def section_container(container_locator, fields=None):
+    """Элемент спецификации snapshot(): контейнеры вместе со всеми дочерними элементами.
+
+    Дочерние элементы попадают в поле children; fields — поля, извлекаемые
+    для каждого из них (например, пункты списка). Результат разбирается split_sections().
+    """
+    children = {"locator": (By.XPATH, "./*")}
+    if fields:
+        children["fields"] = fields
+    return {"locator": container_locator, "fields": {"children": children}}
+
+
+def split_sections(containers, headings=("h2", "h3")):
+    """Делит дочерние элементы контейнеров на разделы по заголовкам за один проход.
+
+    Возвращает (вступление, разделы): вступление — узлы до первого заголовка,
+    раздел — {"heading": узел заголовка, "items": [узлы до следующего заголовка]}.
+    Разделы определяются положением заголовков, а не их текстом.
+    """
+    intro = []
+    sections = []
+    for container in containers:
+        for node in container["fields"]["children"]:
+            if node["tag"] in headings:
+                sections.append({"heading": node, "items": []})
+            elif sections:
+                sections[-1]["items"].append(node)
+            else:
+                intro.append(node)
+    return intro, sections
+
+
+def anchor_container(container_locator, items=(By.XPATH, "./li")):
+    """Элемент спецификации snapshot() для TextIndex: дочерние элементы контейнеров.
+
+    У каждого дочернего элемента извлекаются пункты списка items (поле items)
+    и ссылки внутри пунктов (поле links с атрибутом href).
+    """
+    return section_container(container_locator, {
+        "items": {"locator": items, "fields": {"links": {"locator": (By.XPATH, "./a"), "attrs": ["href"]}}},
+    })
+
+
+def normalize_anchor(text):
+    """Текст узла для индекса: &nbsp; -> пробел, пробельные символы схлопываются."""
+    return re.sub(r"\s+", " ", (text or "").replace("\u00a0", " ")).strip()
+
+
+class TextIndex:
+    """Индекс узлов страницы по фразам-якорям.
+
+    Строится один раз по результату anchor_container() для заранее известных
+    фраз anchors и отвечает на поиск узла по фразе и следующего за ним списка
+    без повторного сканирования документа через contains() на каждую фразу.
+
+    Узел соответствует фразе, если его нормализованный innerText содержит ее
+    как подстроку (как contains(., фраза) в XPath). innerText включает текст
+    потомков, поэтому фразе соответствует и дочерний элемент контейнера,
+    внутри которого она находится; тег узла уточняется параметром tags в find().
+    Построение стоит O(число узлов × число фраз) сравнений подстрок, поиск — O(1).
+    """
+
+    def __init__(self, containers, anchors):
+        self.children = [container["fields"]["children"] for container in containers]
+        # Фраза -> позиции узлов в порядке документа (номер контейнера, номер дочернего элемента)
+        self.positions = {normalize_anchor(phrase): [] for phrase in anchors}
+        for ci, children in enumerate(self.children):
+            for i, node in enumerate(children):
+                text = normalize_anchor(node["innerText"])
+                if not text:
+                    continue
+                for phrase, found in self.positions.items():
+                    if phrase in text:
+                        found.append((ci, i))
+
+    def find(self, phrase, tags=None):
+        """Позиция первого узла (с тегом из tags), текст которого содержит phrase, или None.
+
+        phrase должна быть среди anchors, переданных при построении индекса.
+        """
+        phrase = normalize_anchor(phrase)
+        if phrase not in self.positions:
+            raise KeyError(f"Фраза не проиндексирована: {phrase}")
+        for position in self.positions[phrase]:
+            if not tags or self.node(position)["tag"] in tags:
+                return position
+        return None
+
+    def node(self, position):
+        ci, i = position
+        return self.children[ci][i]
+
+    def following(self, phrase, tags=None, tag="ul"):
+        """Первый следующий за якорем соседний элемент с тегом tag (как following-sibling::ul[1]) или None."""
+        position = self.find(phrase, tags)
+        if position is None:
+            return None
+        ci, i = position
+        for node in self.children[ci][i + 1:]:
+            if node["tag"] == tag:
+                return node
+        return None
+
+    def list_texts(self, phrase, tags=None):
+        """Непустые тексты пунктов списка после якоря."""
+        found = self.following(phrase, tags)
+        return texts(found["fields"]["items"]) if found else []
+
+    def list_links(self, phrase, tags=None):
+        """Ссылки пунктов списка после якоря: [{"text": ..., "url": ...}]."""
+        found = self.following(phrase, tags)
+        if not found:
+            return []
+        links = []
+        for item in found["fields"]["items"]:
+            for link in item["fields"]["links"]:
+                if link["text"].strip():
+                    links.append({"text": link["text"].strip(), "url": link["attrs"]["href"]})
+        return links
+
+
+def texts(nodes):
+    """Непустые тексты узлов, как [el.text.strip() for el in elements if el.text.strip()]."""
+    return [node["text"].strip() for node in nodes if node["text"].strip()]
+
+
+def first_text(nodes):
+    """Текст первого узла (как find_element(...).text.strip()) или None, если узлов нет."""
+    return nodes[0]["text"].strip() if nodes else None
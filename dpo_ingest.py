@@ -0,0 +1,161 @@
+# Извлечение текста из всех PDF-документов зеркала (см. dpo_mirror.py) для итогового отчета
+#
+# Каждый документ разбирается в отдельном процессе (не больше workers одновременно),
+# на документ отводится не больше timeout секунд от запуска его процесса: зависший
+# разбор завершается и не задерживает остальные. Страницы фильтруются так же, как PDF педагогического состава
+# (is_text_valid / clean_text из dpo_pdf.py). Текст страниц сохраняется в кэше зеркала
+# по SHA-256 документа, поэтому неизмененные документы повторно не разбираются.
+# Результат группируется по странице, на которой найдена ссылка, и добавляется
+# под этой страницей в combine_markdown_files() в main.py.
+import argparse
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import wait
+
+from dpo_cache import DocumentCache
+from dpo_json import load_json, save_json
+from dpo_mirror import load_manifest, mirror_dir
+from dpo_pdf import extract_text, pdf_workers
+
+# Секунд на разбор одного документа
+DOCUMENT_TIMEOUT = 120
+
+
+def is_pdf(document):
+    return document.get("mime") == "application/pdf" or document["url"].lower().split("?")[0].endswith(".pdf")
+
+
+def _extract_document(conn, path, memo):
+    """Выполняется в отдельном процессе: дополняет memo текстом страниц документа и отправляет его в conn."""
+    try:
+        extract_text(path, workers=1, memo=memo)
+        conn.send((True, memo))
+    except Exception as e:
+        conn.send((False, str(e)))
+    finally:
+        conn.close()
+
+
+def _extract_isolated(tasks, workers, timeout):
+    """Разбирает документы tasks ({sha256: (путь, memo)}), не больше workers одновременно.
+
+    Каждый документ разбирается в своем процессе, и timeout отсчитывается от запуска
+    этого процесса, а не от начала ожидания: документы из очереди не теряют время
+    из-за зависшего, а зависший процесс завершается, освобождая место следующему.
+    Возвращает итератор (sha256, статус, memo или текст ошибки); статус — "ok", "error" или "timeout".
+    """
+    queue = list(tasks.items())
+    running = {}
+    try:
+        while queue or running:
+            while queue and len(running) < workers:
+                digest, (path, memo) = queue.pop(0)
+                reader, writer = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(target=_extract_document, args=(writer, path, memo), daemon=True)
+                process.start()
+                writer.close()
+                running[reader] = (digest, process, time.monotonic())
+            deadline = min(started for _, _, started in running.values()) + timeout
+            for reader in wait(list(running), timeout=max(0, deadline - time.monotonic())):
+                digest, process, _ = running.pop(reader)
+                try:
+                    ok, value = reader.recv()
+                except EOFError:
+                    ok, value = False, None
+                reader.close()
+                process.join()
+                if value is None:
+                    value = f"процесс завершился с кодом {process.exitcode}"
+                yield digest, "ok" if ok else "error", value
+            now = time.monotonic()
+            for reader, (digest, process, started) in list(running.items()):
+                if now - started >= timeout:
+                    del running[reader]
+                    process.terminate()
+                    process.join()
+                    reader.close()
+                    yield digest, "timeout", None
+    finally:
+        for reader, (_, process, _) in running.items():
+            process.terminate()
+            process.join()
+            reader.close()
+
+
+def _memo_texts(memo):
+    return [memo["pages"][str(n)] for n in range(memo["page_count"]) if memo["pages"].get(str(n))]
+
+
+def ingest_documents(work_dir=".", target_dir=None, workers=None, timeout=DOCUMENT_TIMEOUT):
+    """Извлекает текст PDF-документов из манифеста зеркала.
+
+    Возвращает {Markdown-файл страницы: [{"text", "url", "content"}]} и
+    сохраняет его в ingest.json в каталоге зеркала.
+    """
+    target_dir = target_dir or mirror_dir(work_dir)
+    manifest = load_manifest(target_dir)
+    documents = [d for d in manifest["documents"] if "error" not in d and is_pdf(d)]
+    print(f"PDF-документов для извлечения текста: {len(documents)}")
+    cache = DocumentCache(root=target_dir, max_bytes=float("inf"))
+
+    memos = {}
+    pending = {}
+    for document in documents:
+        digest = document["sha256"]
+        if digest in memos or digest in pending:
+            continue
+        memo = cache.load_text(digest)
+        if "page_count" in memo and len(memo.get("pages", {})) == memo["page_count"]:
+            # Документ не изменился с прошлого разбора
+            memos[digest] = memo
+            continue
+        pending[digest] = (cache.blob_path(digest), memo)
+
+    for digest, status, value in _extract_isolated(pending, workers or pdf_workers(), timeout):
+        if status == "ok":
+            memos[digest] = value
+            cache.save_text(digest, value)
+        elif status == "timeout":
+            print(f"Документ {digest[:12]} не разобран за {timeout} с")
+        else:
+            print(f"Ошибка при извлечении текста из {digest[:12]}: {value}")
+
+    by_page = {}
+    for document in documents:
+        memo = memos.get(document["sha256"])
+        texts = _memo_texts(memo) if memo else []
+        if texts:
+            by_page.setdefault(document["page"], []).append({
+                "text": document["text"],
+                "url": document["url"],
+                "content": "\n\n".join(texts),
+            })
+    save_json(os.path.join(target_dir, "ingest.json"), by_page)
+    print(f"Текст извлечен из {sum(len(v) for v in by_page.values())} документов")
+    return by_page
+
+
+def load_ingest(target_dir):
+    """Результат последнего ingest_documents() из ingest.json."""
+    return load_json(os.path.join(target_dir, "ingest.json"))
+
+
+def render_documents(documents):
+    """Markdown-блок с текстом документов одной страницы для итогового отчета."""
+    parts = []
+    for document in documents:
+        parts.append(f"### Документ: [{document['text']}]({document['url']})\n\n{document['content']}\n\n")
+    return "".join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Извлечение текста из PDF-документов зеркала")
+    parser.add_argument("--dir", default=".", help="каталог с Markdown-файлами страниц")
+    parser.add_argument("--timeout", type=float, default=DOCUMENT_TIMEOUT, help="секунд на один документ")
+    args = parser.parse_args()
+    ingest_documents(args.dir, timeout=args.timeout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+# Чтение и запись JSON-файлов кэшей, индексов и манифестов, общие для main.py и модулей dpo_*
+import json
+import os
+import tempfile
+
+
+def load_json(path):
+    """Содержимое JSON-файла; {}, если файла нет или он поврежден."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_json(path, data):
+    """Записывает data в JSON-файл path, создавая каталог при необходимости."""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    # Запись через временный файл, чтобы параллельные скрипты не читали недописанный файл
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,138 @@
+# Зеркало документов и сканов, на которые ссылаются страницы dokumenty и dokument-company
+#
+# Ссылки берутся из Markdown-файлов этих страниц (строки "- [текст](ссылка)"), файлы
+# скачиваются пулом потоков через общий пул HTTP-соединений с ограничением частоты
+# запросов к каждому хосту. Содержимое хранится без дублей по SHA-256 (DocumentCache),
+# повторный запуск скачивает только изменившиеся файлы. manifest.json описывает каждый
+# файл: страница, ссылка, размер, MIME-тип, хэш и время загрузки, — последующим этапам
+# не нужно обращаться к сайту.
+import argparse
+import mimetypes
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from dpo_cache import DocumentCache
+from dpo_json import load_json, save_json
+
+# Markdown-файлы страниц со ссылками на документы
+MIRROR_SOURCES = ["DPO_dokumenty.md", "DPO_dokument-company.md"]
+MIRROR_DIR_ENV = "DPO_MIRROR"
+DEFAULT_MIRROR_DIR = "mirror"
+MIRROR_WORKERS = 4
+# Запросов в секунду к одному хосту
+MIRROR_RATE = 2.0
+LINK_PATTERN = re.compile(r"^- \[(?P<text>[^\]]*)\]\((?P<url>https?://[^)\s]+)\)", re.MULTILINE)
+
+
+def mirror_dir(work_dir="."):
+    """Каталог зеркала: DPO_MIRROR или mirror/ в каталоге с результатами."""
+    return os.environ.get(MIRROR_DIR_ENV) or os.path.join(work_dir, DEFAULT_MIRROR_DIR)
+
+
+def collect_links(work_dir=".", sources=MIRROR_SOURCES):
+    """Ссылки из Markdown-файлов страниц: [{"page", "text", "url"}] без повторов url."""
+    links = []
+    seen = set()
+    for source in sources:
+        try:
+            with open(os.path.join(work_dir, source), "r", encoding="utf-8") as f:
+                content = f.read()
+        except OSError as e:
+            print(f"Не удалось прочитать {source}: {str(e)}")
+            continue
+        for match in LINK_PATTERN.finditer(content):
+            if match["url"] not in seen:
+                seen.add(match["url"])
+                links.append({"page": source, "text": match["text"], "url": match["url"]})
+    return links
+
+
+class HostRateLimiter:
+    """Не больше rate запросов в секунду к каждому хосту (общий для всех потоков)."""
+
+    def __init__(self, rate=MIRROR_RATE):
+        self.interval = 1 / rate if rate > 0 else 0
+        self.lock = threading.Lock()
+        self.next_at = {}
+
+    def wait(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at.get(host, now))
+            self.next_at[host] = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+
+def pooled_session(workers=MIRROR_WORKERS):
+    """Session с пулом соединений на workers потоков."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def mirror_documents(work_dir=".", target_dir=None, workers=MIRROR_WORKERS, rate=MIRROR_RATE):
+    """Скачивает все документы страниц в зеркало и записывает manifest.json. Возвращает манифест."""
+    target_dir = target_dir or mirror_dir(work_dir)
+    links = collect_links(work_dir)
+    print(f"Ссылок для зеркалирования: {len(links)}")
+    cache = DocumentCache(root=target_dir, max_bytes=float("inf"), session=pooled_session(workers))
+    limiter = HostRateLimiter(rate)
+
+    def fetch(link):
+        limiter.wait(link["url"])
+        try:
+            digest = cache.fetch(link["url"], probe=True)
+        except Exception as e:
+            print(f"Не удалось скачать {link['url']}: {str(e)}")
+            return {**link, "error": str(e)}
+        entry = cache.entry(link["url"]) or {}
+        content_type = (entry.get("content_type") or "").split(";")[0].strip()
+        path = cache.blob_path(digest)
+        return {
+            **link,
+            "sha256": digest,
+            "size": os.path.getsize(path),
+            "mime": content_type or mimetypes.guess_type(link["url"])[0],
+            "fetched_at": time.time(),
+            "path": os.path.relpath(path, target_dir),
+        }
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        documents = list(executor.map(fetch, links))
+
+    manifest = {"created_at": time.time(), "documents": documents}
+    save_json(os.path.join(target_dir, "manifest.json"), manifest)
+    failed = sum(1 for document in documents if "error" in document)
+    print(f"Зеркало обновлено: {len(documents) - failed} файлов, ошибок: {failed}")
+    return manifest
+
+
+def load_manifest(target_dir):
+    """Манифест зеркала (пустой, если зеркало еще не создавалось)."""
+    manifest = load_json(os.path.join(target_dir, "manifest.json"))
+    manifest.setdefault("documents", [])
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Зеркало документов со страниц dokumenty и dokument-company")
+    parser.add_argument("--dir", default=".", help="каталог с Markdown-файлами страниц")
+    parser.add_argument("--workers", type=int, default=MIRROR_WORKERS, help="одновременных загрузок")
+    parser.add_argument("--rate", type=float, default=MIRROR_RATE, help="запросов в секунду к одному хосту")
+    args = parser.parse_args()
+    mirror_documents(args.dir, workers=args.workers, rate=args.rate)
+
+
+if __name__ == "__main__":
+    main()
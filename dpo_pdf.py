@@ -0,0 +1,116 @@
+# Извлечение текста из PDF: диапазоны страниц обрабатываются параллельно в пуле процессов
+#
+# Разбор разметки страниц в pdfplumber загружает процессор, поэтому страницы большого PDF
+# делятся на диапазоны по PDF_SHARD_PAGES и отдаются процессам пула. Каждый процесс
+# сам открывает PDF по пути (обычно это файл из кэша документов, см. dpo_cache.py),
+# применяет фильтр is_text_valid к своим страницам и возвращает очищенные тексты;
+# результаты собираются в порядке страниц.
+# Текст уже разобранных страниц можно передать в memo (кэш текста из dpo_cache.py).
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pdfplumber
+
+# Число процессов для разбора PDF (по умолчанию — число ядер)
+PDF_WORKERS_ENV = "DPO_PDF_WORKERS"
+# Страниц в одном задании пула
+PDF_SHARD_PAGES = 8
+# Меньшие PDF разбираются в текущем процессе: запуск пула обойдется дороже
+PDF_PARALLEL_MIN_PAGES = 16
+
+
+def is_text_valid(text):
+    """Проверяет текст на наличие бессмысленных символов или 'белиберды'."""
+    garbage_pattern = r'[^a-zA-Zа-яА-Я0-9\s.,;:!?-]'
+    garbage_count = len(re.findall(garbage_pattern, text))
+    total_length = len(text)
+
+    if total_length == 0 or (garbage_count / total_length > 0.3):
+        return False
+
+    word_pattern = r'[а-яА-Я]{3,}'
+    words = re.findall(word_pattern, text)
+    return len(words) > 2
+
+
+def clean_text(text):
+    """Очищает текст от лишних пробелов и переносов строк."""
+    text = re.sub(r'\s+', ' ', text.strip())
+    return text
+
+
+def pdf_workers():
+    """Число процессов из DPO_PDF_WORKERS или число ядер."""
+    try:
+        return max(1, int(os.environ.get(PDF_WORKERS_ENV, "")))
+    except ValueError:
+        return os.cpu_count() or 1
+
+
+def extract_pages(path, start=0, end=None):
+    """Очищенные тексты страниц [start, end) PDF path; None для страниц, не прошедших is_text_valid."""
+    text_content = []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages[start:end]:
+            page_text = page.extract_text()
+            # Разобранные объекты страницы больше не нужны
+            page.close()
+            if page_text and is_text_valid(page_text):
+                text_content.append(clean_text(page_text))
+            else:
+                text_content.append(None)
+    return text_content
+
+
+def page_ranges(pages, shard_pages=PDF_SHARD_PAGES):
+    """Диапазоны (начало, конец) подряд идущих номеров pages, не длиннее shard_pages страниц."""
+    ranges = []
+    for page in pages:
+        if ranges and ranges[-1][1] == page and page - ranges[-1][0] < shard_pages:
+            ranges[-1][1] = page + 1
+        else:
+            ranges.append([page, page + 1])
+    return [tuple(r) for r in ranges]
+
+
+def _extract_parallel(path, ranges, workers):
+    """Разбирает диапазоны страниц в пуле процессов; результаты в порядке ranges."""
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        return list(executor.map(
+            extract_pages,
+            [path] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges],
+        ))
+
+
+def extract_text(path, workers=None, memo=None):
+    """Возвращает тексты страниц PDF path в порядке страниц.
+
+    Большие PDF разбираются в пуле из workers процессов; каждый процесс
+    открывает тот же файл path, копия документа не создается.
+    memo — словарь {"page_count": n, "pages": {"номер": текст или None}}
+    (см. DocumentCache.load_text): уже разобранные страницы берутся из него,
+    новые добавляются в него.
+    """
+    workers = workers or pdf_workers()
+    memo = {} if memo is None else memo
+    pages = memo.setdefault("pages", {})
+    if "page_count" not in memo:
+        with pdfplumber.open(path) as pdf:
+            memo["page_count"] = len(pdf.pages)
+    page_count = memo["page_count"]
+
+    missing = [n for n in range(page_count) if str(n) not in pages]
+    if missing:
+        ranges = page_ranges(missing)
+        if workers == 1 or len(missing) < PDF_PARALLEL_MIN_PAGES:
+            shards = [extract_pages(path, start, end) for start, end in ranges]
+        else:
+            shards = _extract_parallel(path, ranges, workers)
+        for (start, _), shard in zip(ranges, shards):
+            for offset, text in enumerate(shard):
+                pages[str(start + offset)] = text
+
+    return [pages[str(n)] for n in range(page_count) if pages[str(n)]]
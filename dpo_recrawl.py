@@ -0,0 +1,183 @@
+# Проверка страниц перед запуском скриптов: скрипт выполняется, только если страница изменилась
+#
+# Для TARGET_URL каждого скрипта выполняется условный запрос (If-None-Match /
+# If-Modified-Since). Ответ 304 или совпадение хэша нормализованного HTML (без script,
+# style, комментариев и скрытых полей, где меняются одноразовые токены) означает, что
+# страница не изменилась: браузер не запускается, а в отчет попадает Markdown прошлого
+# запуска. Состояние хранится в DPO_RECRAWL_STATE (по умолчанию ~/.dpo_cache/recrawl.json):
+#   {script: {"url", "etag", "last_modified", "body_sha256", "md_sha256", "crawled_at"}}
+# Запись обновляется только после успешного выполнения скрипта с непустым Markdown-файлом,
+# ошибка или пустой файл ее сбрасывают. Страница обходится заново не реже раза
+# в DPO_RECRAWL_MAX_AGE часов: часть содержимого (данные, которые подгружает
+# JavaScript, связанные PDF) не видна в HTML, который отдает сервер.
+import ast
+import hashlib
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from lxml import etree, html
+
+from dpo_driver import rebase_url
+from dpo_json import load_json, save_json
+from dpo_runner import has_output
+
+RECRAWL_STATE_ENV = "DPO_RECRAWL_STATE"
+DEFAULT_RECRAWL_STATE = os.path.join(os.path.expanduser("~"), ".dpo_cache", "recrawl.json")
+RECRAWL_MAX_AGE_ENV = "DPO_RECRAWL_MAX_AGE"
+DEFAULT_RECRAWL_MAX_AGE = 24 * 7  # часов
+RECRAWL_WORKERS = 8
+RECRAWL_TIMEOUT = 30
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+# Элементы, которые не влияют на разбираемый текст, но меняются от запроса к запросу
+VOLATILE_XPATH = "//input[@type='hidden'] | //meta | //link"
+
+
+def target_url(script_path):
+    """TARGET_URL скрипта страницы (или url= его PageSpec) без импорта скрипта; None, если не найден."""
+    with open(script_path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(t, "id", None) == "TARGET_URL" for t in node.targets):
+            if isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+                return node.value.value
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Call) and getattr(node.func, "id", None) == "PageSpec":
+            for keyword in node.keywords:
+                if keyword.arg == "url" and isinstance(keyword.value, ast.Constant):
+                    return keyword.value.value
+    return None
+
+
+def normalized_hash(content):
+    """SHA-256 HTML страницы без скриптов, стилей, комментариев и изменчивых служебных элементов."""
+    tree = html.document_fromstring(content)
+    etree.strip_elements(tree, etree.Comment, "script", "style", "noscript", "template", with_tail=False)
+    for node in tree.xpath(VOLATILE_XPATH):
+        node.drop_tree()
+    text = re.sub(r"\s+", " ", html.tostring(tree, encoding="unicode"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def file_sha256(path):
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+class RecrawlState:
+    """Состояние страниц прошлых запусков и проверка их изменений."""
+
+    def __init__(self, path=None, max_age=None, timeout=RECRAWL_TIMEOUT):
+        self.path = path or os.environ.get(RECRAWL_STATE_ENV, DEFAULT_RECRAWL_STATE)
+        if max_age is None:
+            max_age = float(os.environ.get(RECRAWL_MAX_AGE_ENV, DEFAULT_RECRAWL_MAX_AGE))
+        self.max_age = max_age * 3600
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.pages = load_json(self.path)
+        self.lock = threading.Lock()
+
+    def probe(self, script, url):
+        """Условный запрос к странице: {"url", "etag", "last_modified", "body_sha256", "unchanged"}."""
+        entry = self.pages.get(script, {})
+        headers = {}
+        if entry.get("url") == url:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = self.session.get(rebase_url(url), headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and headers:
+            return {
+                "url": url,
+                "etag": response.headers.get("ETag") or entry.get("etag"),
+                "last_modified": response.headers.get("Last-Modified") or entry.get("last_modified"),
+                "body_sha256": entry.get("body_sha256"),
+                "unchanged": True,
+            }
+        response.raise_for_status()
+        body_sha256 = normalized_hash(response.content)
+        return {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_sha256": body_sha256,
+            "unchanged": entry.get("url") == url and entry.get("body_sha256") == body_sha256,
+        }
+
+    def check(self, scripts, workers=RECRAWL_WORKERS):
+        """Проверяет страницы скриптов параллельно.
+
+        scripts — [(имя скрипта, путь к скрипту, ожидаемый Markdown-файл)].
+        Возвращает ({имя: результат probe()}, {имя: Markdown-файл прошлого запуска,
+        который можно использовать вместо запуска скрипта}).
+        """
+        def check_one(item):
+            script, script_path, expected_md = item
+            try:
+                url = target_url(script_path)
+                if not url:
+                    return script, None, None
+                probe = self.probe(script, url)
+            except Exception as e:
+                print(f"Не удалось проверить страницу {script}: {str(e)}")
+                return script, None, None
+            return script, probe, expected_md if self._reusable(script, expected_md, probe) else None
+
+        probes = {}
+        unchanged = {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+            for script, probe, expected_md in executor.map(check_one, scripts):
+                if probe:
+                    probes[script] = probe
+                if expected_md:
+                    unchanged[script] = expected_md
+        return probes, unchanged
+
+    def _reusable(self, script, expected_md, probe):
+        """Можно ли взять Markdown прошлого запуска: страница не изменилась, файл на месте и не устарел."""
+        entry = self.pages.get(script, {})
+        if not probe["unchanged"] or time.time() - entry.get("crawled_at", 0) > self.max_age:
+            return False
+        try:
+            return has_output(expected_md) and file_sha256(expected_md) == entry.get("md_sha256")
+        except OSError:
+            return False
+
+    def record(self, script, expected_md, probe):
+        """Запоминает состояние страницы после успешного выполнения скрипта.
+
+        Пустой или отсутствующий Markdown-файл не записывается, а сбрасывает прежнее
+        состояние страницы: в следующий раз скрипт будет запущен снова.
+        """
+        if not has_output(expected_md):
+            self.forget(script)
+            return
+        with self.lock:
+            self.pages[script] = {
+                "url": probe["url"],
+                "etag": probe["etag"],
+                "last_modified": probe["last_modified"],
+                "body_sha256": probe["body_sha256"],
+                "md_sha256": file_sha256(expected_md),
+                "crawled_at": time.time(),
+            }
+
+    def forget(self, script):
+        """Сбрасывает состояние страницы, скрипт которой завершился ошибкой или не создал файл."""
+        with self.lock:
+            self.pages.pop(script, None)
+
+    def save(self):
+        try:
+            save_json(self.path, self.pages)
+        except OSError as e:
+            print(f"Не удалось сохранить состояние страниц: {str(e)}")
+        self.session.close()
@@ -0,0 +1,260 @@
+# Локальный HTTP-сервер, подменяющий сайт при проверке без сети, и запись страниц сайта для него
+#
+# Раздает файлы каталога (например, сохраненные документы) с заголовками ETag,
+# Last-Modified и Accept-Ranges, отвечает 304 на условные запросы и 206 на запросы
+# диапазона (Range: bytes=a-b, bytes=a-, bytes=-n), как веб-сервер сайта. На нем
+# проверяется DocumentCache: условная загрузка и проверка изменений через Range.
+# Для каталога отдается его index.html без перенаправления.
+#
+# --record сохраняет в каталог HTML страниц всех скриптов DPO_*.py (адрес /o-nas —
+# файл o-nas/index.html), их стили, скрипты и изображения с сайта и PDF со страниц
+# RECORD_DOCUMENT_PAGES. Абсолютные ссылки на сайт заменяются ссылками от корня, чтобы
+# браузер загружал все с локального сервера. Скрипты переключаются на сервер
+# переменной DPO_BASE_URL (см. dpo_driver.rebase_url и dpo_bench.py).
+#
+#   python dpo_replay.py --record --dir fixtures
+#   python dpo_replay.py --dir fixtures --port 8765
+import argparse
+import email.utils
+import glob
+import os
+import re
+import threading
+import time
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urljoin, urlsplit
+
+import requests
+from lxml import html
+
+from dpo_driver import SITE_PATTERN
+from dpo_json import save_json
+from dpo_recrawl import target_url
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+# Абсолютные ссылки на сайт в сохраняемом HTML
+SITE_LINK_PATTERN = re.compile(r"https?://(?:www\.)?academydpo\.org(?=[/\"'?#])")
+# Ресурсы страницы, которые сохраняются вместе с ней
+ASSET_XPATH = "//link[@rel='stylesheet']/@href | //link[@rel='preload']/@href | //script/@src | //img/@src"
+# Страницы, PDF-документы которых нужны скриптам (PDF педагогического состава)
+RECORD_DOCUMENT_PAGES = ["DPO_pedagogicheskij-sostav.py"]
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class RangeFile:
+    """Файл, из которого читается не больше length байт начиная с offset."""
+
+    def __init__(self, f, offset, length):
+        self.f = f
+        self.f.seek(offset)
+        self.left = length
+
+    def read(self, size=-1):
+        if self.left <= 0:
+            return b""
+        size = self.left if size is None or size < 0 else min(size, self.left)
+        data = self.f.read(size)
+        self.left -= len(data)
+        return data
+
+    def close(self):
+        self.f.close()
+
+
+def parse_range(header, size):
+    """(начало, конец включительно) для заголовка Range или None, если диапазон не задан.
+
+    Для недопустимого диапазона возвращает (None, None).
+    """
+    match = RANGE_PATTERN.match(header.strip()) if header else None
+    if not match or match.group(1) == match.group(2) == "":
+        return None
+    first, last = match.groups()
+    if first == "":
+        # bytes=-n: последние n байт
+        length = int(last)
+        if length == 0:
+            return None, None
+        return max(0, size - length), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None, None
+    return start, end
+
+
+class ReplayHandler(SimpleHTTPRequestHandler):
+    """SimpleHTTPRequestHandler с ETag, условными запросами и Range."""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and os.path.isfile(os.path.join(path, "index.html")):
+            # Страница сайта /o-nas записана как o-nas/index.html
+            path = os.path.join(path, "index.html")
+        if not os.path.isfile(path):
+            return super().send_head()
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+        etag = f'"{stat.st_mtime_ns:x}-{size:x}"'
+        last_modified = self.date_time_string(stat.st_mtime)
+
+        if self._not_modified(etag, stat.st_mtime):
+            f.close()
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return None
+
+        byte_range = parse_range(self.headers.get("Range"), size)
+        if byte_range == (None, None):
+            f.close()
+            self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        if byte_range:
+            start, end = byte_range
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            body = RangeFile(f, start, end - start + 1)
+            length = end - start + 1
+        else:
+            self.send_response(HTTPStatus.OK)
+            body = f
+            length = size
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(length))
+        self.send_header("Last-Modified", last_modified)
+        self.send_header("ETag", etag)
+        self.send_header("Accept-Ranges", "bytes")
+        self.end_headers()
+        return body
+
+    def _not_modified(self, etag, mtime):
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match:
+            return etag in [tag.strip() for tag in if_none_match.split(",")] or if_none_match.strip() == "*"
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+    def log_message(self, format, *args):
+        # Журнал запросов не засоряет вывод скриптов
+        pass
+
+
+def serve(directory, port=0, host="127.0.0.1"):
+    """Запускает сервер в фоновом потоке и возвращает его; адрес — server.server_address."""
+    server = ThreadingHTTPServer((host, port), partial(ReplayHandler, directory=str(directory)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fixture_path(directory, url, page=False):
+    """Путь к файлу адреса url в каталоге записи; страница записывается как <путь>/index.html."""
+    path = unquote(urlsplit(url).path).lstrip("/")
+    if page or not path or path.endswith("/"):
+        path = os.path.join(path, "index.html")
+    return os.path.join(directory, *path.split("/"))
+
+
+def _write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def record(directory, scripts=None, documents=RECORD_DOCUMENT_PAGES, timeout=60):
+    """Записывает страницы скриптов, их ресурсы и PDF-документы в directory.
+
+    Возвращает манифест записи (он же сохраняется в record.json).
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    script_paths = scripts or sorted(glob.glob(os.path.join(SCRIPTS_DIR, "DPO_*.py")))
+    pages = {os.path.basename(p): target_url(p) for p in script_paths}
+    recorded = set()
+    failed = []
+
+    def fetch(url, path=None):
+        """Загружает url один раз за запись; тело сохраняется в path, если он задан."""
+        if url in recorded:
+            return None
+        recorded.add(url)
+        try:
+            response = session.get(url, timeout=timeout)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            print(f"Не удалось записать {url}: {str(e)}")
+            failed.append(url)
+            return None
+        if path:
+            _write(path, response.content)
+        return response
+
+    for script, url in pages.items():
+        if not url:
+            continue
+        response = fetch(url)
+        if response is None:
+            continue
+        print(f"Записана страница {script}: {url}")
+        tree = html.document_fromstring(response.content, base_url=response.url)
+        links = [urljoin(response.url, link) for link in tree.xpath(ASSET_XPATH)]
+        if script in documents:
+            links += [urljoin(response.url, link) for link in tree.xpath("//a/@href") if ".pdf" in link.lower()]
+        for link in links:
+            # Записываются только ресурсы самого сайта: другие адреса сервер не подменяет
+            if SITE_PATTERN.match(link):
+                fetch(link, fixture_path(directory, link))
+        # Ссылки на сайт ведут на локальный сервер
+        # Без charset в заголовке requests предполагает ISO-8859-1, а сайт отдает UTF-8
+        encoding = response.encoding if "charset" in response.headers.get("Content-Type", "").lower() else "utf-8"
+        content = response.content.decode(encoding, errors="replace")
+        _write(fixture_path(directory, url, page=True), SITE_LINK_PATTERN.sub("", content).encode("utf-8"))
+
+    manifest = {"recorded_at": time.time(), "pages": pages, "files": len(recorded) - len(failed), "failed": failed}
+    save_json(os.path.join(directory, "record.json"), manifest)
+    print(f"Записано файлов: {manifest['files']}, ошибок: {len(failed)}")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный сервер с поддержкой Range для проверки без сети")
+    parser.add_argument("--dir", default=".", help="каталог с файлами")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--record", action="store_true",
+                        help="записать страницы сайта, их ресурсы и PDF в --dir и выйти")
+    args = parser.parse_args()
+    if args.record:
+        record(args.dir)
+        return
+    server = ThreadingHTTPServer((args.host, args.port), partial(ReplayHandler, directory=args.dir))
+    print(f"Сервер запущен: http://{args.host}:{server.server_address[1]}/ (каталог {os.path.abspath(args.dir)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
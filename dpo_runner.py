@@ -0,0 +1,267 @@
+# Запуск скриптов страниц DPO_*.py в пуле заранее прогретых процессов main.py
+import importlib.util
+import io
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import redirect_stdout
+from multiprocessing import util
+from pathlib import Path
+
+import psutil
+
+from dpo_driver import DEFAULT_RESOURCE_POLICY, apply_resource_policy, attach_driver, create_driver, headless_options
+
+# Состояние рабочего процесса: загруженные модули страниц и общий для них браузер
+_modules = {}
+_driver = None
+_pages_on_driver = 0
+_recycle_after = 10
+# Статический режим: страницы без NEEDS_BROWSER загружаются по HTTP и разбираются lxml
+_static = False
+_static_driver = None
+# Очередь, через которую рабочий процесс сообщает PageRunner, кто выполняет страницу
+_status = None
+# Секунд на завершение страницы после закрытия ее браузера
+KILL_GRACE = 10
+
+
+def load_page_module(script_path):
+    """Импортирует скрипт страницы по пути (имена с дефисами нельзя импортировать через import)."""
+    script_path = Path(script_path)
+    name = script_path.stem.replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, script_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def init_worker(work_dir, script_paths, recycle_after=10, static=False, status=None):
+    """Готовит рабочий процесс: переходит в каталог с результатами и импортирует все скрипты."""
+    global _recycle_after, _static, _status
+    _recycle_after = max(1, recycle_after)
+    _static = static
+    _status = status
+    os.chdir(work_dir)
+    if work_dir not in sys.path:
+        sys.path.insert(0, work_dir)
+    for script_path in script_paths:
+        try:
+            _modules[str(script_path)] = load_page_module(script_path)
+        except Exception as e:
+            # Скрипт будет запущен в отдельном процессе, см. run_page
+            print(f"Не удалось импортировать {script_path}: {str(e)}")
+    # Браузер закрывается при завершении рабочего процесса
+    util.Finalize(None, close_driver, exitpriority=10)
+    # При SIGTERM (пул прерывает процессы, когда один из них упал) Finalize не выполняется
+    signal.signal(signal.SIGTERM, _terminate_worker)
+
+
+def _terminate_worker(signum, frame):
+    """Завершает chromedriver и Chrome рабочего процесса, затем сам процесс."""
+    kill_children(psutil.Process())
+    os._exit(128 + signum)
+
+
+def kill_children(process):
+    """Завершает всех потомков process (chromedriver и запущенный им Chrome)."""
+    try:
+        children = process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return
+    for child in children:
+        try:
+            child.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+
+def kill_process_tree(pid):
+    """Завершает процесс pid вместе со всеми его потомками."""
+    try:
+        process = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return
+    # Потомки собираются до завершения процесса: потом они перейдут к init
+    kill_children(process)
+    try:
+        process.kill()
+    except psutil.NoSuchProcess:
+        pass
+
+
+def get_worker_driver():
+    """Возвращает браузер рабочего процесса, перезапуская его после _recycle_after страниц."""
+    global _driver, _pages_on_driver
+    if _driver is not None and _pages_on_driver >= _recycle_after:
+        close_driver()
+    if _driver is None:
+        _driver = attach_driver() or create_driver(headless_options())
+        _pages_on_driver = 0
+    _pages_on_driver += 1
+    return _driver
+
+
+def get_static_driver():
+    """Возвращает StaticDriver рабочего процесса (одна HTTP-сессия на все страницы)."""
+    global _static_driver
+    if _static_driver is None:
+        from dpo_static import StaticDriver
+        _static_driver = StaticDriver()
+    return _static_driver
+
+
+def close_driver():
+    global _driver, _static_driver
+    if _static_driver is not None:
+        _static_driver.quit()
+        _static_driver = None
+    if _driver is not None:
+        try:
+            _driver.quit()
+        except Exception as e:
+            print(f"Ошибка при закрытии браузера: {str(e)}")
+        _driver = None
+
+
+def _report_page(script_path, driver):
+    """Сообщает PageRunner процесс, выполняющий страницу, и PID chromedriver ее браузера."""
+    if _status is None:
+        return
+    service = getattr(driver, "service", None)
+    service_pid = getattr(getattr(service, "process", None), "pid", None)
+    _status.put((script_path, os.getpid(), service_pid))
+
+
+def has_output(filename):
+    """Создан ли непустой Markdown-файл: пустой файл означает, что данные страницы не извлечены."""
+    try:
+        return bool(filename) and os.path.getsize(filename) > 0
+    except OSError:
+        return False
+
+
+def run_page(script_path):
+    """Выполняет run(driver) модуля страницы.
+
+    Возвращает (успех, имя созданного файла, текст ошибки вместе с выводом скрипта).
+    Пустой или не созданный файл и страница, не готовая без JavaScript, считаются
+    ошибкой: main.py повторит такую страницу в браузере в отдельном процессе.
+    """
+    module = _modules.get(str(script_path))
+    if module is None or not hasattr(module, "run"):
+        return False, None, f"Модуль {script_path} не загружен или не содержит run()"
+    static = _static and not getattr(module, "NEEDS_BROWSER", False)
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            if static:
+                driver = get_static_driver()
+            else:
+                driver = get_worker_driver()
+                # Браузер общий для всех страниц процесса: политика задается перед каждой
+                apply_resource_policy(driver, getattr(module, "RESOURCE_POLICY", DEFAULT_RESOURCE_POLICY))
+            _report_page(str(script_path), driver)
+            result = module.run(driver)
+        if static and driver.not_ready:
+            return False, None, output.getvalue()[-2000:] + "Страница не готова без JavaScript, нужен браузер"
+        if not has_output(result):
+            return False, None, output.getvalue()[-2000:] + f"Скрипт не создал Markdown-файл или файл пуст: {result}"
+        return True, str(result), ""
+    except Exception:
+        # После сбоя состояние браузера неизвестно, следующая страница получит новый
+        if not static:
+            close_driver()
+        return False, None, output.getvalue()[-2000:] + traceback.format_exc()
+
+
+class PageRunner:
+    """Выполняет скрипты страниц без запуска отдельного интерпретатора на каждую страницу.
+
+    Страницы обрабатываются в пуле из workers процессов, каждый из которых один раз
+    импортирует все скрипты и держит свой браузер. Страница, не уложившаяся в timeout
+    секунд, прерывается до того, как main.py запустит ее повторно, чтобы повторный
+    запуск не писал тот же файл одновременно с зависшим процессом: сначала завершается
+    браузер страницы (chromedriver и Chrome), и зависший вызов WebDriver возвращает
+    ошибку; если страница и после этого не завершилась за KILL_GRACE секунд,
+    завершается выполнявший ее процесс вместе с потомками, а пул пересоздается.
+    При static=True страницы без NEEDS_BROWSER разбираются без браузера (см. dpo_static.py).
+    """
+
+    def __init__(self, work_dir, script_paths, workers=1, recycle_after=10, timeout=300, static=False):
+        # Рабочие процессы сообщают, какую страницу выполняют (см. _report_page)
+        self.status = multiprocessing.Queue()
+        self.pages = {}
+        self.initargs = (str(work_dir), [str(p) for p in script_paths], recycle_after, static, self.status)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.executor = self._new_executor()
+
+    def _new_executor(self):
+        return ProcessPoolExecutor(max_workers=self.workers, initializer=init_worker, initargs=self.initargs)
+
+    def _replace_executor(self, executor):
+        """Пересоздает пул для следующих страниц, если его еще не пересоздал другой поток."""
+        with self.lock:
+            if self.executor is executor:
+                self.executor = self._new_executor()
+
+    def _page_processes(self, script_path):
+        """(PID рабочего процесса, PID chromedriver) страницы; (None, None), если она не начата."""
+        with self.lock:
+            while True:
+                try:
+                    script, pid, service_pid = self.status.get_nowait()
+                except queue.Empty:
+                    break
+                self.pages[script] = (pid, service_pid)
+            return self.pages.get(script_path, (None, None))
+
+    def _stop_page(self, executor, future, script_path):
+        """Прерывает зависшую страницу, не трогая процессы остальных страниц, если это возможно."""
+        if future.cancel():
+            return
+        worker_pid, service_pid = self._page_processes(script_path)
+        if service_pid:
+            kill_process_tree(service_pid)
+            try:
+                future.result(timeout=KILL_GRACE)
+                return
+            except FutureTimeoutError:
+                pass
+            except Exception:
+                return
+        # Страница зависла вне браузера: завершается только ее процесс. Пул после этого
+        # считается сломанным, и страницы, выполнявшиеся в других его процессах,
+        # main.py тоже повторит в отдельном процессе (их браузеры закроет _terminate_worker)
+        self._replace_executor(executor)
+        if worker_pid:
+            kill_process_tree(worker_pid)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def run(self, script_path):
+        script_path = str(script_path)
+        with self.lock:
+            executor = self.executor
+        try:
+            future = executor.submit(run_page, script_path)
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError:
+            self._stop_page(executor, future, script_path)
+            raise
+        except BrokenProcessPool:
+            # Рабочий процесс упал: пул пересоздается для следующих страниц
+            self._replace_executor(executor)
+            raise
+
+    def close(self):
+        self.executor.shutdown()
@@ -0,0 +1,245 @@
+# Декларативное описание страниц: общий парсер и общий рендер Markdown для скриптов DPO_*.py
+#
+# Скрипт страницы задает только SELECTORS и PageSpec со списком блоков. Все селекторы
+# компилируются один раз при импорте и извлекаются одним вызовом snapshot() на страницу.
+#
+# Блок — словарь:
+#   kind     — вид блока:
+#              "paragraphs" — непустые тексты элементов;
+#              "links"      — список "- [текст](ссылка)";
+#              "text"       — текст первого элемента, подставленный в format ("{}" по умолчанию);
+#              "table"      — строки таблицы (см. dpo_table.py), переведенные в текст функцией format;
+#              "flow"       — дочерние элементы контента по порядку: заголовки из headings,
+#                             пункты списков <ul> ("• текст") и остальные элементы как абзацы;
+#              "custom"     — элементы snapshot (словарь {ключ: локатор}), разобранные функцией extract
+#   selector — ключ в SELECTORS (для всех видов, кроме "custom")
+#   label    — подпись для вывода найденных данных в консоль
+#   heading  — строка, выводимая перед содержимым блока (необязательно)
+#   text     — для "links": локатор вложенного элемента с текстом ссылки (необязательно)
+#   text_attr — для "links": атрибут вложенного элемента вместо его текста (например, "alt")
+#   format   — для "text": шаблон строки; для "table": функция строки таблицы -> список строк
+#   table    — для "table": имя таблицы в CSV и JSON рядом с Markdown-файлом (см. save_tables)
+#   headings — для "flow": {тег заголовка: префикс Markdown}, например {"h2": "## "}
+#   snapshot, extract — для "custom": элементы спецификации snapshot() и функция
+#              извлеченные данные страницы -> список строк
+#
+# Ошибка в одном блоке не отменяет остальные: блок пропускается, остальные данные сохраняются.
+from selenium.webdriver.common.by import By
+
+from dpo_driver import DEFAULT_RESOURCE_POLICY, get_driver, wait_ready
+from dpo_extract import compile_spec, first_text, snapshot, texts
+from dpo_table import save_tables, table_item, table_rows
+
+# Заголовок файла по умолчанию: название страницы и ссылка на нее
+DEFAULT_HEADER = ("# {title}", "[Перейти к странице]({url})")
+
+
+class PageSpec:
+    """Страница, описанная селекторами и блоками вместо отдельной parse_page.
+
+    title — ключ заголовка страницы в SELECTORS или None, если у страницы нет
+    отдельного заголовка (тогда header выводится всегда и содержит только {url}).
+    Если заголовок не найден, header не выводится; при title_shown=True
+    заголовком считается первый отображаемый элемент. ready — ключ элемента,
+    готовности которого ждет wait_ready (по умолчанию заголовок); при
+    require_ready=False страница разбирается и без него. prepare(driver)
+    вызывается перед извлечением данных (например, для раскрытия свернутых блоков).
+    """
+
+    def __init__(self, url, output, selectors, blocks, title="main_title", timeout=15,
+                 ready=None, visible=False, require_ready=True, header=DEFAULT_HEADER,
+                 title_shown=False, separator="\n\n", prepare=None,
+                 resource_policy=DEFAULT_RESOURCE_POLICY):
+        self.url = url
+        self.output = output
+        self.selectors = selectors
+        self.blocks = blocks
+        self.title = title
+        self.timeout = timeout
+        self.ready = ready or title
+        self.visible = visible
+        self.require_ready = require_ready
+        self.header = header
+        self.title_shown = title_shown
+        self.separator = separator
+        self.prepare = prepare
+        self.resource_policy = resource_policy
+        self.compiled = {key: item for part in self._snapshot_parts() for key, item in compile_spec(part).items()}
+
+    def _snapshot_parts(self):
+        parts = []
+        if self.title:
+            parts.append({self.title: self.selectors[self.title]})
+        for block in self.blocks:
+            if block["kind"] == "custom":
+                parts.append(block["snapshot"])
+                continue
+            locator = self.selectors[block["selector"]]
+            if block["kind"] == "table":
+                locator = table_item(locator)
+            elif block["kind"] == "flow":
+                locator = {"locator": locator, "fields": {"items": (By.TAG_NAME, "li")}}
+            elif block["kind"] == "links":
+                locator = {"locator": locator, "attrs": ["href"]}
+                if block.get("text"):
+                    label = {"locator": block["text"]}
+                    if block.get("text_attr"):
+                        label["attrs"] = [block["text_attr"]]
+                    locator["fields"] = {"text": label}
+            parts.append({block["selector"]: locator})
+        return parts
+
+    def _snapshot(self, driver):
+        """Данные страницы одним запросом; если он не удался — по одному запросу на селектор.
+
+        Селектор, который не удалось извлечь и по отдельности, дает пустой список:
+        блоки, которые от него зависят, пропускаются, остальные сохраняются.
+        """
+        try:
+            return snapshot(driver, compiled=self.compiled)
+        except Exception as e:
+            print(f"Ошибка при извлечении данных страницы: {str(e)}")
+        page = {}
+        for key, item in self.compiled.items():
+            try:
+                page.update(snapshot(driver, compiled={key: item}))
+            except Exception as e:
+                print(f"Ошибка при извлечении данных '{key}': {str(e)}")
+                page[key] = []
+        return page
+
+    def parse(self, driver, url):
+        """Возвращает список (блок, данные) в порядке вывода и таблицы страницы {имя: строки}."""
+        driver.get(url)
+        if self.ready:
+            try:
+                wait_ready(driver, self.selectors[self.ready], timeout=self.timeout, visible=self.visible)
+            except Exception as e:
+                print(f"Ошибка загрузки страницы: {str(e)}")
+                if self.require_ready:
+                    return [], {}
+
+        if self.prepare:
+            try:
+                self.prepare(driver)
+            except Exception as e:
+                print(f"Ошибка при подготовке страницы: {str(e)}")
+
+        page = self._snapshot(driver)
+        result = []
+        tables = {}
+
+        if self.title:
+            nodes = page[self.title]
+            if self.title_shown:
+                nodes = [node for node in nodes if node["shown"]]
+            main_title = first_text(nodes)
+            if main_title is not None:
+                result.append(({"kind": "title"}, main_title))
+                print(f"Основной заголовок: {main_title}")
+        else:
+            result.append(({"kind": "title"}, None))
+
+        for block in self.blocks:
+            try:
+                items = self._extract(page, block, tables)
+            except Exception as e:
+                print(f"Ошибка при парсинге блока '{block['label']}': {str(e)}")
+                continue
+            if items:
+                result.append((block, items))
+                print(f"{block['label']}: {items}")
+        return result, tables
+
+    def _extract(self, page, block, tables):
+        kind = block["kind"]
+        if kind == "custom":
+            return block["extract"](page)
+        nodes = page[block["selector"]]
+        if kind == "paragraphs":
+            return texts(nodes)
+        if kind == "links":
+            return [f"- {link}" for link in self._links(nodes, block)]
+        if kind == "text":
+            text = first_text(nodes)
+            return [] if text is None else [block.get("format", "{}").format(text)]
+        if kind == "table":
+            rows = table_rows(nodes)
+            tables[block["table"]] = rows
+            return block["format"](rows)
+        if kind == "flow":
+            return self._flow(nodes, block["headings"])
+        raise ValueError(f"Неизвестный вид блока: {kind}")
+
+    @staticmethod
+    def _flow(nodes, headings):
+        items = []
+        for node in nodes:
+            text = node["text"].strip()
+            if not text:
+                continue
+            if node["tag"] in headings:
+                items.append(f"{headings[node['tag']]}{text}")
+            elif node["tag"] == "ul":
+                for li in node["fields"]["items"]:
+                    li_text = li["text"].strip().rstrip(";")
+                    if li_text:
+                        items.append(f"• {li_text}")
+            else:
+                items.append(text)
+        return items
+
+    @staticmethod
+    def _links(nodes, block):
+        links = []
+        for node in nodes:
+            if block.get("text"):
+                labels = node["fields"]["text"]
+                if not labels:
+                    continue
+                if block.get("text_attr"):
+                    text = labels[0]["attrs"][block["text_attr"]] or ""
+                else:
+                    text = labels[0]["text"].strip()
+            else:
+                text = node["text"].strip()
+            links.append(f"[{text}]({node['attrs']['href']})")
+        return links
+
+    def render(self, data, url):
+        """Формирует Markdown: заголовок, ссылка на страницу и блоки."""
+        content = []
+        for block, items in data:
+            if block["kind"] == "title":
+                content.extend(line.format(title=items, url=url) for line in self.header)
+                continue
+            if block.get("heading"):
+                content.append(block["heading"])
+            content.extend(items)
+        return self.separator.join(line for line in content if line.strip())
+
+    def save(self, data, url, tables=None):
+        if tables:
+            # Таблицы целиком сохраняются в CSV и JSON рядом с Markdown
+            save_tables(self.output, tables)
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write(self.render(data, url))
+        print(f"Контент записан в файл: {self.output}")
+        return self.output
+
+    def run(self, driver, url=None):
+        """Единая точка входа для main.py: парсинг страницы и сохранение в Markdown-файл."""
+        url = url or self.url
+        data, tables = self.parse(driver, url)
+        return self.save(data, url, tables)
+
+    def main(self):
+        """Запуск скрипта страницы из командной строки."""
+        driver = get_driver(self.resource_policy)
+        try:
+            output_file = self.run(driver)
+            print(f"Файл {output_file} успешно сохранен!")
+        except Exception as e:
+            print(f"Ошибка при парсинге: {str(e)}")
+        finally:
+            driver.quit()
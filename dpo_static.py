@@ -0,0 +1,248 @@
+# Статический режим: загрузка страницы обычным HTTP-запросом и разбор HTML через lxml
+#
+# StaticDriver повторяет ту часть интерфейса WebDriver, которой пользуются скрипты страниц
+# (get, find_element(s), .text, get_attribute, tag_name, is_displayed), поэтому parse_page
+# работает с ним без изменений. Селекторы SELECTORS (CSS и XPath) компилируются один раз.
+# Страницы, которым нужен JavaScript или клики (NEEDS_BROWSER = True), обрабатываются браузером.
+import re
+from functools import lru_cache
+from urllib.parse import urljoin
+
+import requests
+from cssselect import HTMLTranslator
+from lxml import etree, html
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+from dpo_driver import rebase_url
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36"
+
+# Элементы, которые в браузере начинают новую строку текста
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt", "fieldset",
+    "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header",
+    "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tbody", "tfoot",
+    "thead", "tr", "ul",
+}
+# Элементы, текст которых браузер не показывает
+SKIP_TAGS = {"script", "style", "noscript", "template", "head", "title", "meta", "link"}
+HIDDEN_STYLE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+# Служебный символ границы блока при сборке текста
+BLOCK_BREAK = "\x00"
+
+
+class ElementNotInStaticPage(WebDriverException):
+    """Элемент не найден в статическом HTML.
+
+    Не наследуется от NoSuchElementException, поэтому WebDriverWait не ждет его
+    появления: статическая страница уже не изменится.
+    """
+
+
+@lru_cache(maxsize=None)
+def compile_locator(by, value, relative):
+    """Компилирует локатор (By, значение) в XPath-выражение lxml. Результат кэшируется."""
+    if by == By.XPATH:
+        return etree.XPath(value)
+    if by == By.CSS_SELECTOR:
+        css = value
+    elif by == By.TAG_NAME:
+        css = value
+    elif by == By.CLASS_NAME:
+        css = "." + value
+    elif by == By.ID:
+        css = "#" + value
+    elif by == By.NAME:
+        css = f'[name="{value}"]'
+    else:
+        raise WebDriverException(f"Локатор {by} не поддерживается в статическом режиме")
+    prefix = "descendant::" if relative else "descendant-or-self::"
+    return etree.XPath(HTMLTranslator().css_to_xpath(css, prefix=prefix))
+
+
+def find_nodes(context, by, value, relative):
+    """Элементы, найденные локатором относительно context, в порядке документа."""
+    found = compile_locator(by, value, relative)(context)
+    if not isinstance(found, list):
+        return []
+    return [node for node in found if isinstance(node, etree._Element) and isinstance(node.tag, str)]
+
+
+def is_hidden(node):
+    """Скрыт ли элемент атрибутом hidden или inline-стилем (свой или у предков)."""
+    while node is not None:
+        if isinstance(node.tag, str):
+            if node.tag.lower() in SKIP_TAGS or node.get("hidden") is not None:
+                return True
+            if HIDDEN_STYLE.search(node.get("style", "")):
+                return True
+        node = node.getparent()
+    return False
+
+
+def _collect_text(node, chunks):
+    tag = node.tag.lower() if isinstance(node.tag, str) else None
+    if tag is None or tag in SKIP_TAGS:
+        return
+    if node.get("hidden") is not None or HIDDEN_STYLE.search(node.get("style", "")):
+        return
+    if tag == "br":
+        chunks.append("\n")
+        return
+    block = tag in BLOCK_TAGS
+    if tag in ("td", "th") and node.getprevious() is not None:
+        # Ячейки строки таблицы разделяются табуляцией, как в innerText
+        chunks.append("\t")
+    if block:
+        chunks.append(BLOCK_BREAK)
+    if node.text:
+        chunks.append(re.sub(r"[ \t\r\n\f]+", " ", node.text))
+    for child in node:
+        _collect_text(child, chunks)
+        if child.tail:
+            chunks.append(re.sub(r"[ \t\r\n\f]+", " ", child.tail))
+    if block:
+        chunks.append(BLOCK_BREAK)
+
+
+def inner_text(node):
+    """Приближение innerText: пробелы схлопываются, <br> и блочные элементы дают перевод строки."""
+    chunks = []
+    _collect_text(node, chunks)
+    text = "".join(chunks)
+    text = re.sub(r" *\x00[\x00 ]*", BLOCK_BREAK, text)
+    text = re.sub(r" *\n *", "\n", text)
+    text = re.sub(r"\n?\x00\n?", "\n", text)
+    return text.strip(" \n")
+
+
+def visible_text(node):
+    """Аналог WebElement.text: пусто для скрытых элементов, &nbsp; заменяется пробелом."""
+    if is_hidden(node):
+        return ""
+    return inner_text(node).replace("\u00a0", " ")
+
+
+class StaticElement:
+    """Элемент статической страницы с интерфейсом WebElement."""
+
+    def __init__(self, node, driver):
+        self.node = node
+        self.driver = driver
+
+    @property
+    def tag_name(self):
+        return self.node.tag.lower()
+
+    @property
+    def text(self):
+        return visible_text(self.node)
+
+    def get_attribute(self, name):
+        if name == "innerText":
+            return inner_text(self.node)
+        if name == "textContent":
+            return self.node.text_content()
+        if name == "outerHTML":
+            return html.tostring(self.node, encoding="unicode", with_tail=False)
+        if name == "innerHTML":
+            inner = [html.tostring(child, encoding="unicode") for child in self.node]
+            return (self.node.text or "") + "".join(inner)
+        value = self.node.get(name)
+        if value is not None and name in ("href", "src"):
+            # Как и браузер, возвращаем абсолютный адрес
+            return urljoin(self.driver.current_url or "", value)
+        return value
+
+    def is_displayed(self):
+        return not is_hidden(self.node)
+
+    def is_enabled(self):
+        return self.node.get("disabled") is None
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise ElementNotInStaticPage(f"Элемент не найден: {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return [StaticElement(node, self.driver) for node in find_nodes(self.node, by, value, True)]
+
+
+class StaticDriver:
+    """Замена WebDriver для страниц, не требующих JavaScript."""
+
+    is_static = True
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        self.current_url = None
+        self.page_source = ""
+        self.tree = None
+        # wait_ready() не нашел элемент готовности: страница строится JavaScript (см. run_page)
+        self.not_ready = False
+
+    def get(self, url):
+        response = self.session.get(rebase_url(url), timeout=self.timeout)
+        response.raise_for_status()
+        # Без charset в заголовке requests предполагает ISO-8859-1, а сайт отдает UTF-8
+        content_type = response.headers.get("Content-Type", "").lower()
+        encoding = response.encoding if "charset" in content_type else "utf-8"
+        self.load_html(response.content, response.url, encoding)
+
+    def load_html(self, source, url, encoding="utf-8"):
+        """Загружает готовый HTML (например, из архива) как текущую страницу."""
+        if isinstance(source, bytes):
+            source = source.decode(encoding, errors="replace")
+        self.tree = html.document_fromstring(source, base_url=url)
+        self.page_source = source
+        self.current_url = url
+        self.not_ready = False
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise ElementNotInStaticPage(f"Элемент не найден: {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        return [StaticElement(node, self) for node in find_nodes(self.tree, by, value, False)]
+
+    def snapshot(self, spec):
+        """Реализация dpo_extract.snapshot() для статической страницы."""
+        result = {}
+        for key, item in spec.items():
+            try:
+                result[key] = [self._describe(node, item) for node in find_nodes(self.tree, item["by"], item["value"], False)]
+            except Exception:
+                result[key] = []
+        return result
+
+    def _describe(self, node, item):
+        element = StaticElement(node, self)
+        shown = element.is_displayed()
+        described = {
+            "tag": element.tag_name,
+            "text": element.text if shown else "",
+            "innerText": inner_text(node),
+            "shown": shown,
+            "attrs": {name: element.get_attribute(name) for name in item.get("attrs", [])},
+        }
+        if item.get("fields"):
+            described["fields"] = {
+                key: [self._describe(child, sub) for child in find_nodes(node, sub["by"], sub["value"], True)]
+                for key, sub in item["fields"].items()
+            }
+        return described
+
+    def execute_script(self, script, *args):
+        raise WebDriverException("JavaScript недоступен в статическом режиме")
+
+    def quit(self):
+        self.session.close()
+
+    close = quit
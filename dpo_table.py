@@ -0,0 +1,143 @@
+# Извлечение таблиц целиком: строки, ячейки, ссылки и объединения ячеек одним вызовом snapshot()
+#
+# Строка таблицы — список ячеек, ячейка — словарь:
+#   tag        — "td" или "th"
+#   text       — видимый текст ячейки
+#   paragraphs — тексты всех <p> ячейки (как cell.find_elements(By.CSS_SELECTOR, "p"))
+#   links      — ссылки ячейки: [{"text": ..., "url": ...}]
+#   rowspan, colspan — объединение ячеек (1, если атрибута нет)
+#
+# table_grid() разворачивает rowspan/colspan в прямоугольную таблицу текстов,
+# save_tables() сохраняет таблицы страницы в CSV и JSON рядом с Markdown-файлом.
+import csv
+import json
+from pathlib import Path
+
+from selenium.webdriver.common.by import By
+
+from dpo_extract import snapshot
+
+# Ячейки строки в порядке документа
+CELLS = (By.XPATH, "./td|./th")
+
+
+def table_item(rows_locator, cells=CELLS):
+    """Элемент спецификации snapshot() для строк таблицы; разбирается table_rows()."""
+    return {
+        "locator": rows_locator,
+        "fields": {
+            "cells": {
+                "locator": cells,
+                "attrs": ["rowspan", "colspan"],
+                "fields": {
+                    "paragraphs": (By.CSS_SELECTOR, "p"),
+                    "links": {"locator": (By.CSS_SELECTOR, "a"), "attrs": ["href"]},
+                },
+            },
+        },
+    }
+
+
+def _span(value):
+    try:
+        return max(1, int(value))
+    except (TypeError, ValueError):
+        return 1
+
+
+def table_rows(nodes):
+    """Переводит строки из результата snapshot() в список строк с ячейками."""
+    rows = []
+    for row in nodes:
+        cells = []
+        for cell in row["fields"]["cells"]:
+            cells.append({
+                "tag": cell["tag"],
+                "text": cell["text"].strip(),
+                "paragraphs": [p["text"].strip() for p in cell["fields"]["paragraphs"]],
+                "links": [
+                    {"text": link["text"].strip(), "url": link["attrs"]["href"]}
+                    for link in cell["fields"]["links"]
+                ],
+                "rowspan": _span(cell["attrs"]["rowspan"]),
+                "colspan": _span(cell["attrs"]["colspan"]),
+            })
+        rows.append(cells)
+    return rows
+
+
+def extract_table(driver, rows_locator, cells=CELLS):
+    """Возвращает все строки таблицы за один запрос к браузеру."""
+    page = snapshot(driver, {"rows": table_item(rows_locator, cells)})
+    return table_rows(page["rows"])
+
+
+def first_paragraph(cell):
+    """Текст первого <p> ячейки (как cell.find_element(By.CSS_SELECTOR, "p").text), иначе текст ячейки."""
+    return cell["paragraphs"][0] if cell["paragraphs"] else cell["text"]
+
+
+def paragraphs_text(cell):
+    """Непустые тексты всех <p> ячейки через перевод строки."""
+    return "\n".join(text for text in cell["paragraphs"] if text)
+
+
+def table_grid(rows):
+    """Прямоугольная таблица текстов: объединенные ячейки повторяются в каждой позиции."""
+    grid = []
+    # Колонка -> [сколько строк еще занимает ячейка сверху, ее текст]
+    carried = {}
+    for cells in rows:
+        line = []
+        queue = list(cells)
+        col = 0
+        while queue or any(c >= col for c in carried):
+            if col in carried:
+                carried[col][0] -= 1
+                line.append(carried[col][1])
+                if carried[col][0] == 0:
+                    del carried[col]
+                col += 1
+                continue
+            if not queue:
+                line.append("")
+                col += 1
+                continue
+            cell = queue.pop(0)
+            for _ in range(cell["colspan"]):
+                if cell["rowspan"] > 1:
+                    carried[col] = [cell["rowspan"] - 1, cell["text"]]
+                line.append(cell["text"])
+                col += 1
+        grid.append(line)
+    width = max((len(line) for line in grid), default=0)
+    return [line + [""] * (width - len(line)) for line in grid]
+
+
+def save_tables(filename, tables):
+    """Сохраняет таблицы страницы рядом с Markdown-файлом filename.
+
+    tables — {имя: строки table_rows()}. Все таблицы записываются в <имя файла>.json
+    (исходные ячейки и развернутая таблица), каждая таблица — в свой CSV:
+    <имя файла>.csv, если таблица одна, иначе <имя файла>_<имя таблицы>.csv.
+    Возвращает список созданных файлов.
+    """
+    tables = {name: rows for name, rows in tables.items() if rows}
+    if not tables:
+        return []
+    stem = Path(filename).with_suffix("")
+    json_path = f"{stem}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {name: {"rows": rows, "grid": table_grid(rows)} for name, rows in tables.items()},
+            f, ensure_ascii=False, indent=2,
+        )
+    saved = [json_path]
+    for name, rows in tables.items():
+        csv_path = f"{stem}.csv" if len(tables) == 1 else f"{stem}_{name}.csv"
+        # utf-8-sig: Excel открывает кириллицу без ручного выбора кодировки
+        with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+            csv.writer(f).writerows(table_grid(rows))
+        saved.append(csv_path)
+    print(f"Таблицы записаны в файлы: {', '.join(saved)}")
+    return saved
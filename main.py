@@ -1,17 +1,35 @@
 import os
+import argparse
 import subprocess
-import glob
 import datetime
+import hashlib
+import json
+import shutil
+import tempfile
 import sys
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dpo_archive import RUN_ID_ENV
+from dpo_driver import SharedChrome, SHARED_CHROME_ENV, OFFLINE_ENV, BLOCK_RESOURCES_ENV, BASE_DIR_ENV, PYTHON_ENV, chromedriver_path
+from dpo_json import load_json, save_json
+from dpo_ingest import ingest_documents, render_documents
+from dpo_mirror import mirror_dir, mirror_documents
+from dpo_recrawl import RecrawlState
+from dpo_runner import PageRunner, has_output
 
 # Настройка кодировки консоли на UTF-8
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
+# Каталог с результатами (DPO_BASE_DIR задает другой, например при замерах dpo_bench.py)
+BASE_DIR = Path(os.environ.get(BASE_DIR_ENV) or r"D:\python_work\dpo\dpo")
+# Скрипты страниц лежат рядом с main.py
+SCRIPTS_DIR = Path(__file__).resolve().parent
+
 # Настройка логирования
-LOG_FILE = Path(r"D:\python_work\dpo\dpo") / f"parser_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+LOG_FILE = BASE_DIR / f"parser_log_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s: %(message)s',
@@ -21,7 +39,6 @@ logging.basicConfig(
     ]
 )
 
-BASE_DIR = Path(r"D:\python_work\dpo\dpo")
 SCRIPTS = [
     "DPO_aktsii.py",
     "DPO_dokument-company.py",
@@ -59,122 +76,409 @@ SCRIPTS = [
 ]
 TIMESTAMP = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
 OUTPUT_FILE = BASE_DIR / f"Раздел_1_{TIMESTAMP}.md"
+# Манифест запуска: Markdown-файлы, созданные скриптами в этом запуске (по нему собирается отчет)
+RUN_MANIFEST = BASE_DIR / "run_manifest.json"
+# Размер блока при копировании файлов в итоговый отчет (символов)
+COPY_CHUNK = 64 * 1024
+# Хранилище сборки отчета: хэши разделов, готовые фрагменты и хэш последнего отчета
+AGGREGATE_DIR = BASE_DIR / ".aggregate"
+AGGREGATE_INDEX = AGGREGATE_DIR / "index.json"
 
 
-def run_scripts():
-    """Запускает все скрипты из списка и проверяет создание Markdown-файлов."""
-    successful_scripts = []
-    missing_files = []
+def resolve_script(script, available_scripts, messages):
+    """Возвращает путь к скрипту с учетом регистра имени или None, если скрипта нет."""
+    script_path = SCRIPTS_DIR / script
+    if script_path.exists():
+        return script_path
+    # Проверяем с учетом регистра
+    script_lower = script.lower()
+    if script_lower in available_scripts:
+        messages.append((logging.WARNING, f"Скрипт {script} не найден, но найден {available_scripts[script_lower]}. Исправьте регистр в SCRIPTS."))
+        return available_scripts[script_lower]
+    messages.append((logging.ERROR, f"Скрипт {script} не найден в {SCRIPTS_DIR}"))
+    return None
 
-    # Проверка пути к Python из виртуального окружения
-    python_exe = BASE_DIR.parent / "venv" / "Scripts" / "python.exe"
-    if not python_exe.exists():
-        logging.error(f"Python из виртуального окружения не найден: {python_exe}")
-        return successful_scripts, missing_files
 
-    # Проверка существующих файлов
-    available_scripts = {f.name.lower(): f for f in BASE_DIR.glob("*.py")}
-    logging.info(f"Найдено Python-скриптов в {BASE_DIR}: {len(available_scripts)}")
-
-    for script in SCRIPTS:
-        script_path = BASE_DIR / script
-        expected_md = BASE_DIR / script.replace(".py", ".md")
-
-        # Проверка наличия скрипта
-        if not script_path.exists():
-            # Проверяем с учетом регистра
-            script_lower = script.lower()
-            if script_lower in available_scripts:
-                logging.warning(f"Скрипт {script} не найден, но найден {available_scripts[script_lower]}. Исправьте регистр в SCRIPTS.")
-                script_path = available_scripts[script_lower]
-            else:
-                logging.error(f"Скрипт {script} не найден в {BASE_DIR}")
-                missing_files.append(expected_md)
-                continue
+def run_script(script, python_exe, available_scripts, shared_chrome=None):
+    """Запускает один скрипт и возвращает результат вместе с накопленными сообщениями лога.
 
-        logging.info(f"Запуск скрипта: {script}")
-        try:
+    Сообщения не пишутся в лог сразу, чтобы при параллельном запуске
+    они выводились в порядке SCRIPTS, а не в порядке завершения скриптов.
+    """
+    messages = []
+    expected_md = BASE_DIR / script.replace(".py", ".md")
+
+    # Проверка наличия скрипта
+    script_path = resolve_script(script, available_scripts, messages)
+    if script_path is None:
+        return script, expected_md, False, messages
+
+    messages.append((logging.INFO, f"Запуск скрипта: {script}"))
+    try:
+        with ExitStack() as stack:
+            env = None
+            if shared_chrome:
+                # Скрипт подключается к общему браузеру через get_driver()
+                address = stack.enter_context(shared_chrome.page())
+                env = {**os.environ, SHARED_CHROME_ENV: address}
             result = subprocess.run(
                 [str(python_exe), str(script_path)],
                 capture_output=True,
                 text=True,
                 timeout=300,
+                # Скрипты пишут Markdown-файлы в текущий каталог
+                cwd=BASE_DIR,
                 encoding='utf-8',
                 errors='replace',
+                env=env,
             )
-            if result.returncode == 0:
-                logging.info(f"Скрипт {script} успешно выполнен")
+        if result.returncode == 0:
+            messages.append((logging.INFO, f"Скрипт {script} успешно выполнен"))
+            if has_output(expected_md):
+                messages.append((logging.INFO, f"Создан файл: {expected_md}"))
+                return script, expected_md, True, messages
+            messages.append((logging.ERROR, f"Файл {expected_md} не создан или пуст"))
+            return script, expected_md, None, messages
+        messages.append((logging.ERROR, f"Ошибка при выполнении {script}: {result.stderr}"))
+    except subprocess.TimeoutExpired:
+        messages.append((logging.ERROR, f"Скрипт {script} превысил время выполнения (5 минут)"))
+    except Exception as e:
+        messages.append((logging.ERROR, f"Исключение при выполнении {script}: {str(e)}"))
+    return script, expected_md, False, messages
+
+
+def run_script_inprocess(script, runner, python_exe, available_scripts):
+    """Выполняет run(driver) скрипта через PageRunner без запуска нового интерпретатора.
+
+    Если скрипт упал, превысил время (его браузер или рабочий процесс завершается) или уронил
+    рабочий процесс, он перезапускается в отдельном процессе.
+    """
+    messages = []
+    expected_md = BASE_DIR / script.replace(".py", ".md")
+
+    script_path = resolve_script(script, available_scripts, messages)
+    if script_path is None:
+        return script, expected_md, False, messages
+
+    messages.append((logging.INFO, f"Запуск скрипта в процессе: {script}"))
+    try:
+        ok, _, error = runner.run(script_path)
+    except Exception as e:
+        ok, error = False, f"{type(e).__name__}: {str(e)}"
+    if ok:
+        messages.append((logging.INFO, f"Скрипт {script} успешно выполнен"))
+        if has_output(expected_md):
+            messages.append((logging.INFO, f"Создан файл: {expected_md}"))
+            return script, expected_md, True, messages
+        messages.append((logging.ERROR, f"Файл {expected_md} не создан или пуст"))
+        return script, expected_md, None, messages
+
+    # Изоляция сбоев: повторный запуск в отдельном процессе
+    messages.append((logging.WARNING, f"Ошибка при выполнении {script} в процессе, запуск в отдельном процессе: {error}"))
+    _, _, status, fallback_messages = run_script(script, python_exe, available_scripts)
+    return script, expected_md, status, messages + fallback_messages
+
+
+def run_scripts(jobs=1, shared_chrome=None, mode="subprocess", recycle_after=10, static=False, recrawl=None):
+    """Запускает все скрипты из списка и проверяет создание Markdown-файлов.
+
+    Возвращает (выполненные скрипты, созданные Markdown-файлы, не созданные файлы).
+
+    При jobs > 1 скрипты выполняются параллельно, не более jobs процессов одновременно.
+    Если передан shared_chrome, скрипты подключаются к общему браузеру вместо запуска своего.
+    В режиме "inprocess" скрипты импортируются один раз и выполняются через PageRunner,
+    при static=True страницы без JavaScript разбираются без браузера.
+    Если передан recrawl (RecrawlState), скрипты неизмененных страниц не запускаются,
+    а в отчет идет их Markdown-файл прошлого запуска.
+    """
+    successful_scripts = []
+    produced_files = []
+    missing_files = []
+
+    # Проверка пути к Python из виртуального окружения
+    python_exe = Path(os.environ.get(PYTHON_ENV) or SCRIPTS_DIR.parent / "venv" / "Scripts" / "python.exe")
+    if not python_exe.exists():
+        logging.error(f"Python из виртуального окружения не найден: {python_exe}")
+        return successful_scripts, produced_files, missing_files
+
+    # Проверка существующих файлов
+    available_scripts = {f.name.lower(): f for f in SCRIPTS_DIR.glob("*.py")}
+    logging.info(f"Найдено Python-скриптов в {SCRIPTS_DIR}: {len(available_scripts)}")
+
+    probes, unchanged = {}, {}
+    if recrawl:
+        scripts = [(s, resolve_script(s, available_scripts, []), BASE_DIR / s.replace(".py", ".md")) for s in SCRIPTS]
+        probes, unchanged = recrawl.check([item for item in scripts if item[1]])
+        logging.info(f"Неизмененных страниц: {len(unchanged)} из {len(SCRIPTS)}, их скрипты не запускаются")
+    scripts_to_run = [s for s in SCRIPTS if s not in unchanged]
+
+    runner = None
+    if mode == "inprocess" and scripts_to_run:
+        script_paths = [p for p in (resolve_script(s, available_scripts, []) for s in scripts_to_run) if p]
+        runner = PageRunner(BASE_DIR, script_paths, workers=jobs, recycle_after=recycle_after, static=static)
+        logging.info(f"Скрипты выполняются в процессе, рабочих процессов: {jobs}")
+        if static:
+            logging.info("Статический режим: браузер используется только для страниц с NEEDS_BROWSER")
+
+    def run(script):
+        if script in unchanged:
+            return script, unchanged[script], True, [
+                (logging.INFO, f"Страница {script} не изменилась, используется прежний файл: {unchanged[script]}")]
+        if runner:
+            return run_script_inprocess(script, runner, python_exe, available_scripts)
+        return run_script(script, python_exe, available_scripts, shared_chrome)
+
+    if jobs > 1:
+        logging.info(f"Параллельный запуск скриптов: {jobs} процессов")
+        executor = ThreadPoolExecutor(max_workers=jobs)
+        results = executor.map(run, SCRIPTS)
+    else:
+        executor = None
+        results = map(run, SCRIPTS)
+
+    try:
+        # Результаты обрабатываются в порядке SCRIPTS
+        for script, expected_md, status, messages in results:
+            for level, message in messages:
+                logging.log(level, message)
+            # status: True — файл создан, None — скрипт выполнен без файла, False — ошибка
+            if status is not False:
                 successful_scripts.append(script)
-                if expected_md.exists():
-                    logging.info(f"Создан файл: {expected_md}")
-                else:
-                    logging.error(f"Файл {expected_md} не создан")
-                    missing_files.append(expected_md)
+            if status:
+                produced_files.append(expected_md)
+                if script in probes and script not in unchanged:
+                    recrawl.record(script, expected_md, probes[script])
             else:
-                logging.error(f"Ошибка при выполнении {script}: {result.stderr}")
                 missing_files.append(expected_md)
-        except subprocess.TimeoutExpired:
-            logging.error(f"Скрипт {script} превысил время выполнения (5 минут)")
-            missing_files.append(expected_md)
-        except Exception as e:
-            logging.error(f"Исключение при выполнении {script}: {str(e)}")
-            missing_files.append(expected_md)
+                if recrawl:
+                    # Прежний файл страницы мог быть испорчен неудачным запуском
+                    recrawl.forget(script)
+    finally:
+        if executor:
+            executor.shutdown()
+        if runner:
+            runner.close()
+        if recrawl:
+            recrawl.save()
+
+    return successful_scripts, produced_files, missing_files
+
+
+def run_manifest(produced_files, missing_files):
+    """Манифест запуска: какие Markdown-файлы созданы скриптами, а какие нет."""
+    return {
+        "timestamp": TIMESTAMP,
+        "files": [f.name for f in produced_files],
+        "missing": [f.name for f in missing_files],
+    }
+
+
+def write_run_manifest(manifest, output_file, regenerated):
+    """Дополняет манифест отчетом, который вернул combine_markdown_files(), и записывает его.
+
+    output — файл отчета этого запуска: новый или отчет прошлого запуска, если он
+    не изменился; regenerated — был ли отчет записан заново.
+    """
+    manifest = {**manifest, "output": output_file.name, "regenerated": regenerated}
+    save_json(RUN_MANIFEST, manifest)
+    logging.info(f"Манифест запуска записан: {RUN_MANIFEST}")
+    return manifest
+
+
+def _section_hash(md_file, page_documents):
+    """SHA-256 исходных данных раздела: Markdown-файл страницы и текст ее документов."""
+    sha = hashlib.sha256()
+    with open(md_file, "rb") as f:
+        for chunk in iter(lambda: f.read(COPY_CHUNK), b""):
+            sha.update(chunk)
+    sha.update(json.dumps(page_documents or [], ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return sha.hexdigest()
 
-    return successful_scripts, missing_files
 
+def _render_section(md_file, page_documents, fragment_path):
+    """Записывает раздел отчета для одной страницы во фрагмент (через временный файл)."""
+    fragment_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=fragment_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as outfile, open(md_file, "r", encoding="utf-8") as infile:
+            outfile.write(f"## Данные из файла: {md_file.name}\n\n")
+            shutil.copyfileobj(infile, outfile, COPY_CHUNK)
+            if page_documents:
+                outfile.write("\n\n")
+                outfile.write(render_documents(page_documents))
+            outfile.write("\n\n---\n\n")
+        os.replace(tmp_path, fragment_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
 
-def combine_markdown_files(missing_files):
-    """Объединяет все Markdown-файлы в один и записывает информацию о пропущенных файлах."""
-    markdown_files = list(BASE_DIR.glob("*.md"))
-    logging.info(f"Найдено Markdown-файлов: {len(markdown_files)}")
+
+def combine_markdown_files(manifest, documents=None):
+    """Объединяет Markdown-файлы из манифеста запуска в один и записывает информацию о пропущенных файлах.
+
+    В отчет попадают только файлы, созданные скриптами в этом запуске, поэтому
+    отчеты прошлых запусков (Раздел_1_*.md) в него не включаются. documents —
+    результат ingest_documents(): текст документов добавляется под страницей,
+    на которой найдена ссылка.
+
+    Раздел каждой страницы хранится готовым фрагментом в AGGREGATE_DIR вместе с хэшем
+    исходных данных; заново формируются только изменившиеся разделы. Если отчет
+    (без строки с датой) совпадает с прошлым, новый файл не записывается.
+    Возвращает (путь к актуальному отчету, записан ли он заново).
+    """
+    documents = documents or {}
+    markdown_files = [BASE_DIR / name for name in manifest["files"]]
+    missing_files = [BASE_DIR / name for name in manifest["missing"]]
+    logging.info(f"Markdown-файлов в манифесте: {len(markdown_files)}")
     logging.info(f"Список файлов: {[str(f) for f in markdown_files]}")
 
+    if not markdown_files:
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as outfile:
+            outfile.write("# Раздел 1\n\n")
+            outfile.write(f"Дата создания: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            outfile.write("Ошибка: Markdown-файлы не найдены.\n")
+        logging.error("Markdown-файлы не найдены")
+        return OUTPUT_FILE, True
+
+    index = load_json(AGGREGATE_INDEX)
+    sections = index.setdefault("sections", {})
+    # Части отчета: путь к фрагменту раздела или готовый текст
+    parts = []
+    added_files = []
+    for md_file in sorted(markdown_files):
+        page_documents = documents.get(md_file.name)
+        fragment = AGGREGATE_DIR / "fragments" / md_file.name
+        try:
+            digest = _section_hash(md_file, page_documents)
+            if sections.get(md_file.name, {}).get("sha256") == digest and fragment.exists():
+                logging.info(f"Раздел {md_file.name} не изменился, используется сохраненный фрагмент")
+            else:
+                _render_section(md_file, page_documents, fragment)
+                sections[md_file.name] = {"sha256": digest}
+                logging.info(f"Раздел {md_file.name} сформирован заново")
+            parts.append((fragment, digest))
+            logging.info(f"Файл {md_file} добавлен в итоговый отчет")
+            added_files.append(md_file)
+        except Exception as e:
+            logging.error(f"Ошибка при обработке {md_file}: {str(e)}")
+            parts.append((None, f"## Ошибка: файл {md_file.name} не добавлен\n\nПричина: {str(e)}\n\n---\n\n"))
+
+    if missing_files:
+        lines = ["## Пропущенные или не созданные файлы\n\n"]
+        for missing_file in missing_files:
+            if missing_file not in added_files:
+                lines.append(f"- {missing_file.name}: не создан или не добавлен\n")
+                logging.error(f"Файл {missing_file} не был создан или добавлен")
+        expected_mds = [script.replace(".py", ".md") for script in SCRIPTS]
+        for md_file in BASE_DIR.glob("*.md"):
+            # Прошлые отчеты не считаются посторонними файлами
+            if md_file.name not in expected_mds and not md_file.name.startswith("Раздел_1_"):
+                lines.append(f"- {md_file.name}: найден, но не ожидался\n")
+                logging.warning(f"Файл {md_file} найден, но не ожидался")
+        parts.append((None, "".join(lines)))
+
+    # Содержимое фрагмента однозначно задается хэшем его исходных данных,
+    # поэтому хэш отчета считается без чтения фрагментов
+    output_sha = hashlib.sha256()
+    for fragment, value in parts:
+        output_sha.update(f"{fragment.name if fragment else ''}\0{value}\0".encode("utf-8"))
+    output_sha = output_sha.hexdigest()
+    previous = index.get("output", {})
+    if previous.get("sha256") == output_sha and (BASE_DIR / previous.get("file", "")).is_file():
+        logging.info(f"Отчет не изменился с прошлого запуска, новый файл не записывается: {previous['file']}")
+        return BASE_DIR / previous["file"], False
+
     with open(OUTPUT_FILE, "w", encoding="utf-8") as outfile:
         outfile.write("# Раздел 1\n\n")
         outfile.write(f"Дата создания: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+        for fragment, value in parts:
+            if fragment is None:
+                outfile.write(value)
+                continue
+            with open(fragment, "r", encoding="utf-8") as infile:
+                shutil.copyfileobj(infile, outfile, COPY_CHUNK)
 
-        if not markdown_files:
-            outfile.write("Ошибка: Markdown-файлы не найдены.\n")
-            logging.error("Markdown-файлы не найдены")
-            return
+    index["output"] = {"sha256": output_sha, "file": OUTPUT_FILE.name}
+    try:
+        save_json(AGGREGATE_INDEX, index)
+    except OSError as e:
+        logging.error(f"Не удалось сохранить индекс сборки отчета: {str(e)}")
+    return OUTPUT_FILE, True
 
-        added_files = []
-        for md_file in sorted(markdown_files):
-            if md_file == OUTPUT_FILE:
-                continue
-            try:
-                with open(md_file, "r", encoding="utf-8") as infile:
-                    outfile.write(f"## Данные из файла: {md_file.name}\n\n")
-                    outfile.write(infile.read())
-                    outfile.write("\n\n---\n\n")
-                logging.info(f"Файл {md_file} добавлен в итоговый отчет")
-                added_files.append(md_file)
-            except Exception as e:
-                logging.error(f"Ошибка при обработке {md_file}: {str(e)}")
-                outfile.write(f"## Ошибка: файл {md_file.name} не добавлен\n\n")
-                outfile.write(f"Причина: {str(e)}\n\n---\n\n")
-
-        if missing_files:
-            outfile.write("## Пропущенные или не созданные файлы\n\n")
-            for missing_file in missing_files:
-                if missing_file not in added_files:
-                    outfile.write(f"- {missing_file.name}: не создан или не добавлен\n")
-                    logging.error(f"Файл {missing_file} не был создан или добавлен")
-            for md_file in markdown_files:
-                expected_mds = [script.replace(".py", ".md") for script in SCRIPTS]
-                if md_file.name not in expected_mds and md_file != OUTPUT_FILE:
-                    outfile.write(f"- {md_file.name}: найден, но не ожидался\n")
-                    logging.warning(f"Файл {md_file} найден, но не ожидался")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Запуск парсеров страниц academydpo.org и сборка отчета")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="количество одновременно выполняемых скриптов (по умолчанию 1)")
+    parser.add_argument("--mode", choices=["subprocess", "inprocess"], default="subprocess",
+                        help="subprocess — отдельный интерпретатор на каждый скрипт (по умолчанию), "
+                             "inprocess — скрипты импортируются один раз и выполняются в прогретых процессах")
+    parser.add_argument("--shared-chrome", action="store_true",
+                        help="запустить один общий headless Chrome для всех скриптов")
+    parser.add_argument("--recycle-after", type=int, default=10,
+                        help="перезапускать браузер после указанного числа страниц (по умолчанию 10)")
+    parser.add_argument("--static", action="store_true",
+                        help="загружать страницы без JavaScript по HTTP и разбирать lxml (только с --mode inprocess)")
+    parser.add_argument("--no-block-resources", action="store_true",
+                        help="не блокировать изображения, шрифты, стили и счетчики; "
+                             "объем страниц сохраняется как базовый для отчета об экономии")
+    parser.add_argument("--mirror", action="store_true",
+                        help="скачать документы и сканы со страниц dokumenty и dokument-company в зеркало (mirror/)")
+    parser.add_argument("--ingest", action="store_true",
+                        help="извлечь текст из PDF-документов зеркала и добавить его в отчет под страницами (включает --mirror)")
+    parser.add_argument("--full", action="store_true",
+                        help="запустить все скрипты, не проверяя, изменились ли страницы с прошлого запуска")
+    parser.add_argument("--offline", action="store_true",
+                        help="не обращаться к сети за chromedriver, использовать только локальный кэш")
+    return parser.parse_args()
 
 
 def main():
+    args = parse_args()
     logging.info("Запуск обработки скриптов...")
-    successful_scripts, missing_files = run_scripts()
+    if args.offline:
+        # Переменная окружения наследуется всеми запускаемыми скриптами
+        os.environ[OFFLINE_ENV] = "1"
+    if args.no_block_resources:
+        os.environ[BLOCK_RESOURCES_ENV] = "0"
+    # Снимки страниц этого запуска группируются в архиве под одним идентификатором (см. dpo_archive.py)
+    os.environ[RUN_ID_ENV] = TIMESTAMP
+    # Однократное определение chromedriver: скрипты возьмут путь из кэша
+    logging.info(f"chromedriver: {chromedriver_path() or 'будет найден Selenium'}")
+    if args.static and args.mode != "inprocess":
+        logging.warning("--static работает только с --mode inprocess и будет проигнорирован")
+    shared_chrome = None
+    if args.shared_chrome and args.mode == "inprocess":
+        logging.warning("--shared-chrome не используется в режиме inprocess: каждый рабочий процесс держит свой браузер")
+    elif args.shared_chrome:
+        shared_chrome = SharedChrome(recycle_after=args.recycle_after)
+        logging.info(f"Используется общий Chrome, перезапуск каждые {shared_chrome.recycle_after} страниц")
+    recrawl = None
+    if not args.full and not args.offline:
+        recrawl = RecrawlState()
+    try:
+        successful_scripts, produced_files, missing_files = run_scripts(
+            jobs=max(1, args.jobs), shared_chrome=shared_chrome,
+            mode=args.mode, recycle_after=args.recycle_after, static=args.static, recrawl=recrawl)
+    finally:
+        if shared_chrome:
+            shared_chrome.stop()
     logging.info(f"Успешно выполнено скриптов: {len(successful_scripts)} из {len(SCRIPTS)}")
     logging.info(f"Пропущенные файлы: {len(missing_files)}")
+    documents = None
+    if args.mirror or args.ingest:
+        logging.info("Зеркалирование документов...")
+        manifest = mirror_documents(BASE_DIR)
+        logging.info(f"Документов в зеркале {mirror_dir(BASE_DIR)}: {len(manifest['documents'])}")
+    if args.ingest:
+        logging.info("Извлечение текста из документов...")
+        documents = ingest_documents(BASE_DIR)
     logging.info("Объединение Markdown-файлов...")
-    combine_markdown_files(missing_files)
-    logging.info(f"Итоговый файл создан: {OUTPUT_FILE}")
+    manifest = run_manifest(produced_files, missing_files)
+    output_file, regenerated = combine_markdown_files(manifest, documents)
+    write_run_manifest(manifest, output_file, regenerated)
+    logging.info(f"Итоговый файл: {output_file}")
 
 
 if __name__ == "__main__":
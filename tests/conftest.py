@@ -0,0 +1,5 @@
+# Модули dpo_*.py лежат в корне репозитория рядом со скриптами страниц
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
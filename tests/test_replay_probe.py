@@ -0,0 +1,53 @@
+# Проверка изменений документа по отпечатку (DocumentCache.probe) на локальном сервере dpo_replay.py
+import os
+
+import pytest
+
+from dpo_cache import PROBE_MIN_SIZE, PROBE_TAIL, DocumentCache, fingerprint_matches
+from dpo_driver import BASE_URL_ENV, OFFLINE_ENV
+from dpo_replay import serve
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Каталог с документом не меньше PROBE_MIN_SIZE байт, раздаваемый на свободном порту."""
+    monkeypatch.delenv(OFFLINE_ENV, raising=False)
+    monkeypatch.delenv(BASE_URL_ENV, raising=False)
+    directory = tmp_path / "site"
+    directory.mkdir()
+    document = directory / "doc.pdf"
+    document.write_bytes(os.urandom(PROBE_MIN_SIZE + PROBE_TAIL))
+    server = serve(directory)
+    yield document, f"http://127.0.0.1:{server.server_address[1]}/doc.pdf"
+    server.shutdown()
+    server.server_close()
+
+
+def test_probe_detects_unchanged_and_changed_document(site, tmp_path, capsys):
+    document, url = site
+    cache = DocumentCache(root=str(tmp_path / "cache"))
+
+    # Первый запрос скачивает документ целиком
+    digest = cache.fetch(url, probe=True)
+    assert os.path.isfile(cache.blob_path(digest))
+    stored = cache.entry(url)["fingerprint"]
+    assert stored["length"] == document.stat().st_size
+    capsys.readouterr()
+
+    # Повторный запрос: отпечаток совпал, документ не скачивается
+    assert fingerprint_matches(stored, cache.probe(url))
+    assert cache.fetch(url, probe=True) == digest
+    assert "проверка отпечатка" in capsys.readouterr().out
+
+    # Хвост документа изменен при той же длине: отпечаток не совпадает, документ скачивается заново
+    data = bytearray(document.read_bytes())
+    data[-PROBE_TAIL:] = os.urandom(PROBE_TAIL)
+    document.write_bytes(bytes(data))
+    stat = document.stat()
+    os.utime(document, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10 ** 9))
+    probed = cache.probe(url)
+    assert probed["length"] == stored["length"]
+    assert not fingerprint_matches(stored, probed)
+    changed = cache.fetch(url, probe=True)
+    assert changed != digest
+    assert open(cache.blob_path(changed), "rb").read() == bytes(data)
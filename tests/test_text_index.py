@@ -0,0 +1,53 @@
+# Поиск фраз-якорей и следующих за ними списков в TextIndex (dpo_extract.py)
+import pytest
+
+from dpo_extract import TextIndex
+
+
+def node(tag, text, items=()):
+    return {"tag": tag, "innerText": text, "fields": {"items": [
+        {"text": item, "fields": {"links": [{"text": item, "attrs": {"href": f"/{item}"}}]}} for item in items
+    ]}}
+
+
+def container(*children):
+    return {"fields": {"children": list(children)}}
+
+
+CONTAINERS = [
+    container(
+        node("div", "Обертка: Такое обучение имеет свои особенности: и еще текст"),
+        node("p", "Такое обучение имеет свои   особенности:"),
+        node("p", "Посторонний абзац"),
+        node("ul", "", ["Первая", " ", "Вторая"]),
+    ),
+    container(
+        node("h3", "Формы обучения"),
+        node("p", "Без списка"),
+    ),
+]
+
+
+def test_find_matches_substring_in_document_order_and_filters_tags():
+    index = TextIndex(CONTAINERS, ["Такое обучение имеет свои особенности:", "Формы обучения"])
+    # Подстрока innerText обертки тоже совпадает: она первая в документе
+    assert index.find("Такое обучение имеет свои особенности:") == (0, 0)
+    assert index.find("Такое обучение имеет свои особенности:", ["p"]) == (0, 1)
+    assert index.find("Формы обучения", ["p"]) is None
+
+
+def test_list_after_anchor():
+    index = TextIndex(CONTAINERS, ["Такое обучение имеет свои особенности:", "Формы обучения"])
+    assert index.list_texts("Такое обучение имеет свои особенности:", ["p"]) == ["Первая", "Вторая"]
+    assert index.list_links("Такое обучение имеет свои особенности:", ["p"]) == [
+        {"text": "Первая", "url": "/Первая"},
+        {"text": "Вторая", "url": "/Вторая"},
+    ]
+    # После якоря во втором контейнере списка нет
+    assert index.list_texts("Формы обучения", ["h3"]) == []
+
+
+def test_unindexed_phrase_is_an_error():
+    index = TextIndex(CONTAINERS, ["Формы обучения"])
+    with pytest.raises(KeyError):
+        index.find("Посторонний абзац")